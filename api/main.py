@@ -0,0 +1,160 @@
+# File: api/main.py
+
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import AsyncIterator, List, Optional, Tuple
+from fastapi import Depends, FastAPI, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from api import schemas
+from database.async_connection import async_session_scope, dispose_async_engine, get_async_engine
+from database.models import PAYMENT_STATUSES
+from services import (
+    bill_entry_service, bill_records_service, wireman_management_services, wireman_search_service
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_async_engine()
+    yield
+    await dispose_async_engine()
+
+
+app = FastAPI(title="Wireman Tracker API", lifespan=lifespan)
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Dependency to get an async database session for one request."""
+    async with async_session_scope() as db:
+        yield db
+
+
+def _encode_cursor(key: Optional[Tuple[date, int]]) -> Optional[str]:
+    """Encode a (date, id) page key as 'YYYY-MM-DD:id'."""
+    return f"{key[0].isoformat()}:{key[1]}" if key else None
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[date, int]]:
+    """Decode a 'YYYY-MM-DD:id' cursor into a (date, id) page key."""
+    if not cursor:
+        return None
+    try:
+        bill_date, bill_id = cursor.split(":")
+        return date.fromisoformat(bill_date), int(bill_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid cursor '{cursor}'.")
+
+
+def _date_range(start_date: Optional[date], end_date: Optional[date]) -> Optional[tuple]:
+    """Build an inclusive date range from optional bounds."""
+    if start_date is None and end_date is None:
+        return None
+    return start_date or date.min, end_date or date.max
+
+
+async def _require_wireman(db: AsyncSession, wireman_id: int):
+    """Raise 404 unless the wireman exists."""
+    if await db.run_sync(wireman_management_services.get_wireman_by_id, wireman_id) is None:
+        raise HTTPException(status_code=404, detail="Wireman not found.")
+
+
+@app.get("/health")
+async def health() -> dict:
+    return {"status": "ok"}
+
+
+@app.post("/bills", response_model=schemas.Message, status_code=201)
+async def submit_bill(bill: schemas.BillIn, db: AsyncSession = Depends(get_session)):
+    """Submit a bill and credit its points to the wireman."""
+    is_valid, error_message = bill_entry_service.validate_bill_data(bill.client_name, bill.amount)
+    if not is_valid:
+        raise HTTPException(status_code=422, detail=error_message)
+    if bill.payment_status not in PAYMENT_STATUSES:
+        raise HTTPException(status_code=422, detail=f"Payment status must be one of "
+                                                    f"{', '.join(PAYMENT_STATUSES)}.")
+    await _require_wireman(db, bill.wireman_id)
+
+    success, message = await db.run_sync(
+        bill_entry_service.submit_bill, bill.wireman_id, bill.client_name.strip(), bill.amount, bill.date,
+        bill.payment_status
+    )
+    if not success:
+        raise HTTPException(status_code=400, detail=message)
+    return {"message": message}
+
+
+@app.get("/bills", response_model=schemas.BillsPage)
+async def get_bills(
+    bill_id: int = 0,
+    wireman_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    page_size: int = Query(50, ge=1, le=200),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    db: AsyncSession = Depends(get_session)
+):
+    """Get one page of bill records, newest first."""
+    page = await db.run_sync(
+        bill_records_service.get_bills_page, bill_id, wireman_id, _date_range(start_date, end_date),
+        page_size, _decode_cursor(after), _decode_cursor(before)
+    )
+    return {
+        "bills": [row._asdict() for row in page.bills],
+        "total_count": page.total_count,
+        "next_cursor": _encode_cursor(page.last_key) if page.has_next else None,
+        "previous_cursor": _encode_cursor(page.first_key) if page.has_previous else None,
+    }
+
+
+@app.get("/leaderboard", response_model=List[schemas.LeaderboardRow])
+async def get_leaderboard(
+    category: str = Query("total_bill_amount", regex="^(total_bill_amount|number_of_bills|balance_points|total_points)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    payment_status: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    dense: bool = False,
+    db: AsyncSession = Depends(get_session)
+):
+    """Get a page of the ranked leaderboard."""
+    if payment_status is not None and payment_status not in PAYMENT_STATUSES:
+        raise HTTPException(status_code=422, detail=f"Payment status must be one of "
+                                                    f"{', '.join(PAYMENT_STATUSES)}.")
+    rows = await db.run_sync(
+        wireman_management_services.get_leaderboard, category, _date_range(start_date, end_date),
+        payment_status, limit, offset, dense
+    )
+    return [row._asdict() for row in rows]
+
+
+@app.get("/wiremen", response_model=List[schemas.WiremanMatch])
+async def search_wiremen(q: str = "", limit: int = Query(20, ge=1, le=100),
+                         db: AsyncSession = Depends(get_session)):
+    """Search wiremen by name or contact info."""
+    rows = await db.run_sync(wireman_search_service.search_wiremen, q, limit)
+    return [row._asdict() for row in rows]
+
+
+@app.get("/wiremen/{wireman_id}/dashboard", response_model=schemas.Dashboard)
+async def get_dashboard(wireman_id: int, db: AsyncSession = Depends(get_session)):
+    """Get a wireman's bill totals and points."""
+    dashboards = await db.run_sync(wireman_management_services.get_wiremen_dashboard_data, [wireman_id])
+    if wireman_id not in dashboards:
+        raise HTTPException(status_code=404, detail="Wireman not found.")
+    return dashboards[wireman_id]._asdict()
+
+
+@app.post("/wiremen/{wireman_id}/redeem", response_model=schemas.Message)
+async def redeem_points(wireman_id: int, redeem: schemas.RedeemIn, db: AsyncSession = Depends(get_session)):
+    """Redeem some of a wireman's points, or the whole balance."""
+    await _require_wireman(db, wireman_id)
+    if redeem.points is None:
+        success, message = await db.run_sync(wireman_management_services.redeem_all_points, wireman_id)
+    else:
+        success, message = await db.run_sync(wireman_management_services.redeem_specific_points, wireman_id,
+                                             redeem.points)
+    if not success:
+        raise HTTPException(status_code=409, detail=message)
+    return {"message": message}
@@ -0,0 +1,69 @@
+# File: api/schemas.py
+
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class BillIn(BaseModel):
+    """A bill posted by a client."""
+    wireman_id: int
+    client_name: str
+    amount: Decimal = Field(..., gt=0)
+    date: date
+    payment_status: str
+
+
+class Bill(BaseModel):
+    """One bill record row."""
+    id: int
+    wireman_name: str
+    client_name: Optional[str]
+    amount: Decimal
+    date: Optional[date]
+    points_earned: Optional[Decimal]
+    payment_status: Optional[str]
+
+
+class BillsPage(BaseModel):
+    """One keyset page of bills, newest first. Pass a cursor as `after` or `before` to move."""
+    bills: List[Bill]
+    total_count: int
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+
+class LeaderboardRow(BaseModel):
+    """One ranked leaderboard row."""
+    rank: int
+    wireman_id: int
+    name: str
+    value: Decimal
+
+
+class WiremanMatch(BaseModel):
+    """A wireman found by the search."""
+    id: int
+    name: str
+    contact_info: Optional[str]
+
+
+class Dashboard(BaseModel):
+    """Aggregated dashboard figures for a wireman."""
+    wireman_id: int
+    total_bills: int
+    total_business: Decimal
+    latest_bill_date: Optional[date]
+    total_points: Decimal
+    balance_points: Decimal
+
+
+class RedeemIn(BaseModel):
+    """Points to redeem; the whole balance if points is omitted."""
+    points: Optional[Decimal] = Field(None, gt=0)
+
+
+class Message(BaseModel):
+    """The outcome of a write."""
+    message: str
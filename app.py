@@ -1,11 +1,12 @@
 # File: app.py
 
 import streamlit as st
-from database.connection import get_db
-from database.models import Wireman, Bill, Point
+from database.connection import session_scope
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from utils.helpers import format_currency
+from services import summary_stats_service
+from utils.widgets import instrumented_page
 
 st.set_page_config(page_title="Referral Management System", page_icon="📊", layout="wide")
 
@@ -18,26 +19,25 @@ def main():
     - Bill Entry
     - Wireman Management
     - Bill Records
+    - Analytics
+    - Receivables
     """)
 
     try:
-        db = next(get_db())
-        display_summary_metrics(db)
+        with instrumented_page("home"), session_scope() as db:
+            display_summary_metrics(db)
     except SQLAlchemyError as e:
         st.error(f"An error occurred while connecting to the database: {str(e)}")
 
 def display_summary_metrics(db: Session):
     """Display summary metrics on the main page."""
     try:
-        total_wiremen = db.query(Wireman).count()
-        total_bills = db.query(Bill).count()
-        total_business = db.query(Bill.amount).all()
-        total_business_amount = sum(amount for (amount,) in total_business)
+        stats = summary_stats_service.get_summary_stats(db)
 
         col1, col2, col3 = st.columns(3)
-        col1.metric("Total Wiremen", total_wiremen)
-        col2.metric("Total Bills", total_bills)
-        col3.metric("Total Business", format_currency(total_business_amount))
+        col1.metric("Total Wiremen", stats.total_wiremen)
+        col2.metric("Total Bills", stats.total_bills)
+        col3.metric("Total Business", format_currency(stats.total_business))
     except SQLAlchemyError as e:
         st.error(f"An error occurred while fetching summary metrics: {str(e)}")
 
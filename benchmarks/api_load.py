@@ -0,0 +1,146 @@
+# File: benchmarks/api_load.py
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+import httpx
+
+# Relative weight of each endpoint in the request mix; posting bills is the counter's main load.
+ENDPOINT_WEIGHTS = {
+    "POST /bills": 4,
+    "GET /bills": 3,
+    "GET /leaderboard": 1,
+    "GET /wiremen/{id}/dashboard": 2,
+    "GET /wiremen": 1,
+}
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    """Get the nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))]
+
+
+def _requests(wireman_ids: List[int], rng: random.Random) -> Dict[str, Callable[[], Tuple[str, str, dict]]]:
+    """Return, per endpoint, a factory of (method, path, keyword arguments) for a random request."""
+    today = date.today()
+    return {
+        "POST /bills": lambda: ("POST", "/bills", {"json": {
+            "wireman_id": rng.choice(wireman_ids),
+            "client_name": f"Load Client {rng.randrange(1000)}",
+            "amount": str(rng.randrange(100, 50000)),
+            "date": (today - timedelta(days=rng.randrange(365))).isoformat(),
+            "payment_status": "Paid",
+        }}),
+        "GET /bills": lambda: ("GET", "/bills", {"params": {"wireman_id": rng.choice(wireman_ids), "page_size": 50}}),
+        "GET /leaderboard": lambda: ("GET", "/leaderboard", {"params": {
+            "category": rng.choice(["total_bill_amount", "number_of_bills", "balance_points", "total_points"])
+        }}),
+        "GET /wiremen/{id}/dashboard": lambda: ("GET", f"/wiremen/{rng.choice(wireman_ids)}/dashboard", {}),
+        "GET /wiremen": lambda: ("GET", "/wiremen", {"params": {"q": rng.choice("abcdefghijklmnopqrstuvwxyz")}}),
+    }
+
+
+async def run_load(client: httpx.AsyncClient, total: int, concurrency: int, seed: int = 42) -> dict:
+    """
+    Send a weighted mix of requests from concurrent workers and summarize the latencies.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the API's base URL.
+        total (int): Number of requests to send.
+        concurrency (int): Number of requests in flight at once.
+        seed (int): Random seed for the request mix.
+
+    Returns:
+        dict: Overall requests/sec and error count, and p50/p99 latency in milliseconds per endpoint.
+    """
+    response = await client.get("/wiremen", params={"limit": 100})
+    response.raise_for_status()
+    wireman_ids = [row["id"] for row in response.json()]
+    if not wireman_ids:
+        raise SystemExit("No wiremen found; fill the database first (python -m benchmarks.data_generator).")
+
+    rng = random.Random(seed)
+    factories = _requests(wireman_ids, rng)
+    plan = rng.choices(list(ENDPOINT_WEIGHTS), weights=list(ENDPOINT_WEIGHTS.values()), k=total)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    queue = iter(plan)
+
+    async def worker():
+        for endpoint in queue:
+            method, path, kwargs = factories[endpoint]()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[endpoint].append((time.perf_counter() - start) * 1000)
+            errors[endpoint] += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "requests_per_second": round(total / elapsed, 1),
+        "errors": sum(errors.values()),
+        "endpoints": {
+            endpoint: {
+                "count": len(samples),
+                "errors": errors[endpoint],
+                "p50_ms": round(statistics.median(samples), 2),
+                "p99_ms": round(_percentile(samples, 99), 2),
+            }
+            for endpoint, samples in sorted(latencies.items())
+        },
+    }
+
+
+def print_summary(results: dict):
+    """Print the load test results as a table."""
+    print(f"{results['requests']} requests, concurrency {results['concurrency']}: "
+          f"{results['requests_per_second']} req/s over {results['seconds']}s, {results['errors']} errors")
+    print(f"{'endpoint':<30}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for endpoint, row in results["endpoints"].items():
+        print(f"{endpoint:<30}{row['count']:>8}{row['errors']:>8}{row['p50_ms']:>10}{row['p99_ms']:>10}")
+
+
+async def _main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout,
+                                 limits=httpx.Limits(max_connections=args.concurrency)) as client:
+        return await run_load(client, args.requests, args.concurrency, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP API and report latency and throughput.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000",
+                        help="URL of a running API (uvicorn api.main:app). POST /bills writes to its database.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Also write the JSON results to this file.")
+    args = parser.parse_args()
+
+    results = asyncio.run(_main(args))
+    print_summary(results)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    sys.exit(1 if results["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
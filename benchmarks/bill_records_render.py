@@ -0,0 +1,75 @@
+# File: benchmarks/bill_records_render.py
+
+import argparse
+import json
+import time
+import pandas as pd
+from sqlalchemy.orm import Session, sessionmaker
+from database.connection import create_db_engine
+from database.migrations import apply_migrations
+from database.models import Bill, Wireman
+from services import bill_records_service
+from benchmarks.data_generator import generate_data
+
+
+def render_with_orm_lookup(db: Session) -> pd.DataFrame:
+    """The previous approach: hydrate Bill objects and look up each wireman's name in a list."""
+    wiremen = db.query(Wireman).all()
+    bills = db.query(Bill).order_by(Bill.date.desc()).all()
+    return pd.DataFrame([
+        {
+            "Bill ID": bill.id,
+            "Wireman": next((w.name for w in wiremen if w.id == bill.wireman_id), "Unknown"),
+            "Client Name": bill.client_name,
+            "Amount": float(bill.amount),
+            "Date": bill.date,
+            "Points Earned": float(bill.points_earned),
+            "Payment Status": bill.payment_status
+        } for bill in bills
+    ])
+
+
+def render_with_joined_rows(db: Session) -> pd.DataFrame:
+    """The current approach: join wiremen in SQL and build the DataFrame column by column."""
+    return bill_records_service.bill_rows_to_frame(bill_records_service.get_bill_rows(db))
+
+
+def time_render(db: Session, render, repeat: int) -> float:
+    """Return the best wall-clock time of a render function over several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        render(db)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time building the bill records table before and after.")
+    parser.add_argument("--url", default="sqlite://", help="Database URL to seed and query.")
+    parser.add_argument("--wiremen", type=int, default=500)
+    parser.add_argument("--bills", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.url)
+    apply_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        generate_data(db, args.wiremen, args.bills)
+        before = time_render(db, render_with_orm_lookup, args.repeat)
+        after = time_render(db, render_with_joined_rows, args.repeat)
+        print(json.dumps({
+            "wiremen": args.wiremen,
+            "bills": args.bills,
+            "orm_lookup_seconds": round(before, 4),
+            "joined_rows_seconds": round(after, 4),
+            "speedup": round(before / after, 1) if after else None
+        }, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
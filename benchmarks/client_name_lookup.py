@@ -0,0 +1,99 @@
+# File: benchmarks/client_name_lookup.py
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from services.client_name_service import ClientNameIndex
+
+
+def generate_client_names(count: int, seed: int = 42) -> list:
+    """Generate count distinct client names with skewed (Zipf-like) bill counts."""
+    rng = random.Random(seed)
+    syllables = ["ra", "vi", "ku", "mar", "sha", "an", "de", "vi", "pa", "tel", "sin", "gh", "ja", "in", "na"]
+    names = set()
+    while len(names) < count:
+        first = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).title()
+        last = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).title()
+        suffix = rng.choice(["", " Traders", " Electricals", " & Sons", f" {rng.choice(string.ascii_uppercase)}"])
+        names.add(f"{first} {last}{suffix}")
+    return [(name, max(1, int(1000 / rank))) for rank, name in enumerate(sorted(names), start=1)]
+
+
+def time_lookups(index: ClientNameIndex, prefixes: list, limit: int) -> list:
+    """Time each lookup; return the durations in microseconds."""
+    durations = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.suggest(prefix, limit)
+        durations.append((time.perf_counter() - start) * 1e6)
+    return durations
+
+
+def time_lookups_after_adds(index: ClientNameIndex, names: list, count: int, limit: int, rng) -> tuple:
+    """
+    Add count new client names, each followed by a lookup of a short prefix of it, as
+    happens when a bill is submitted and the next one is typed; return the add and
+    lookup durations in microseconds.
+    """
+    add_durations, lookup_durations = [], []
+    for i in range(count):
+        name = f"{rng.choice(names)[0]} Branch {i}"
+        start = time.perf_counter()
+        index.add(name)
+        add_durations.append((time.perf_counter() - start) * 1e6)
+        start = time.perf_counter()
+        index.suggest(name[:rng.randint(1, 3)], limit)
+        lookup_durations.append((time.perf_counter() - start) * 1e6)
+    return add_durations, lookup_durations
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Get a percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time client name prefix lookups and incremental updates.")
+    parser.add_argument("--clients", type=int, default=100000, help="Distinct client names in the index.")
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=10, help="Suggestions per lookup.")
+    parser.add_argument("--adds", type=int, default=2000, help="New client names added between lookups.")
+    parser.add_argument("--budget-us", type=float, default=1000.0,
+                        help="Fail if the cold or after-add p99 lookup exceeds this.")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    names = generate_client_names(args.clients)
+
+    start = time.perf_counter()
+    index = ClientNameIndex(names)
+    build_seconds = time.perf_counter() - start
+
+    # Prefixes of real names, 1 to 6 characters long, as they would be typed.
+    prefixes = [name[:rng.randint(1, 6)] for name, _ in rng.choices(names, k=args.lookups)]
+    cold = time_lookups(index, prefixes, args.limit)
+    warm = time_lookups(index, prefixes, args.limit)
+    adds, after_add = time_lookups_after_adds(index, names, args.adds, args.limit, rng)
+
+    report = {
+        "clients": len(index),
+        "lookups": args.lookups,
+        "build_seconds": round(build_seconds, 3),
+    }
+    for label, durations in (("cold", cold), ("warm", warm), ("add", adds), ("after_add", after_add)):
+        report[f"{label}_mean_us"] = round(sum(durations) / len(durations), 2)
+        report[f"{label}_p50_us"] = round(percentile(durations, 0.5), 2)
+        report[f"{label}_p99_us"] = round(percentile(durations, 0.99), 2)
+    print(json.dumps(report, indent=2))
+    # Warm lookups can be served from kept tops alone, so the gate is on first lookups and
+    # on lookups right after an add, the pattern of bill entry.
+    passed = report["cold_p99_us"] <= args.budget_us and report["after_add_p99_us"] <= args.budget_us
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# File: benchmarks/concurrent_reads.py
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+from sqlalchemy.orm import sessionmaker
+from database import async_connection
+from database.connection import create_db_engine
+from database.migrations import apply_migrations
+from database.models import Wireman
+from services import query_cache, wireman_management_services
+from benchmarks.data_generator import generate_data
+
+
+def _page_calls(wireman_id: int) -> List[tuple]:
+    """Return the reads the wireman management page loads on a rerun."""
+    return [
+        (wireman_management_services.get_wiremen_with_points_or_bills_async, "total_bill_amount", 0, 1e12),
+        (wireman_management_services.get_leaderboard_async, "number_of_bills", None, "Not paid", 10),
+        (wireman_management_services.get_wireman_by_id_async, wireman_id),
+        (wireman_management_services.get_wireman_dashboard_data_async, wireman_id),
+        (wireman_management_services.get_point_record_async, wireman_id),
+    ]
+
+
+async def time_serial(calls: List[tuple]) -> float:
+    """Run the calls one after another in one session and return the elapsed milliseconds."""
+    start = time.perf_counter()
+    async with async_connection.async_session_scope() as db:
+        for func, *args in calls:
+            await func(db, *args)
+    return (time.perf_counter() - start) * 1000
+
+
+async def time_concurrent(calls: List[tuple]) -> float:
+    """Run the calls concurrently, a session each, and return the elapsed milliseconds."""
+    start = time.perf_counter()
+    await async_connection.gather_in_sessions(*calls)
+    return (time.perf_counter() - start) * 1000
+
+
+async def time_each(calls: List[tuple]) -> List[float]:
+    """Time each call on its own and return the elapsed milliseconds per call."""
+    timings = []
+    for call in calls:
+        timings.append(await time_serial([call]))
+    return timings
+
+
+async def run(url: str, repeat: int, wireman_id: int) -> dict:
+    """Time the page's reads serially and concurrently, with a cold query cache each run."""
+    async_connection.init_async_engine(url)
+    calls = _page_calls(wireman_id)
+    results = {"serial": [], "concurrent": [], "slowest": []}
+    await time_concurrent(calls)  # open the pooled connections
+    for _ in range(repeat):
+        query_cache.query_cache.clear()
+        results["slowest"].append(max(await time_each(calls)))
+        query_cache.query_cache.clear()
+        results["serial"].append(await time_serial(calls))
+        query_cache.query_cache.clear()
+        results["concurrent"].append(await time_concurrent(calls))
+    await async_connection.dispose_async_engine()
+    return {name: round(statistics.median(timings), 2) for name, timings in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare loading the wireman management page's reads serially and concurrently.")
+    parser.add_argument("--url", default="sqlite:///benchmark.db",
+                        help="Database URL of a file or server database; an empty database is filled first.")
+    parser.add_argument("--wiremen", type=int, default=1000)
+    parser.add_argument("--bills", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.url)
+    apply_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        if not db.query(Wireman.id).first():
+            generate_data(db, args.wiremen, args.bills)
+        wireman_id = db.query(Wireman.id).order_by(Wireman.id).limit(1).scalar()
+    finally:
+        db.close()
+
+    results = asyncio.run(run(args.url, args.repeat, wireman_id))
+    print(f"slowest single read: {results['slowest']} ms")
+    print(f"serial, one session: {results['serial']} ms")
+    print(f"concurrent sessions: {results['concurrent']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# File: benchmarks/data_generator.py
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from database.models import PAYMENT_STATUSES, Wireman, Bill
+from services import points_rules_service, points_service, receivables_service, rollup_service
+PAYMENT_STATUS_WEIGHTS = [0.7, 0.15, 0.15]
+
+# Relative bill volume per calendar month: busy before the March financial year end
+# and through the October-November festival season, quiet in the monsoon.
+SEASONAL_MONTH_WEIGHTS = {1: 0.9, 2: 1.0, 3: 1.5, 4: 0.9, 5: 0.9, 6: 0.7,
+                          7: 0.6, 8: 0.7, 9: 0.9, 10: 1.4, 11: 1.5, 12: 1.0}
+
+
+def _wireman_weights(count: int, skew: float) -> list:
+    """Zipf-like weights: the wireman at rank r gets 1 / r ** skew of the bills; skew 0 is uniform."""
+    return [1 / rank ** skew for rank in range(1, count + 1)]
+
+
+def _day_weights(start_date: date, days: int, seasonality: float) -> list:
+    """Weights per day from the seasonal month weights; seasonality 0 is uniform, 1 is the full swing."""
+    return [
+        1 + seasonality * (SEASONAL_MONTH_WEIGHTS[(start_date + timedelta(days=day)).month] - 1)
+        for day in range(days)
+    ]
+
+
+def generate_data(db: Session, num_wiremen: int, num_bills: int, seed: int = 42,
+                  start_date: date = date(2022, 1, 1), days: int = 730, batch_size: int = 10000,
+                  skew: float = 1.0, seasonality: float = 1.0):
+    """
+    Fill wiremen, bills, points, the points ledger and the daily rollup with reproducible synthetic data.
+
+    Bills are skewed towards a few heavy wiremen and follow a seasonal pattern over the year,
+    like real referral data; the same arguments always produce the same data.
+
+    Args:
+        db (Session): The database session.
+        num_wiremen (int): Number of wiremen to create.
+        num_bills (int): Number of bills to create.
+        seed (int): Random seed.
+        start_date (date): Date of the oldest bill.
+        days (int): Number of days the bills are spread over.
+        batch_size (int): Rows per executemany batch.
+        skew (float): Zipf exponent of bills per wireman; 0 spreads bills evenly.
+        seasonality (float): Strength of the seasonal pattern, from 0 (none) to 1.
+    """
+    rng = random.Random(seed)
+    rules = points_rules_service.get_points_rules()
+
+    db.execute(insert(Wireman), [
+        {
+            "name": f"Wireman {i:05d}",
+            "contact_info": f"98{i:08d}",
+            "date_registered": start_date
+        } for i in range(1, num_wiremen + 1)
+    ])
+    wireman_ids = [wireman_id for (wireman_id,) in db.query(Wireman.id).order_by(Wireman.id)]
+    # Shuffle which wiremen are heavy so heaviness does not follow the ID order.
+    ranked_ids = wireman_ids[:]
+    rng.shuffle(ranked_ids)
+    wireman_cum_weights = list(accumulate(_wireman_weights(len(ranked_ids), skew)))
+    day_cum_weights = list(accumulate(_day_weights(start_date, days, seasonality)))
+    day_offsets = range(days)
+    client_count = num_bills // 10 + 1
+
+    points_by_wireman = {wireman_id: Decimal('0') for wireman_id in wireman_ids}
+    remaining = num_bills
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        remaining -= size
+        batch_wiremen = rng.choices(ranked_ids, cum_weights=wireman_cum_weights, k=size)
+        batch_days = rng.choices(day_offsets, cum_weights=day_cum_weights, k=size)
+        batch_statuses = rng.choices(PAYMENT_STATUSES, weights=PAYMENT_STATUS_WEIGHTS, k=size)
+        batch = [
+            {
+                "wireman_id": wireman_id,
+                "client_name": f"Client {rng.randrange(client_count):06d}",
+                "amount": Decimal(rng.randrange(10000, 5000000)) / 100,
+                "date": start_date + timedelta(days=day),
+                "payment_status": payment_status
+            } for wireman_id, day, payment_status in zip(batch_wiremen, batch_days, batch_statuses)
+        ]
+        rules.score_bills(batch)
+        for bill in batch:
+            points_by_wireman[bill["wireman_id"]] += bill["points_earned"]
+        db.execute(insert(Bill), batch)
+
+    points_service.add_points_bulk(db, points_by_wireman)
+    rollup_service.rebuild_rollups(db)
+    receivables_service.rebuild_receivables(db)
+    db.commit()
+
+
+def main():
+    from database.connection import create_db_engine
+    from database.migrations import apply_migrations
+    from sqlalchemy.orm import sessionmaker
+
+    parser = argparse.ArgumentParser(description="Fill an empty database with synthetic wiremen and bills.")
+    parser.add_argument("--url", default="sqlite:///benchmark.db", help="Database URL; use a throwaway database.")
+    parser.add_argument("--wiremen", type=int, default=1000)
+    parser.add_argument("--bills", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seasonality", type=float, default=1.0)
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.url)
+    apply_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        start = time.perf_counter()
+        generate_data(db, args.wiremen, args.bills, args.seed, skew=args.skew, seasonality=args.seasonality)
+        print(f"Generated {args.wiremen} wiremen and {args.bills} bills in {time.perf_counter() - start:.1f}s.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# File: benchmarks/explain_indexes.py
+
+import argparse
+import sys
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+from database.connection import create_db_engine
+from database.migrations import apply_migrations
+from services import bill_records_service, wireman_management_services
+from benchmarks.data_generator import generate_data
+
+# The (wireman_id, day) primary key index, as named by SQLite and PostgreSQL; range scans on it
+# (SQLite skip-scans it for windowed leaderboards) avoid a sort for the GROUP BY wireman_id.
+ROLLUP_PRIMARY_KEY = ("sqlite_autoindex_bill_daily_rollups_1", "bill_daily_rollups_pkey")
+
+
+def _hot_queries(db: Session) -> list:
+    """Return (name, query, expected index or alternative index names) for the hot read paths."""
+    return [
+        ("leaderboard (total bill amount, last 90 days)",
+         wireman_management_services._leaderboard_query(db, "total_bill_amount", (date(2023, 10, 3), date(2023, 12, 31))),
+         ("ix_bill_daily_rollups_day",) + ROLLUP_PRIMARY_KEY),
+        ("filtered records (wireman + date range)",
+         bill_records_service.filtered_bills_query(db, wireman_id=1, date_range=(date(2023, 1, 1), date(2023, 1, 31))),
+         "ix_bills_wireman_id_date"),
+        ("filtered records (date range)",
+         bill_records_service.filtered_bills_query(db, date_range=(date(2023, 1, 1), date(2023, 1, 31))),
+         "ix_bills_date"),
+        ("wireman dashboard",
+         wireman_management_services._dashboard_query(db, [1]),
+         ROLLUP_PRIMARY_KEY),
+    ]
+
+
+def explain(db: Session, query) -> str:
+    """Get the database's query plan for an ORM query as text."""
+    dialect = db.bind.dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN" if dialect.name == "sqlite" else "EXPLAIN"
+    rows = db.execute(text(f"{prefix} {sql}")).fetchall()
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+def check_indexes(db: Session) -> bool:
+    """Print the plan of each hot query and whether it uses the expected index."""
+    all_used = True
+    for name, query, index_names in _hot_queries(db):
+        index_names = (index_names,) if isinstance(index_names, str) else index_names
+        plan = explain(db, query)
+        used = any(index_name in plan for index_name in index_names)
+        all_used = all_used and used
+        print(f"[{'OK' if used else 'MISSING'}] {name}: expects {' or '.join(index_names)}")
+        print("    " + plan.replace("\n", "\n    "))
+    return all_used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the hot queries use the declared indexes.")
+    parser.add_argument("--url", default="sqlite://", help="Database URL to seed and explain against.")
+    parser.add_argument("--wiremen", type=int, default=200)
+    parser.add_argument("--bills", type=int, default=50000)
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.url)
+    apply_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        generate_data(db, args.wiremen, args.bills)
+        db.execute(text("ANALYZE"))
+        db.commit()
+        sys.exit(0 if check_indexes(db) else 1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# File: benchmarks/points_rescore.py
+
+import argparse
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+import numpy as np
+from sqlalchemy.orm import sessionmaker
+from database.connection import create_db_engine
+from database.migrations import apply_migrations
+from database.models import PAYMENT_STATUSES, Wireman
+from services import points_rules_service, points_service
+from services.points_rules_service import PointsRules, Promotion, Tier
+from benchmarks.data_generator import generate_data
+
+# A rule change of the kind that triggers a re-score: tiers, no points until paid, and a promotion.
+CHANGED_RULES = PointsRules(
+    tiers=[Tier(Decimal("0"), Decimal("1")), Tier(Decimal("10000"), Decimal("1.25")), Tier(Decimal("30000"), Decimal("1.5"))],
+    status_multipliers={"Not paid": Decimal("0"), "Partially Paid": Decimal("0.5")},
+    promotions=[Promotion("Festival season", date(2022, 10, 15), date(2022, 11, 15), Decimal("2"))],
+)
+
+
+def time_arrays(bills: int, seed: int, sample: int) -> dict:
+    """Time scoring random bills with score_arrays, and a sample bill by bill with score."""
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(10000, 5000000, bills) / 100
+    statuses = rng.choice(PAYMENT_STATUSES, bills)
+    dates = np.datetime64("2022-01-01") + rng.integers(0, 730, bills)
+
+    start = time.perf_counter()
+    points = CHANGED_RULES.score_arrays(amounts, statuses, dates)
+    vectorized_seconds = time.perf_counter() - start
+
+    sample_rows = list(zip(amounts[:sample].tolist(), statuses[:sample].tolist(), dates[:sample].tolist()))
+    start = time.perf_counter()
+    scalar = [CHANGED_RULES.score(Decimal(f"{amount:.2f}"), status, day) for amount, status, day in sample_rows]
+    per_row_seconds = (time.perf_counter() - start) * bills / sample
+
+    mismatches = sum(Decimal(f"{value:.2f}") != expected for value, expected in zip(points[:sample].tolist(), scalar))
+    return {"vectorized_seconds": vectorized_seconds, "per_row_seconds": per_row_seconds, "mismatches": mismatches}
+
+
+def time_sql(url: str, wiremen: int, bills: int, seed: int) -> dict:
+    """Time re-scoring every bill in the database with rescore_bills, then check the points still reconcile."""
+    engine = create_db_engine(url)
+    apply_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        if not db.query(Wireman.id).first():
+            generate_data(db, wiremen, bills, seed)
+        start = time.perf_counter()
+        report = points_rules_service.rescore_bills(db, CHANGED_RULES)
+        rescore_seconds = time.perf_counter() - start
+        drift = points_service.reconcile_points(db)
+        # Put the current rules back, so the database can be reused.
+        points_rules_service.rescore_bills(db)
+        return {"rescore_seconds": rescore_seconds, "report": report, "drift": len(drift)}
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time re-scoring bills after a points rule change.")
+    parser.add_argument("--url", default="sqlite:///benchmark.db",
+                        help="Database URL; an empty database is filled first. Use a throwaway database.")
+    parser.add_argument("--wiremen", type=int, default=1000)
+    parser.add_argument("--bills", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sample", type=int, default=50000, help="Bills scored one by one to estimate the per-row cost.")
+    parser.add_argument("--skip-sql", action="store_true", help="Only time the NumPy evaluation.")
+    args = parser.parse_args()
+
+    arrays = time_arrays(args.bills, args.seed, args.sample)
+    print(f"score_arrays over {args.bills} bills: {arrays['vectorized_seconds']:.3f}s "
+          f"(per-row score, extrapolated: {arrays['per_row_seconds']:.1f}s; {arrays['mismatches']} mismatches)")
+    failed = arrays["mismatches"] > 0
+
+    if not args.skip_sql:
+        sql = time_sql(args.url, args.wiremen, args.bills, args.seed)
+        report = sql["report"]
+        print(f"rescore_bills in SQL: {sql['rescore_seconds']:.2f}s, {report.bills_changed} bills and "
+              f"{report.wiremen_changed} wiremen changed, {sql['drift']} wiremen drifted")
+        failed = failed or sql["drift"] > 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# File: benchmarks/points_stress.py
+
+import argparse
+import random
+import sys
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import func
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from database.connection import create_db_engine
+from database.migrations import apply_migrations
+from database.models import Bill, Point, Wireman
+from services import bill_entry_service, bill_records_service, points_service, wireman_management_services
+
+
+def _worker(session_factory, wireman_ids, operations, seed, redeemed, errors, lock):
+    """Submit, update and delete bills and redeem points at random for a few wiremen."""
+    rng = random.Random(seed)
+    db = session_factory()
+    try:
+        for _ in range(operations):
+            wireman_id = rng.choice(wireman_ids)
+            action = rng.random()
+            if action < 0.6:
+                success, message = bill_entry_service.submit_bill(
+                    db, wireman_id, "Stress Client", Decimal(rng.randrange(500, 20000)), date.today(), "Paid"
+                )
+            elif action < 0.75:
+                bill_id = db.query(func.max(Bill.id)).filter(Bill.wireman_id == wireman_id).scalar()
+                db.rollback()
+                if bill_id is None:
+                    continue
+                success, message = bill_records_service.update_bill(
+                    db, bill_id, "Stress Client", Decimal(rng.randrange(500, 20000)), date.today(), "Paid"
+                )
+                if message in ("Bill not found.", bill_records_service.BILL_CHANGED_MESSAGE):
+                    continue
+            elif action < 0.85:
+                bill_id = db.query(func.min(Bill.id)).filter(Bill.wireman_id == wireman_id).scalar()
+                db.rollback()
+                if bill_id is None:
+                    continue
+                success, message = bill_records_service.delete_bill(db, bill_id)
+                if message in ("Bill not found.", bill_records_service.BILL_CHANGED_MESSAGE):
+                    continue
+            else:
+                points = Decimal(rng.randrange(1, 5))
+                success, message = wireman_management_services.redeem_specific_points(db, wireman_id, points)
+                if success:
+                    with lock:
+                        redeemed[wireman_id] += points
+                    continue
+                if message in ("Not enough points to redeem.", "No points record found for this wireman."):
+                    continue
+            if not success:
+                with lock:
+                    errors.append(message)
+    finally:
+        db.close()
+
+
+def check_drift(db, redeemed: dict) -> list:
+    """
+    Compare the points rows of the wiremen in redeemed (those created by this run) with their
+    bills and redemptions; return a description of every mismatch.
+    """
+    problems = []
+    wireman_ids = list(redeemed)
+    earned = dict(db.query(Bill.wireman_id, func.sum(Bill.points_earned)).
+                  filter(Bill.wireman_id.in_(wireman_ids)).group_by(Bill.wireman_id).all())
+    rows = db.query(Point.wireman_id, func.count(Point.id), func.sum(Point.total_points),
+                    func.sum(Point.redeemed_points), func.sum(Point.balance_points)). \
+        filter(Point.wireman_id.in_(wireman_ids)).group_by(Point.wireman_id).all()
+    for wireman_id, row_count, total, redeemed_points, balance in rows:
+        expected_total = Decimal(str(earned.get(wireman_id) or 0))
+        if row_count != 1:
+            problems.append(f"wireman {wireman_id}: {row_count} points rows")
+        if Decimal(str(total)) != expected_total:
+            problems.append(f"wireman {wireman_id}: total_points {total} != bills {expected_total}")
+        if Decimal(str(redeemed_points)) != redeemed[wireman_id]:
+            problems.append(f"wireman {wireman_id}: redeemed_points {redeemed_points} != {redeemed[wireman_id]}")
+        if Decimal(str(balance)) != Decimal(str(total)) - Decimal(str(redeemed_points)):
+            problems.append(f"wireman {wireman_id}: balance {balance} != total - redeemed")
+    problems.extend(f"wireman {drift.wireman_id}: ledger and snapshot disagree ({drift})"
+                    for drift in points_service.reconcile_points(db, wireman_ids))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hammer point updates from many threads and check for drift.")
+    parser.add_argument("--url", default="sqlite:///points_stress.db",
+                        help="Database URL; use a throwaway database, it is written to.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=200, help="Operations per thread.")
+    parser.add_argument("--wiremen", type=int, default=3)
+    args = parser.parse_args()
+
+    engine_options = {"pool_size": args.threads, "max_overflow": 0}
+    if make_url(args.url).get_backend_name() == "sqlite":
+        engine_options["connect_args"] = {"check_same_thread": False, "timeout": 60}
+    engine = create_db_engine(args.url, external_pooler=False, **engine_options)
+    apply_migrations(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    db = session_factory()
+    wiremen = [Wireman(name=f"Stress Wireman {i}", date_registered=date.today()) for i in range(args.wiremen)]
+    db.add_all(wiremen)
+    db.commit()
+    wireman_ids = [wireman.id for wireman in wiremen]
+
+    redeemed = {wireman_id: Decimal('0') for wireman_id in wireman_ids}
+    errors = []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=_worker, args=(session_factory, wireman_ids, args.operations, seed,
+                                               redeemed, errors, lock))
+        for seed in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    problems = check_drift(db, redeemed)
+    db.close()
+    print(f"{args.threads * args.operations} operations in {elapsed:.2f}s, {len(errors)} failed operations.")
+    for error in errors[:10]:
+        print(f"  failed: {error}")
+    if problems:
+        print("Point drift detected:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print("No point drift.")
+
+
+if __name__ == "__main__":
+    main()
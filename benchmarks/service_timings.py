@@ -0,0 +1,166 @@
+# File: benchmarks/service_timings.py
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, Tuple
+import sqlalchemy
+from sqlalchemy import func
+from sqlalchemy.orm import Session, sessionmaker
+from database.connection import create_db_engine
+from database.instrumentation import query_scope
+from database.migrations import apply_migrations
+from database.models import Bill, Wireman
+from services import analytics_service, bill_entry_service, bill_records_service, query_cache, receivables_service, \
+    wireman_management_services
+from benchmarks.data_generator import generate_data
+
+
+def _git_commit() -> str:
+    """Get the current commit hash, or an empty string outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _cases(db: Session) -> List[Tuple[str, Callable[[Session], object]]]:
+    """Return (name, call) for each service function timed, with arguments picked from the data."""
+    last_day = db.query(func.max(Bill.date)).scalar()
+    heavy_id, light_id = [
+        db.query(Bill.wireman_id).group_by(Bill.wireman_id).order_by(order(func.count(Bill.id))).limit(1).scalar()
+        for order in (sqlalchemy.desc, sqlalchemy.asc)
+    ]
+    last_30_days = (last_day - timedelta(days=29), last_day)
+    last_90_days = (last_day - timedelta(days=89), last_day)
+
+    cases = [
+        (f"get_leaderboard[{category}]",
+         lambda db, category=category: wireman_management_services.get_leaderboard(db, category, limit=10))
+        for category in ("total_bill_amount", "number_of_bills", "balance_points", "total_points")
+    ]
+    cases += [
+        ("get_leaderboard[total_bill_amount, last 90 days]",
+         lambda db: wireman_management_services.get_leaderboard(db, "total_bill_amount", last_90_days, limit=10)),
+        ("get_leaderboard[total_bill_amount, Not paid]",
+         lambda db: wireman_management_services.get_leaderboard(db, "total_bill_amount", None, "Not paid", 10)),
+        ("get_wiremen_with_points_or_bills[balance_points]",
+         lambda db: wireman_management_services.get_wiremen_with_points_or_bills(db, "balance_points", 0, 1e12)),
+        ("get_wiremen_with_points_or_bills[total_bill_amount]",
+         lambda db: wireman_management_services.get_wiremen_with_points_or_bills(db, "total_bill_amount", 0, 1e12)),
+        ("get_wireman_dashboard_data[heavy wireman]",
+         lambda db: wireman_management_services.get_wireman_dashboard_data(db, heavy_id)),
+        ("get_wireman_dashboard_data[light wireman]",
+         lambda db: wireman_management_services.get_wireman_dashboard_data(db, light_id)),
+        ("get_bills_page[last 30 days]",
+         lambda db: bill_records_service.get_bills_page(db, 0, None, last_30_days)),
+        ("get_bills_page[heavy wireman, last 90 days]",
+         lambda db: bill_records_service.get_bills_page(db, 0, heavy_id, last_90_days)),
+        ("get_bill_analytics[monthly]",
+         lambda db: analytics_service.get_bill_analytics(db)),
+        ("get_bill_analytics[weekly, last 90 days]",
+         lambda db: analytics_service.get_bill_analytics(db, last_90_days, frequency="weekly")),
+        ("get_receivables[wireman]",
+         lambda db: receivables_service.get_receivables(db, last_day, "wireman")),
+        ("get_receivables[client, heavy wireman]",
+         lambda db: receivables_service.get_receivables(db, last_day, "client", heavy_id)),
+        ("submit_bill",
+         lambda db: bill_entry_service.submit_bill(db, heavy_id, "Benchmark Client", Decimal("12500"), last_day,
+                                                   "Paid")),
+    ]
+    return cases
+
+
+def time_case(db: Session, call: Callable[[Session], object], repeat: int) -> Dict[str, float]:
+    """Run a call repeat times with a cold query cache; return best and median milliseconds and statements."""
+    durations = []
+    statements = 0
+    for _ in range(repeat):
+        query_cache.query_cache.clear()
+        db.expunge_all()
+        with query_scope("benchmark") as stats:
+            start = time.perf_counter()
+            call(db)
+            durations.append((time.perf_counter() - start) * 1000)
+        statements = stats.statement_count
+    return {
+        "best_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "statements": statements,
+    }
+
+
+def compare(results: dict, baseline: dict) -> List[str]:
+    """Describe each case's best time against a previous run."""
+    lines = []
+    for name, result in results["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before and before["best_ms"]:
+            ratio = result["best_ms"] / before["best_ms"]
+            lines.append(f"{name}: {before['best_ms']:.3f} -> {result['best_ms']:.3f} ms ({ratio:.2f}x)")
+        else:
+            lines.append(f"{name}: {result['best_ms']:.3f} ms (new)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the service functions against synthetic data and emit JSON.")
+    parser.add_argument("--url", default="sqlite://",
+                        help="Database URL; an empty database is filled first. Use a throwaway database.")
+    parser.add_argument("--wiremen", type=int, default=1000)
+    parser.add_argument("--bills", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seasonality", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Also write the JSON results to this file.")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against.")
+    args = parser.parse_args()
+
+    engine = create_db_engine(args.url)
+    apply_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        generate_seconds = None
+        if not db.query(Wireman.id).first():
+            start = time.perf_counter()
+            generate_data(db, args.wiremen, args.bills, args.seed, skew=args.skew, seasonality=args.seasonality)
+            generate_seconds = round(time.perf_counter() - start, 2)
+
+        results = {
+            "commit": _git_commit(),
+            "run_at": date.today().isoformat(),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "wiremen": db.query(func.count(Wireman.id)).scalar(),
+            "bills": db.query(func.count(Bill.id)).scalar(),
+            "seed": args.seed,
+            "skew": args.skew,
+            "seasonality": args.seasonality,
+            "repeat": args.repeat,
+            "generate_seconds": generate_seconds,
+            "results": {name: time_case(db, call, args.repeat) for name, call in _cases(db)},
+        }
+    finally:
+        db.close()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            print("\n".join(compare(results, json.load(file))), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
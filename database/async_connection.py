@@ -0,0 +1,199 @@
+# File: database/async_connection.py
+
+import asyncio
+import contextvars
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine.url import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+from database.connection import (
+    DATABASE_URL, DB_EXTERNAL_POOLER, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS, _track_pool_events
+)
+from database.instrumentation import instrument_engine
+
+
+def to_async_url(database_url: str) -> URL:
+    """Switch a PostgreSQL or SQLite URL to its async driver (asyncpg or aiosqlite)."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url.set(drivername="postgresql+asyncpg")
+
+
+def create_async_db_engine(
+    database_url: str = DATABASE_URL,
+    external_pooler: Optional[bool] = None,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    statement_timeout_ms: Optional[int] = None,
+    **engine_kwargs
+) -> AsyncEngine:
+    """
+    Create an async engine configured from the same DB_* settings as create_db_engine.
+
+    Behind an external pooler in transaction mode (PgBouncer/Supavisor) a server connection
+    may change between statements, so asyncpg's prepared statement caches are turned off.
+
+    Args:
+        database_url (str): A PostgreSQL or SQLite database URL; the driver is replaced with the async one.
+        external_pooler (Optional[bool]): Whether connections go through an external pooler.
+        pool_size (Optional[int]): Number of connections kept in the pool.
+        max_overflow (Optional[int]): Connections allowed beyond pool_size under load.
+        statement_timeout_ms (Optional[int]): Server-side statement timeout for PostgreSQL; 0 disables it.
+        **engine_kwargs: Extra keyword arguments passed to create_async_engine.
+
+    Returns:
+        AsyncEngine: The configured engine.
+    """
+    url = to_async_url(database_url)
+    external_pooler = DB_EXTERNAL_POOLER if external_pooler is None else external_pooler
+    pool_size = DB_POOL_SIZE if pool_size is None else pool_size
+    max_overflow = DB_MAX_OVERFLOW if max_overflow is None else max_overflow
+    statement_timeout_ms = DB_STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+
+    if url.get_backend_name() == "sqlite":
+        options = {}
+        if url.database in (None, "", ":memory:"):
+            # A single shared connection, otherwise every checkout sees a new empty database.
+            options["poolclass"] = StaticPool
+    else:
+        connect_args = {}
+        if statement_timeout_ms:
+            connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+        if external_pooler:
+            connect_args["statement_cache_size"] = 0
+            url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+        options = {
+            "connect_args": connect_args,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+            "pool_recycle": DB_POOL_RECYCLE,
+        }
+        if external_pooler and pool_size == 0:
+            options["poolclass"] = NullPool
+        else:
+            options.update(
+                pool_size=pool_size or 1,
+                max_overflow=0 if external_pooler else max_overflow,
+                pool_timeout=DB_POOL_TIMEOUT,
+            )
+
+    options.update(engine_kwargs)
+    engine = create_async_engine(url, **options)
+    _track_pool_events(engine.sync_engine)
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+# Created on first use, so importing this module does not require the async drivers.
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[sessionmaker] = None
+
+
+def init_async_engine(database_url: str = DATABASE_URL, **engine_kwargs) -> AsyncEngine:
+    """
+    Create the process-wide async engine and its session factory, replacing any previous engine.
+
+    Args:
+        database_url (str): The database URL; defaults to the configured DATABASE_URL.
+        **engine_kwargs: Extra keyword arguments passed to create_async_db_engine.
+
+    Returns:
+        AsyncEngine: The new engine.
+    """
+    global _async_engine, _async_sessionmaker
+    _async_engine = create_async_db_engine(database_url, **engine_kwargs)
+    _async_sessionmaker = sessionmaker(_async_engine, class_=AsyncSession, autoflush=False,
+                                       expire_on_commit=False)
+    return _async_engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the process-wide async engine, creating it on first use."""
+    if _async_engine is None:
+        return init_async_engine()
+    return _async_engine
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Provide an async session and always close it.
+
+    Services run on it through AsyncSession.run_sync and commit or roll back their own work.
+
+    Yields:
+        AsyncSession: The database session.
+    """
+    get_async_engine()
+    db = _async_sessionmaker()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def dispose_async_engine():
+    """Close the async engine's pooled connections, e.g. on application shutdown."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+
+
+async def gather_in_sessions(*calls: Tuple[Callable[..., Awaitable[Any]], ...]) -> List[Any]:
+    """
+    Run async service calls concurrently, each in its own session.
+
+    A session runs one statement at a time, so concurrent reads need one session (and
+    connection) each; the total time is then close to the slowest call rather than the sum.
+
+    Args:
+        *calls: (async function, *args) tuples; each function takes an AsyncSession first.
+
+    Returns:
+        List[Any]: The results, in the order of the calls.
+    """
+    async def run(func, *args):
+        async with async_session_scope() as db:
+            return await func(db, *args)
+
+    return list(await asyncio.gather(*(run(*call) for call in calls)))
+
+
+# Pooled async connections belong to the event loop that opened them, so synchronous callers
+# (Streamlit pages) share one long-lived loop on a background thread instead of asyncio.run().
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def run_async(coroutine: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine from synchronous code and wait for its result.
+
+    The caller's context variables (e.g. the active query scopes) are carried over to the coroutine.
+
+    Args:
+        coroutine (Awaitable[Any]): The coroutine to run on the background event loop.
+
+    Returns:
+        Any: The coroutine's result; its exception is raised in the caller.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="async-db-loop", daemon=True).start()
+    context = contextvars.copy_context()
+
+    async def in_caller_context():
+        for variable, value in context.items():
+            variable.set(value)
+        return await coroutine
+
+    return asyncio.run_coroutine_threadsafe(in_caller_context(), _loop).result()
@@ -1,9 +1,17 @@
 # File: database/connection.py
 
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 from dotenv import load_dotenv
+from database.instrumentation import instrument_engine
 
 # Load environment variables
 load_dotenv()
@@ -15,19 +23,206 @@ DB_HOST = os.getenv("DB_HOST", "aws-0-ap-south-1.pooler.supabase.com")
 DB_PORT = os.getenv("DB_PORT", "6543")
 DB_NAME = os.getenv("DB_NAME", "postgres")
 
-# Construct the database URL
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Construct the database URL. DATABASE_URL overrides the individual settings,
+# e.g. DATABASE_URL=sqlite:///wireman.db for local runs and tests.
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting from the environment."""
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Pool settings. Supabase's port 6543 is a transaction-mode pooler, so the app
+# defaults to "external pooler" mode there and lets the pooler own the connections.
+DB_EXTERNAL_POOLER = _env_bool("DB_EXTERNAL_POOLER", make_url(DATABASE_URL).port == 6543)
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 0 if DB_EXTERNAL_POOLER else 5)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 0 if DB_EXTERNAL_POOLER else 10)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 300 if DB_EXTERNAL_POOLER else 1800)
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+DB_STATEMENT_TIMEOUT_MS = _env_int("DB_STATEMENT_TIMEOUT_MS", 30000)
+
+# Pool event counters per engine, read through get_pool_stats.
+_pool_counters: "weakref.WeakKeyDictionary[Engine, Counter]" = weakref.WeakKeyDictionary()
+_pool_counters_lock = threading.Lock()
+
+
+def _track_pool_events(engine: Engine):
+    """Count connects, checkouts and checkins on the engine's pool."""
+    counters = Counter()
+    _pool_counters[engine] = counters
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        with _pool_counters_lock:
+            counters["connects"] += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with _pool_counters_lock:
+            counters["checkouts"] += 1
+            counters["checked_out"] += 1
+            counters["peak_checked_out"] = max(counters["peak_checked_out"], counters["checked_out"])
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        with _pool_counters_lock:
+            counters["checkins"] += 1
+            counters["checked_out"] -= 1
+
+
+def create_db_engine(
+    database_url: str = DATABASE_URL,
+    external_pooler: Optional[bool] = None,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    statement_timeout_ms: Optional[int] = None,
+    **engine_kwargs
+) -> Engine:
+    """
+    Create an engine configured from the DB_* environment settings.
+
+    Args:
+        database_url (str): A PostgreSQL or SQLite database URL.
+        external_pooler (Optional[bool]): Whether connections go through an external pooler such as
+            PgBouncer/Supavisor. Uses NullPool, or a small pool without overflow if pool_size > 0.
+        pool_size (Optional[int]): Number of connections kept in the pool.
+        max_overflow (Optional[int]): Connections allowed beyond pool_size under load.
+        statement_timeout_ms (Optional[int]): Server-side statement timeout for PostgreSQL; 0 disables it.
+        **engine_kwargs: Extra keyword arguments passed to create_engine.
+
+    Returns:
+        Engine: The configured engine.
+    """
+    url = make_url(database_url)
+    external_pooler = DB_EXTERNAL_POOLER if external_pooler is None else external_pooler
+    pool_size = DB_POOL_SIZE if pool_size is None else pool_size
+    max_overflow = DB_MAX_OVERFLOW if max_overflow is None else max_overflow
+    statement_timeout_ms = DB_STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            # A single shared connection, otherwise every checkout sees a new empty database.
+            options["poolclass"] = StaticPool
+        else:
+            options.update(poolclass=QueuePool, pool_size=max(pool_size, 1), max_overflow=max_overflow,
+                           pool_timeout=DB_POOL_TIMEOUT)
+    else:
+        connect_args = {}
+        if statement_timeout_ms:
+            connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+        options = {
+            "connect_args": connect_args,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+            "pool_recycle": DB_POOL_RECYCLE,
+        }
+        if external_pooler and pool_size == 0:
+            options["poolclass"] = NullPool
+        else:
+            options.update(
+                poolclass=QueuePool,
+                pool_size=pool_size or 1,
+                max_overflow=0 if external_pooler else max_overflow,
+                pool_timeout=DB_POOL_TIMEOUT,
+            )
+
+    options.update(engine_kwargs)
+    engine = create_engine(url, **options)
+    _track_pool_events(engine)
+    instrument_engine(engine)
+    return engine
+
+
+def get_pool_stats(target_engine: Optional[Engine] = None) -> dict:
+    """
+    Get connection pool statistics for sizing the pool under concurrent sessions.
+
+    Args:
+        target_engine (Optional[Engine]): The engine to inspect; defaults to the application engine.
+
+    Returns:
+        dict: Pool class, configured size, current checked-in/checked-out/overflow counts and
+              cumulative connect/checkout/checkin counters.
+    """
+    target_engine = target_engine or engine
+    pool = target_engine.pool
+    with _pool_counters_lock:
+        counters = dict(_pool_counters.get(target_engine, Counter()))
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size() if hasattr(pool, "size") else 0,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+        "checked_out": counters.get("checked_out", 0),
+        "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+        "peak_checked_out": counters.get("peak_checked_out", 0),
+        "connects": counters.get("connects", 0),
+        "checkouts": counters.get("checkouts", 0),
+        "checkins": counters.get("checkins", 0),
+    }
+
+
+# Create the SQLAlchemy engine once per process; Streamlit reruns reuse the imported module.
+engine = create_db_engine()
 
 # Create a sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def get_db():
-    """Dependency to get a database session."""
+# Sessions opened and closed through session_scope/get_db, read through get_session_stats.
+_session_counters = Counter()
+_session_counters_lock = threading.Lock()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Provide a session scoped to one script run or request and always close it.
+
+    Services commit or roll back their own work; anything left uncommitted is
+    rolled back when the session closes and its connection goes back to the pool.
+
+    Yields:
+        Session: The database session.
+    """
     db = SessionLocal()
+    with _session_counters_lock:
+        _session_counters["opened"] += 1
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+        with _session_counters_lock:
+            _session_counters["closed"] += 1
+
+
+def get_db():
+    """Dependency to get a database session."""
+    with session_scope() as db:
+        yield db
+
+
+def get_session_stats() -> dict:
+    """
+    Get session lifecycle counters together with the application pool statistics.
+
+    A growing "open_sessions" or "checked_out" count between reruns indicates leaked sessions.
+
+    Returns:
+        dict: opened/closed/open session counts merged with get_pool_stats().
+    """
+    with _session_counters_lock:
+        opened = _session_counters["opened"]
+        closed = _session_counters["closed"]
+    return {"sessions_opened": opened, "sessions_closed": closed, "open_sessions": opened - closed,
+            **get_pool_stats(engine)}
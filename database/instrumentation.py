@@ -0,0 +1,157 @@
+# File: database/instrumentation.py
+
+import json
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Iterator, List, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Statements slower than this are written to the slow-query log.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+# The same statement run this many times in one scope is reported as a likely N+1 pattern.
+REPEATED_STATEMENT_THRESHOLD = int(os.getenv("REPEATED_STATEMENT_THRESHOLD", "5"))
+# Slowest statements kept per scope.
+SLOWEST_KEPT = 5
+# Show the SQL debug panel in the sidebar.
+SQL_DEBUG_PANEL = os.getenv("SQL_DEBUG_PANEL", "").strip().lower() in ("1", "true", "yes", "on")
+
+# Events are logged at INFO, which is off unless SLOW_QUERY_LOG is set or the app configures
+# this logger; the NullHandler keeps them off logging's last-resort stderr handler.
+logger = logging.getLogger("wireman_tracker.sql")
+logger.addHandler(logging.NullHandler())
+if os.getenv("SLOW_QUERY_LOG"):
+    _handler = logging.FileHandler(os.getenv("SLOW_QUERY_LOG"), encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+
+class QueryStats:
+    """SQL statements executed within one page render or service call."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.statement_count = 0
+        self.total_ms = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self.statements = Counter()
+        self.children: List["QueryStats"] = []
+
+    def record(self, statement: str, elapsed_ms: float, batch: bool = False):
+        """
+        Count one executed statement and keep it if it is among the slowest.
+
+        Batch executions (executemany or multi-row INSERT ... VALUES) are left out of the
+        repeated statement counts, since running the same batch statement per chunk is not N+1.
+        """
+        self.statement_count += 1
+        self.total_ms += elapsed_ms
+        if not batch:
+            self.statements[statement] += 1
+        if len(self.slowest) < SLOWEST_KEPT or elapsed_ms > self.slowest[-1][0]:
+            self.slowest.append((elapsed_ms, statement))
+            self.slowest.sort(key=lambda entry: entry[0], reverse=True)
+            del self.slowest[SLOWEST_KEPT:]
+
+    def repeated_statements(self, threshold: int = REPEATED_STATEMENT_THRESHOLD) -> List[Tuple[str, int]]:
+        """Get the statements executed at least threshold times, most repeated first."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def to_dict(self) -> dict:
+        """Summarize the scope for logs and the debug panel."""
+        return {
+            "name": self.name,
+            "statements": self.statement_count,
+            "total_ms": round(self.total_ms, 2),
+            "slowest": [{"ms": round(ms, 2), "statement": statement} for ms, statement in self.slowest],
+            "repeated": [{"count": count, "statement": statement} for statement, count in self.repeated_statements()],
+        }
+
+
+# The scopes open in the current thread or task, outermost first.
+_active_scopes: ContextVar[Tuple[QueryStats, ...]] = ContextVar("active_query_scopes", default=())
+
+
+def _log(event_name: str, **fields):
+    """Write one structured (JSON) log line."""
+    logger.info(json.dumps({"event": event_name, **fields}, default=str))
+
+
+def _is_batch(context, executemany: bool) -> bool:
+    """Whether an execution carries many rows: executemany, or a multi-row INSERT ... VALUES."""
+    if executemany:
+        return True
+    statement = getattr(getattr(context, "compiled", None), "statement", None)
+    return bool(getattr(statement, "_multi_values", None))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_times"].pop()) * 1000
+    scopes = _active_scopes.get()
+    batch = _is_batch(context, executemany)
+    for scope in scopes:
+        scope.record(statement, elapsed_ms, batch)
+    if elapsed_ms >= SLOW_QUERY_MS:
+        _log("slow_query", ms=round(elapsed_ms, 2), statement=statement, executemany=executemany,
+             scopes=[scope.name for scope in scopes])
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    if context.connection is not None and context.connection.info.get("query_start_times"):
+        context.connection.info["query_start_times"].pop()
+
+
+def instrument_engine(engine: Engine):
+    """Time every statement the engine executes and record it in the active query scopes."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def query_scope(name: str) -> Iterator[QueryStats]:
+    """
+    Record the statements executed inside the block, e.g. one page render or service call.
+
+    Scopes nest: a statement counts towards every open scope, and a scope opened inside
+    another is added to the outer scope's children. Repeated identical statements are
+    logged when the outermost scope closes.
+
+    Yields:
+        QueryStats: The scope's statistics, complete once the block exits.
+    """
+    stats = QueryStats(name)
+    parents = _active_scopes.get()
+    if parents:
+        parents[-1].children.append(stats)
+    token = _active_scopes.set(parents + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_scopes.reset(token)
+        if not parents:
+            for statement, count in stats.repeated_statements():
+                _log("repeated_statement", scope=name, count=count, statement=statement)
+
+
+def instrumented(func: Callable) -> Callable:
+    """Record a service function's statements in a query scope named after it."""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with query_scope(name):
+            return func(*args, **kwargs)
+
+    return wrapper
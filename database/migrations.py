@@ -0,0 +1,223 @@
+# File: database/migrations.py
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from database.models import (
+    Base, Bill, BillDailyRollup, OUTSTANDING_BILLS_WHERE, PaymentStatus, PointTransaction, Receivable,
+    WIREMAN_TRIGRAM_INDEXES_SQL
+)
+from typing import Callable, List, Tuple
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+# Spellings folded into each payment status by migration 6, compared lower-cased with
+# '-' and '_' read as spaces. Any other status becomes "Not paid".
+PAYMENT_STATUS_ALIASES = {
+    PaymentStatus.PAID: ["paid", "fully paid", "full paid"],
+    PaymentStatus.PARTIALLY_PAID: ["partially paid", "partial", "partly paid", "part paid"],
+    PaymentStatus.NOT_PAID: ["not paid", "unpaid", "due", "pending"],
+}
+
+
+def _add_hot_column_indexes(conn: Connection):
+    """Index the bills/points columns used by every hot query and make points one row per wireman."""
+    # Fold duplicate points rows into the oldest one before the unique index is created.
+    conn.execute(text("""
+        UPDATE points SET
+            total_points = (SELECT SUM(p.total_points) FROM points p WHERE p.wireman_id = points.wireman_id),
+            redeemed_points = (SELECT SUM(p.redeemed_points) FROM points p WHERE p.wireman_id = points.wireman_id),
+            balance_points = (SELECT SUM(p.balance_points) FROM points p WHERE p.wireman_id = points.wireman_id)
+        WHERE id IN (SELECT MIN(id) FROM points GROUP BY wireman_id HAVING COUNT(*) > 1)
+    """))
+    conn.execute(text("""
+        DELETE FROM points
+        WHERE wireman_id IS NOT NULL
+          AND id NOT IN (SELECT MIN(id) FROM points WHERE wireman_id IS NOT NULL GROUP BY wireman_id)
+    """))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_bills_wireman_id_date ON bills (wireman_id, date)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_bills_date ON bills (date)"))
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_points_wireman_id ON points (wireman_id)"))
+
+
+def _add_points_ledger(conn: Connection):
+    """Create the point_transactions ledger and backfill it so it reproduces the current points rows."""
+    PointTransaction.__table__.create(conn, checkfirst=True)
+    # One 'earn' entry per existing bill.
+    conn.execute(text("""
+        INSERT INTO point_transactions (wireman_id, bill_id, kind, points)
+        SELECT wireman_id, id, 'earn', points_earned FROM bills
+        WHERE wireman_id IS NOT NULL AND points_earned IS NOT NULL AND points_earned <> 0
+    """))
+    # Totals that the bills do not explain become one 'adjust' entry per wireman.
+    conn.execute(text("""
+        INSERT INTO point_transactions (wireman_id, kind, points)
+        SELECT p.wireman_id, 'adjust', COALESCE(p.total_points, 0) - COALESCE(b.points, 0)
+        FROM points p
+        LEFT JOIN (SELECT wireman_id, SUM(points_earned) AS points FROM bills GROUP BY wireman_id) b
+            ON b.wireman_id = p.wireman_id
+        WHERE p.wireman_id IS NOT NULL AND COALESCE(p.total_points, 0) <> COALESCE(b.points, 0)
+    """))
+    # Past redemptions become one 'redeem' entry per wireman.
+    conn.execute(text("""
+        INSERT INTO point_transactions (wireman_id, kind, points)
+        SELECT wireman_id, 'redeem', -redeemed_points FROM points
+        WHERE wireman_id IS NOT NULL AND COALESCE(redeemed_points, 0) <> 0
+    """))
+
+
+def _add_bill_daily_rollups(conn: Connection):
+    """Create the per-wireman daily bill rollup and fill it from bills."""
+    BillDailyRollup.__table__.create(conn, checkfirst=True)
+    conn.execute(text("""
+        INSERT INTO bill_daily_rollups (wireman_id, day, bill_count, amount_sum, points_sum)
+        SELECT wireman_id, date, COUNT(id), COALESCE(SUM(amount), 0), COALESCE(SUM(points_earned), 0)
+        FROM bills
+        WHERE wireman_id IS NOT NULL AND date IS NOT NULL
+        GROUP BY wireman_id, date
+    """))
+
+
+def _add_wireman_search_indexes(conn: Connection):
+    """Add the pg_trgm indexes used by the wireman search; SQLite has no equivalent and is skipped."""
+    if conn.dialect.name != "postgresql":
+        return
+    for statement in WIREMAN_TRIGRAM_INDEXES_SQL:
+        conn.execute(text(statement))
+
+
+def _add_bill_analytics_index(conn: Connection):
+    """Add the covering index read by the analytics payment status breakdown."""
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_bills_date_payment_status_amount ON bills (date, payment_status, amount)"
+    ))
+
+
+def _normalize_payment_status(conn: Connection):
+    """
+    Fold payment status spellings into the PaymentStatus values and index the outstanding bills.
+
+    Unrecognized and missing statuses become "Not paid", so no money owed drops out of the
+    receivables; review those bills after migrating. On PostgreSQL the column becomes the
+    payment_status enum type; SQLite keeps a string column, checked on write by the model.
+    """
+    for status, aliases in PAYMENT_STATUS_ALIASES.items():
+        conn.execute(text("""
+            UPDATE bills SET payment_status = :status
+            WHERE LOWER(REPLACE(REPLACE(TRIM(payment_status), '-', ' '), '_', ' ')) IN :aliases
+              AND payment_status <> :status
+        """).bindparams(bindparam("aliases", expanding=True)), {"status": status.value, "aliases": aliases})
+    conn.execute(text("""
+        UPDATE bills SET payment_status = :not_paid
+        WHERE payment_status IS NULL OR payment_status NOT IN :statuses
+    """).bindparams(bindparam("statuses", expanding=True)),
+        {"not_paid": PaymentStatus.NOT_PAID.value, "statuses": [status.value for status in PaymentStatus]})
+
+    if conn.dialect.name == "postgresql":
+        Bill.__table__.c.payment_status.type.create(conn, checkfirst=True)
+        conn.execute(text(
+            "ALTER TABLE bills ALTER COLUMN payment_status TYPE payment_status USING payment_status::payment_status"
+        ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_bills_outstanding_wireman_id_date ON bills (wireman_id, date) "
+        f"WHERE {OUTSTANDING_BILLS_WHERE.text}"
+    ))
+
+
+def _add_receivables(conn: Connection):
+    """Create the receivables table and fill it from the outstanding bills."""
+    Receivable.__table__.create(conn, checkfirst=True)
+    conn.execute(text(f"""
+        INSERT INTO receivables (wireman_id, client_name, day, bill_count, not_paid_amount, partially_paid_amount)
+        SELECT wireman_id, COALESCE(client_name, ''), date, COUNT(id),
+               COALESCE(SUM(CASE WHEN payment_status = :not_paid THEN amount END), 0),
+               COALESCE(SUM(CASE WHEN payment_status = :partially_paid THEN amount END), 0)
+        FROM bills
+        WHERE wireman_id IS NOT NULL AND date IS NOT NULL AND {OUTSTANDING_BILLS_WHERE.text}
+        GROUP BY wireman_id, COALESCE(client_name, ''), date
+    """), {"not_paid": PaymentStatus.NOT_PAID.value, "partially_paid": PaymentStatus.PARTIALLY_PAID.value})
+
+
+def _keep_ledger_of_deleted_wiremen(conn: Connection):
+    """Drop the ledger's foreign key to wiremen, so deleting a wireman keeps their points history."""
+    if conn.dialect.name != "postgresql":
+        return  # SQLite does not enforce the foreign key here
+    conn.execute(text("ALTER TABLE point_transactions DROP CONSTRAINT IF EXISTS point_transactions_wireman_id_fkey"))
+
+
+# Ordered list of (version, description, upgrade). Append new migrations; never edit applied ones.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Index bills(wireman_id, date), bills(date) and unique points(wireman_id)", _add_hot_column_indexes),
+    (2, "Add the point_transactions ledger backfilled from bills and points", _add_points_ledger),
+    (3, "Add the bill_daily_rollups table filled from bills", _add_bill_daily_rollups),
+    (4, "Add pg_trgm indexes on wiremen(name) and wiremen(contact_info)", _add_wireman_search_indexes),
+    (5, "Index bills(date, payment_status, amount) for the analytics breakdown", _add_bill_analytics_index),
+    (6, "Normalize bills.payment_status to the PaymentStatus values and index outstanding bills",
+     _normalize_payment_status),
+    (7, "Add the receivables table filled from outstanding bills", _add_receivables),
+    (8, "Drop the point_transactions foreign key to wiremen", _keep_ledger_of_deleted_wiremen),
+]
+
+
+def _ensure_version_table(conn: Connection):
+    """Create the schema version table if it does not exist."""
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR NOT NULL)"
+    ))
+
+
+def _record_version(conn: Connection, version: int, description: str):
+    """Mark a migration as applied."""
+    conn.execute(
+        text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) VALUES (:version, :description)"),
+        {"version": version, "description": description}
+    )
+
+
+def get_current_version(conn: Connection) -> int:
+    """Get the highest applied schema version, or 0 if none has been applied."""
+    _ensure_version_table(conn)
+    return conn.execute(text(f"SELECT COALESCE(MAX(version), 0) FROM {SCHEMA_VERSION_TABLE}")).scalar()
+
+
+def apply_migrations(engine: Engine) -> List[int]:
+    """
+    Bring the database schema up to date.
+
+    An empty database is created from the current models and stamped with the latest
+    version. An existing database has each pending migration applied in its own transaction.
+
+    Args:
+        engine (Engine): The engine to migrate.
+
+    Returns:
+        List[int]: The versions applied (or stamped) by this call.
+    """
+    with engine.begin() as conn:
+        current_version = get_current_version(conn)
+        if current_version == 0 and not inspect(conn).has_table("wiremen"):
+            Base.metadata.create_all(conn)
+            for version, description, _ in MIGRATIONS:
+                _record_version(conn, version, description)
+            return [version for version, _, _ in MIGRATIONS]
+
+    applied = []
+    for version, description, upgrade in MIGRATIONS:
+        if version <= current_version:
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            _record_version(conn, version, description)
+        applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    from database.connection import engine
+
+    applied_versions = apply_migrations(engine)
+    if applied_versions:
+        print(f"Applied schema versions: {', '.join(map(str, applied_versions))}")
+    else:
+        print("Schema is up to date.")
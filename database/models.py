@@ -1,6 +1,7 @@
 # File: database/models.py
 
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey
+import enum
+from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, Numeric, ForeignKey, Index, DDL, event, func, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -17,6 +18,26 @@ class Wireman(Base):
     bills = relationship("Bill", back_populates="wireman")
     points = relationship("Point", back_populates="wireman")
 
+# Trigram GIN indexes behind the wireman search (PostgreSQL only). They serve ILIKE with
+# a prefix or substring pattern on name and contact_info.
+WIREMAN_TRIGRAM_INDEXES_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_wiremen_name_trgm ON wiremen USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_wiremen_contact_info_trgm ON wiremen USING gin (contact_info gin_trgm_ops)",
+]
+for statement in WIREMAN_TRIGRAM_INDEXES_SQL:
+    event.listen(Wireman.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+class PaymentStatus(str, enum.Enum):
+    PAID = "Paid"
+    PARTIALLY_PAID = "Partially Paid"
+    NOT_PAID = "Not paid"
+
+# The values stored in bills.payment_status, and those that leave money to collect.
+PAYMENT_STATUSES = [status.value for status in PaymentStatus]
+OUTSTANDING_STATUSES = [PaymentStatus.PARTIALLY_PAID.value, PaymentStatus.NOT_PAID.value]
+OUTSTANDING_BILLS_WHERE = text(f"payment_status <> '{PaymentStatus.PAID.value}'")
+
 class Bill(Base):
     __tablename__ = "bills"
 
@@ -25,18 +46,75 @@ class Bill(Base):
     client_name = Column(String)
     amount = Column(Numeric(10, 2))
     date = Column(Date)
-    payment_status = Column(String)
+    # A native enum on PostgreSQL; elsewhere a string checked against the values on write.
+    payment_status = Column(Enum(*PAYMENT_STATUSES, name="payment_status", validate_strings=True))
     points_earned = Column(Numeric(10, 2))
 
     wireman = relationship("Wireman", back_populates="bills")
 
+    __table_args__ = (
+        Index("ix_bills_wireman_id_date", "wireman_id", "date"),
+        Index("ix_bills_date", "date"),
+        # Covers the analytics payment status breakdown, so it never reads the table.
+        Index("ix_bills_date_payment_status_amount", "date", "payment_status", "amount"),
+        # Partial index over the bills still to be paid, a minority of the table.
+        Index("ix_bills_outstanding_wireman_id_date", "wireman_id", "date",
+              postgresql_where=OUTSTANDING_BILLS_WHERE, sqlite_where=OUTSTANDING_BILLS_WHERE),
+    )
+
 class Point(Base):
     __tablename__ = "points"
 
     id = Column(Integer, primary_key=True, index=True)
-    wireman_id = Column(Integer, ForeignKey("wiremen.id"))
+    wireman_id = Column(Integer, ForeignKey("wiremen.id"), unique=True, index=True)
     total_points = Column(Numeric(10, 2))
     redeemed_points = Column(Numeric(10, 2))
     balance_points = Column(Numeric(10, 2))
 
-    wireman = relationship("Wireman", back_populates="points")
\ No newline at end of file
+    wireman = relationship("Wireman", back_populates="points")
+
+# Append-only points ledger; the points table is a snapshot of its running totals.
+# points is the signed change to the balance: 'earn'/'reverse' follow bills, 'adjust'
+# corrects the total, and 'redeem' moves points between balance and redeemed.
+# wireman_id has no foreign key, so the history outlives a deleted wireman.
+class PointTransaction(Base):
+    __tablename__ = "point_transactions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    wireman_id = Column(Integer, nullable=False, index=True)
+    bill_id = Column(Integer)
+    kind = Column(String, nullable=False)
+    points = Column(Numeric(10, 2), nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+# Per-wireman, per-day bill totals kept in step with bills by the write paths,
+# so leaderboards and trends do not aggregate the whole bills table.
+class BillDailyRollup(Base):
+    __tablename__ = "bill_daily_rollups"
+
+    wireman_id = Column(Integer, ForeignKey("wiremen.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    bill_count = Column(Integer, nullable=False)
+    amount_sum = Column(Numeric(14, 2), nullable=False)
+    points_sum = Column(Numeric(14, 2), nullable=False)
+
+    __table_args__ = (
+        Index("ix_bill_daily_rollups_day", "day"),
+    )
+
+# Outstanding (not fully paid) bill amounts per wireman, client and bill day, kept in step
+# with bills by the write paths, so receivables are aged without scanning the bills table.
+# Bills without a client name are kept under ''.
+class Receivable(Base):
+    __tablename__ = "receivables"
+
+    wireman_id = Column(Integer, ForeignKey("wiremen.id"), primary_key=True)
+    client_name = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    bill_count = Column(Integer, nullable=False)
+    not_paid_amount = Column(Numeric(14, 2), nullable=False)
+    partially_paid_amount = Column(Numeric(14, 2), nullable=False)
+
+    __table_args__ = (
+        Index("ix_receivables_client_name", "client_name"),
+    )
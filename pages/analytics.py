@@ -0,0 +1,90 @@
+# File: pages/analytics.py
+
+import streamlit as st
+from database.connection import session_scope
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timedelta
+from services import analytics_service
+from utils.widgets import instrumented_page, wireman_picker
+
+FREQUENCIES = {"Daily": "daily", "Weekly": "weekly", "Monthly": "monthly"}
+
+def analytics():
+    st.title("Analytics")
+
+    try:
+        with instrumented_page("analytics"), session_scope() as db:
+            # Filters
+            col1, col2 = st.columns(2)
+            with col1:
+                wireman_id = wireman_picker(db, "analytics_wireman", label="Wireman", include_all=True)
+            with col2:
+                date_range = st.date_input(
+                    "Date Range",
+                    value=(datetime.now().date() - timedelta(days=365), datetime.now().date()),
+                    key="analytics_date_range"
+                )
+            col3, col4 = st.columns(2)
+            with col3:
+                frequency = st.radio("Group By", list(FREQUENCIES), index=2, horizontal=True)
+            with col4:
+                moving_average_window = st.slider("Moving Average (periods)", min_value=1, max_value=12, value=3)
+
+            if len(date_range) != 2:
+                st.info("Select the end of the date range.")
+                return
+
+            result = analytics_service.get_bill_analytics(
+                db, tuple(date_range), wireman_id, FREQUENCIES[frequency], moving_average_window
+            )
+            if not result.totals["bill_count"].any():
+                st.info("No bills found matching the criteria.")
+                return
+
+            display_totals(result.totals)
+            display_payment_status(result.payment_status)
+            if wireman_id is None:
+                display_growth(result.growth)
+
+    except SQLAlchemyError as e:
+        st.error(f"An error occurred while accessing the database: {str(e)}")
+    except Exception as e:
+        st.error(f"An unexpected error occurred: {str(e)}")
+
+def display_totals(totals):
+    """Display the summary metrics and the bill amount and bill count charts."""
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Bills", f"{int(totals['bill_count'].sum()):,}")
+    col2.metric("Bill Amount", f"₹{totals['amount'].sum():,.2f}")
+    col3.metric("Points Earned", f"{totals['points'].sum():,.2f}")
+
+    st.header("Bill Amount")
+    st.line_chart(totals[["amount", "amount_moving_average"]].rename(
+        columns={"amount": "Amount", "amount_moving_average": "Moving Average"}
+    ))
+    st.header("Number of Bills")
+    st.bar_chart(totals["bill_count"].rename("Bills"))
+
+def display_payment_status(payment_status):
+    """Display the bill amount per period stacked by payment status."""
+    st.header("Bill Amount by Payment Status")
+    st.bar_chart(payment_status)
+
+def display_growth(growth):
+    """Display the wiremen whose bill amount grew fastest between the last two periods."""
+    st.header("Fastest Growing Wiremen")
+    st.caption("Bill amount in the last complete period compared with the one before. "
+               "A period still in progress, or cut off by the date range, is left out.")
+    if growth.empty:
+        st.info("Not enough periods to compare.")
+        return
+    table = growth.rename(columns={
+        "wireman_id": "Wireman ID", "name": "Name", "previous_amount": "Previous Period",
+        "current_amount": "Last Period", "growth": "Growth"
+    })
+    st.dataframe(table.style.format({
+        "Previous Period": "₹{:,.2f}", "Last Period": "₹{:,.2f}", "Growth": "{:+.1%}"
+    }, na_rep="new"), use_container_width=True)
+
+if __name__ == "__main__":
+    analytics()
@@ -1,12 +1,14 @@
 # File: pages/bill_entry_service.py
 
 import streamlit as st
-from database.connection import get_db
+from database.connection import session_scope
+from database.models import PAYMENT_STATUSES
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import date
 from decimal import Decimal
-from services import bill_entry_service
+from services import bill_entry_service, wireman_search_service
+from utils.widgets import client_name_input, instrumented_page, wireman_picker
 
 
 def bill_entry():
@@ -14,30 +16,30 @@ def bill_entry():
     st.title("Bill Entry")
 
     try:
-        db = next(get_db())
+        with instrumented_page("bill_entry"), session_scope() as db:
+            if not wireman_search_service.search_wiremen(db, "", limit=1):
+                st.warning("No wiremen registered yet. Please register a wireman before entering bills.")
+                return
 
-        wiremen = bill_entry_service.fetch_all_wiremen(db)
-        if not wiremen:
-            st.warning("No wiremen registered yet. Please register a wireman before entering bills.")
-            return
+            # The wireman search and client suggestions sit outside the form so that typing reruns them.
+            wireman_id = wireman_picker(db, "bill_entry_wireman")
+            client_name = client_name_input(db, "bill_entry_client")
 
-        with st.form("bill_entry_form"):
-            wireman_name = st.selectbox("Wireman", options=[w.name for w in wiremen])
-            client_name = st.text_input("Client Name")
-            bill_amount = st.number_input("Bill Amount", min_value=0.0, step=100.0)
-            bill_date = st.date_input("Bill Date", value=date.today())
-            payment_status = st.selectbox("Payment Status", ["Paid", "Partially Paid", "Not paid"])
+            with st.form("bill_entry_form"):
+                bill_amount = st.number_input("Bill Amount", min_value=0.0, step=100.0)
+                bill_date = st.date_input("Bill Date", value=date.today())
+                payment_status = st.selectbox("Payment Status", PAYMENT_STATUSES)
 
-            submit_button = st.form_submit_button("Submit Bill")
+                submit_button = st.form_submit_button("Submit Bill")
 
-        if submit_button:
-            process_bill_submission(db, wireman_name, client_name, bill_amount, bill_date, payment_status)
+            if submit_button:
+                process_bill_submission(db, wireman_id, client_name, bill_amount, bill_date, payment_status)
 
     except SQLAlchemyError as e:
         st.error(f"An error occurred while connecting to the database: {str(e)}")
 
 
-def process_bill_submission(db: Session, wireman_name: str, client_name: str, bill_amount: float, bill_date: date,
+def process_bill_submission(db: Session, wireman_id: int, client_name: str, bill_amount: float, bill_date: date,
                             payment_status: str):
     """Process the bill submission."""
     is_valid, error_message = bill_entry_service.validate_bill_data(client_name, Decimal(str(bill_amount)))
@@ -46,14 +48,13 @@ def process_bill_submission(db: Session, wireman_name: str, client_name: str, bi
         st.error(error_message)
         return
 
-    wireman = next((w for w in bill_entry_service.fetch_all_wiremen(db) if w.name == wireman_name), None)
-    if not wireman:
+    if wireman_id is None:
         st.error("Selected wireman not found.")
         return
 
     success, message = bill_entry_service.submit_bill(
         db,
-        wireman.id,
+        wireman_id,
         client_name,
         Decimal(str(bill_amount)),
         bill_date,
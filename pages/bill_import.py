@@ -0,0 +1,57 @@
+# File: pages/bill_import.py
+
+import streamlit as st
+import pandas as pd
+from database.connection import session_scope
+from sqlalchemy.exc import SQLAlchemyError
+from services import bill_import_service
+from utils.widgets import instrumented_page
+
+
+def bill_import():
+    """Streamlit page for importing bills in bulk from a CSV or Excel file."""
+    st.title("Bulk Bill Import")
+
+    st.write("""
+    Upload a CSV or Excel (.xlsx) file with one bill per row and these columns:
+    `wireman` (or `wireman_id`), `client_name`, `amount`, `date` and `payment_status`.
+    """)
+
+    uploaded_file = st.file_uploader("Bills file", type=["csv", "xlsx"])
+    batch_size = st.number_input("Batch size", min_value=100, max_value=10000,
+                                 value=bill_import_service.DEFAULT_BATCH_SIZE, step=100)
+
+    if uploaded_file is not None and st.button("Import Bills"):
+        try:
+            with instrumented_page("bill_import"), session_scope() as db, st.spinner("Importing bills..."):
+                report = bill_import_service.import_bills(
+                    db, bill_import_service.iter_bill_rows(uploaded_file, uploaded_file.name), int(batch_size)
+                )
+            display_import_report(report)
+        except SQLAlchemyError as e:
+            st.error(f"An error occurred while accessing the database: {str(e)}")
+        except Exception as e:
+            st.error(f"Could not read the file: {str(e)}")
+
+
+def display_import_report(report: bill_import_service.ImportReport):
+    """Display the import counts, throughput and rejected rows."""
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Rows Read", report.rows_read)
+    col2.metric("Bills Imported", report.rows_imported)
+    col3.metric("Rows Rejected", len(report.rejected))
+    col4.metric("Rows / Second", f"{report.rows_per_second:,.0f}")
+
+    if report.rejected:
+        st.subheader("Rejected Rows")
+        st.dataframe(pd.DataFrame({
+            "Line": [row.line_number for row in report.rejected],
+            "Reason": [row.reason for row in report.rejected],
+            "Values": [str(row.values) for row in report.rejected]
+        }))
+    else:
+        st.success("All rows imported successfully.")
+
+
+if __name__ == "__main__":
+    bill_import()
@@ -2,94 +2,151 @@
 
 import streamlit as st
 import pandas as pd
-from sqlalchemy import func
-from database.connection import get_db
-from database.models import Bill, Wireman
-from sqlalchemy.orm import Session
+from database.connection import session_scope
+from database.models import PAYMENT_STATUSES
 from sqlalchemy.exc import SQLAlchemyError
-from decimal import Decimal
+from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from services import summary_stats_service, bill_records_service, bill_entry_service, export_service
+from utils.widgets import export_controls, instrumented_page, wireman_picker
+
+PAGE_SIZES = [25, 50, 100, 200]
 
 def bill_records():
     st.title("Bill Records")
 
     try:
-        db = next(get_db())
-
-        # Display total bill amount
-        total_bill_amount = get_total_bill_amount(db)
-        st.metric("Total Bill Amount Generated", f"₹{total_bill_amount:,.2f}")
-
-        # Get all wiremen for the filter
-        wiremen = get_all_wiremen(db)
-        wireman_names = ["All"] + [w.name for w in wiremen]
-
-        # Filters
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            bill_id_filter = st.number_input("Filter by Bill ID (Optional)", min_value=0, value=0, step=1)
-        with col2:
-            wireman_filter = st.selectbox("Filter by Wireman", options=wireman_names)
-        with col3:
-            date_range = st.date_input(
-                "Date Range",
-                value=(datetime.now().date() - timedelta(days=30), datetime.now().date()),
-                key="date_range"
+        with instrumented_page("bill_records"), session_scope() as db:
+            # Display total bill amount
+            total_bill_amount = summary_stats_service.get_total_bill_amount(db)
+            st.metric("Total Bill Amount Generated", f"₹{total_bill_amount:,.2f}")
+
+            # Filters
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                bill_id_filter = st.number_input("Filter by Bill ID (Optional)", min_value=0, value=0, step=1)
+            with col2:
+                wireman_id = wireman_picker(db, "bill_records_wireman", label="Filter by Wireman", include_all=True)
+            with col3:
+                date_range = st.date_input(
+                    "Date Range",
+                    value=(datetime.now().date() - timedelta(days=30), datetime.now().date()),
+                    key="date_range"
+                )
+
+            # Get the current page of filtered bills
+            filters = (bill_id_filter, wireman_id, tuple(date_range))
+            page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+            cursor = get_page_cursor(filters, page_size)
+            page = bill_records_service.get_bills_page(
+                db, bill_id_filter, wireman_id, date_range, page_size=page_size, **cursor
             )
 
-        # Get filtered bills
-        bills = get_filtered_bills(db, bill_id_filter, wireman_filter, wiremen, date_range)
-
-        # Create a DataFrame with filtered bills
-        df = pd.DataFrame([
-            {
-                "Bill ID": bill.id,
-                "Wireman": next((w.name for w in wiremen if w.id == bill.wireman_id), "Unknown"),
-                "Client Name": bill.client_name,
-                "Amount": float(bill.amount),
-                "Date": bill.date,
-                "Points Earned": float(bill.points_earned),
-                "Payment Status": bill.payment_status
-            } for bill in bills
-        ])
-
-        # Display filtered bills
-        st.header("Bill Records")
-        if df.empty:
-            st.info("No bills found matching the criteria.")
-        else:
-            st.dataframe(df.style.format({
-                "Amount": "₹{:.2f}",
-                "Points Earned": "{:.2f}",
-                "Date": lambda x: x.strftime("%Y-%m-%d") if pd.notnull(x) else ""
-            }))
+            # Create a DataFrame with the bills on this page
+            df = bill_records_service.bill_rows_to_frame(page.bills)
+
+            # Display filtered bills
+            st.header("Bill Records")
+            if df.empty:
+                st.info("No bills found matching the criteria.")
+            else:
+                edit_bill_records(db, df, page)
+                display_page_navigation(page, page_size)
+
+                with st.expander("Export Bill Records"):
+                    export_controls(
+                        "bill_records_export", "bill_records",
+                        lambda file, file_format: export_service.export_bill_records(
+                            db, file, file_format, bill_id_filter, wireman_id, date_range
+                        )
+                    )
 
     except SQLAlchemyError as e:
         st.error(f"An error occurred while accessing the database: {str(e)}")
     except Exception as e:
         st.error(f"An unexpected error occurred: {str(e)}")
 
-def get_total_bill_amount(db: Session) -> Decimal:
-    """Get the total bill amount from all wiremen combined."""
-    return db.query(func.sum(Bill.amount)).scalar() or Decimal('0')
-
-def get_filtered_bills(db: Session, bill_id: int = 0, wireman_name: str = "All", wiremen: list = None, date_range: tuple = None):
-    """Get bills filtered by ID, Wireman, and/or Date Range if provided, otherwise get all bills."""
-    query = db.query(Bill)
-    if bill_id > 0:
-        query = query.filter(Bill.id == bill_id)
-    if wireman_name != "All":
-        wireman = next((w for w in wiremen if w.name == wireman_name), None)
-        if wireman:
-            query = query.filter(Bill.wireman_id == wireman.id)
-    if date_range and len(date_range) == 2:
-        start_date, end_date = date_range
-        query = query.filter(Bill.date.between(start_date, end_date))
-    return query.order_by(Bill.date.desc()).all()
-
-def get_all_wiremen(db: Session):
-    """Get all wiremen."""
-    return db.query(Wireman).all()
+def edit_bill_records(db: Session, df: pd.DataFrame, page: bill_records_service.BillsPage):
+    """Display the page's bills in an editable grid and save the changed and deleted rows as one batch."""
+    st.caption("Edit Client Name, Amount, Date or Payment Status, or tick Delete, then save. "
+               "Changes to the other columns are ignored.")
+    if "bill_records_saved" in st.session_state:
+        st.success(st.session_state.pop("bill_records_saved"))
+    grid = df.copy()
+    grid.insert(0, "Delete", False)
+    # The editor keeps edits by row position, so a saved batch gets a new key (see save_bill_changes).
+    version = st.session_state.get("bill_records_editor_version", 0)
+    edited = st.experimental_data_editor(grid, use_container_width=True,
+                                         key=f"bill_records_editor_{page.first_key}_{page.last_key}_{version}")
+
+    edits, deleted_ids = bill_records_service.bill_frame_changes(df, edited)
+    if not (edits or deleted_ids):
+        return
+    st.write(f"{len(edits)} bills changed, {len(deleted_ids)} bills marked for deletion.")
+
+    errors = []
+    for edit in edits:
+        if edit.amount is None:
+            errors.append(f"Bill {edit.bill_id}: an amount is required.")
+            continue
+        is_valid, error_message = bill_entry_service.validate_bill_data(edit.client_name or "", edit.amount)
+        if not is_valid:
+            errors.append(f"Bill {edit.bill_id}: {error_message}")
+        if edit.payment_status not in PAYMENT_STATUSES:
+            errors.append(f"Bill {edit.bill_id}: payment status must be one of "
+                          f"{', '.join(PAYMENT_STATUSES)}.")
+        if edit.date is None:
+            errors.append(f"Bill {edit.bill_id}: a date is required.")
+    if errors:
+        for error in errors:
+            st.error(error)
+        return
+
+    confirm = not deleted_ids or st.checkbox("I understand that deleted bills cannot be restored.",
+                                             key=f"bill_records_delete_confirm_{version}")
+    if st.button("Save Changes", disabled=not confirm):
+        save_bill_changes(db, edits, deleted_ids)
+
+def save_bill_changes(db: Session, edits: list, deleted_ids: list):
+    """Save a batch; on success start a fresh editor and rerun, so stale edits and ticks cannot land on other bills."""
+    success, message = bill_records_service.apply_bill_changes(db, edits, deleted_ids)
+    if not success:
+        st.error(message)
+        return
+    version = st.session_state.get("bill_records_editor_version", 0)
+    for key in [key for key in st.session_state if str(key).startswith("bill_records_editor_")]:
+        del st.session_state[key]
+    st.session_state.pop(f"bill_records_delete_confirm_{version}", None)
+    st.session_state["bill_records_editor_version"] = version + 1
+    st.session_state["bill_records_saved"] = message
+    st.experimental_rerun()
+
+def get_page_cursor(filters: tuple, page_size: int) -> dict:
+    """Get the keyset cursor for the current page, starting over when the filters change."""
+    if st.session_state.get("bill_records_filters") != (filters, page_size):
+        st.session_state["bill_records_filters"] = (filters, page_size)
+        st.session_state["bill_records_cursor"] = {}
+        st.session_state["bill_records_page_number"] = 1
+    return st.session_state["bill_records_cursor"]
+
+def go_to_page(cursor: dict, step: int):
+    """Move to the next or previous page before the next rerun."""
+    st.session_state["bill_records_cursor"] = cursor
+    st.session_state["bill_records_page_number"] += step
+
+def display_page_navigation(page: bill_records_service.BillsPage, page_size: int):
+    """Display previous/next buttons and the page position."""
+    page_number = st.session_state["bill_records_page_number"]
+    total_pages = max(1, -(-page.total_count // page_size))
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("Previous", disabled=not page.has_previous, on_click=go_to_page,
+                  args=({"before": page.first_key}, -1))
+    with col2:
+        st.write(f"Page {page_number} of {total_pages} ({page.total_count} bills)")
+    with col3:
+        st.button("Next", disabled=not page.has_next, on_click=go_to_page,
+                  args=({"after": page.last_key}, 1))
 
 if __name__ == "__main__":
     bill_records()
\ No newline at end of file
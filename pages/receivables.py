@@ -0,0 +1,80 @@
+# File: pages/receivables.py
+
+import streamlit as st
+import pandas as pd
+from database.connection import session_scope
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from datetime import date
+from services import receivables_service
+from utils.widgets import instrumented_page, wireman_picker
+
+GROUP_BY = {"Wireman": "wireman", "Client": "client"}
+AGING_COLUMNS = {"days_0_30": "0-30 Days", "days_31_60": "31-60 Days", "days_61_90": "61-90 Days",
+                 "days_over_90": "90+ Days"}
+ROW_LIMIT = 200
+
+def receivables():
+    st.title("Receivables")
+    st.caption("Bills not fully paid, by age. Partially paid bills count at their full amount.")
+
+    try:
+        with instrumented_page("receivables"), session_scope() as db:
+            # Filters
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                group_by = st.radio("Group By", list(GROUP_BY), horizontal=True)
+            with col2:
+                wireman_id = wireman_picker(db, "receivables_wireman", label="Wireman", include_all=True)
+            with col3:
+                as_of = st.date_input("Aged As Of", value=date.today(), key="receivables_as_of")
+
+            rows = receivables_service.get_receivables(db, as_of, GROUP_BY[group_by], wireman_id, ROW_LIMIT)
+            if not rows:
+                st.info("No outstanding bills.")
+                return
+
+            display_aging(rows, GROUP_BY[group_by])
+            if wireman_id is not None:
+                display_outstanding_bills(db, wireman_id)
+
+    except SQLAlchemyError as e:
+        st.error(f"An error occurred while accessing the database: {str(e)}")
+    except Exception as e:
+        st.error(f"An unexpected error occurred: {str(e)}")
+
+def display_aging(rows, group_by: str):
+    """Display the outstanding amount per aging bucket and the aging table."""
+    df = pd.DataFrame([row._asdict() for row in rows])
+    amount_columns = ["not_paid_amount", "partially_paid_amount", "outstanding_amount", *AGING_COLUMNS]
+    df[amount_columns] = df[amount_columns].astype(float)
+
+    columns = st.columns(len(AGING_COLUMNS) + 1)
+    columns[0].metric("Outstanding", f"₹{df['outstanding_amount'].sum():,.2f}")
+    for column, (key, label) in zip(columns[1:], AGING_COLUMNS.items()):
+        column.metric(label, f"₹{df[key].sum():,.2f}")
+    if len(rows) == ROW_LIMIT:
+        st.caption(f"Showing the {ROW_LIMIT} largest outstanding amounts.")
+
+    names = {"wireman_id": "Wireman ID", "name": "Wireman"} if group_by == "wireman" else {"client_name": "Client"}
+    table = df.rename(columns={
+        **names,
+        "bill_count": "Bills",
+        "not_paid_amount": "Not Paid",
+        "partially_paid_amount": "Partially Paid",
+        "outstanding_amount": "Outstanding",
+        **AGING_COLUMNS
+    })
+    if group_by == "client":
+        table["Client"] = table["Client"].replace("", "(no client name)")
+    st.dataframe(table, use_container_width=True)
+
+def display_outstanding_bills(db: Session, wireman_id: int):
+    """Display the selected wireman's outstanding bills, oldest first."""
+    st.header("Outstanding Bills")
+    bills = receivables_service.get_outstanding_bills(db, wireman_id)
+    st.dataframe(pd.DataFrame(bills, columns=["Bill ID", "Client Name", "Amount", "Date", "Payment Status"]),
+                 use_container_width=True)
+
+if __name__ == "__main__":
+    receivables()
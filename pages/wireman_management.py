@@ -1,13 +1,28 @@
 # File: pages/wireman_management.py
 
 import streamlit as st
-from database.connection import get_db
-from database.models import Wireman
+from database.async_connection import gather_in_sessions, run_async
+from database.connection import session_scope
+from database.models import PAYMENT_STATUSES, Point, Wireman
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from datetime import date, timedelta
 from decimal import Decimal
+from typing import List, Optional, Tuple
+from sqlalchemy.engine import Row
 from utils.helpers import format_currency, format_date
-from services import wireman_management_services
+from services import wireman_management_services, export_service, wireman_search_service
+from utils.widgets import export_controls, instrumented_page, wireman_multi_picker, wireman_picker
+
+# Leaderboard periods as days back from today; 0 is the current calendar month.
+LEADERBOARD_WINDOWS = {"All Time": None, "This Month": 0, "Last 30 Days": 30, "Last 90 Days": 90}
+LEADERBOARD_SIZES = [10, 25, 50, 100]
+LEADERBOARD_CATEGORIES = {
+    "Total Bill Amount": "total_bill_amount",
+    "Number of Bills": "number_of_bills",
+    "Balance Points": "balance_points",
+    "Total Points Scored": "total_points",
+}
 
 
 def wireman_management():
@@ -17,30 +32,53 @@ def wireman_management():
     st.title("Wireman Management")
 
     try:
-        db = next(get_db())
-
-        # Wireman management tabs
-        st.header("Manage Wiremen")
-        crud_tab, list_tab, leaderboard_tab, dashboard_tab = st.tabs(["CRUD Operations", "Wiremen List", "Leaderboard", "Wireman Dashboard"])
-
-        with crud_tab:
-            crud_operation = st.radio("Select Operation", ["Register New Wireman", "Update Wireman", "Delete Wireman"])
-
-            if crud_operation == "Register New Wireman":
-                register_wireman(db)
-            elif crud_operation == "Update Wireman":
-                update_wireman(db)
-            else:  # Delete Wireman
-                delete_wireman(db)
-
-        with list_tab:
-            display_wiremen_list(db)
-
-        with leaderboard_tab:
-            display_leaderboard(db)
-
-        with dashboard_tab:
-            display_wireman_dashboard_tab(db)
+        with instrumented_page("wireman_management"), session_scope() as db:
+            # Wireman management tabs
+            st.header("Manage Wiremen")
+            crud_tab, list_tab, leaderboard_tab, dashboard_tab = st.tabs(["CRUD Operations", "Wiremen List", "Leaderboard", "Wireman Dashboard"])
+
+            with crud_tab:
+                crud_operation = st.radio("Select Operation", ["Register New Wireman", "Update Wireman", "Delete Wireman",
+                                                               "Bulk Operations"])
+
+                if crud_operation == "Register New Wireman":
+                    register_wireman(db)
+                elif crud_operation == "Update Wireman":
+                    update_wireman(db)
+                elif crud_operation == "Delete Wireman":
+                    delete_wireman(db)
+                else:  # Bulk Operations
+                    bulk_operations(db)
+
+            # Read every tab's inputs first, then load the tabs' data concurrently and render it.
+            with list_tab:
+                list_filter = wiremen_list_filter()
+            with leaderboard_tab:
+                leaderboard_filter = leaderboard_filter_inputs()
+            with dashboard_tab:
+                dashboard_wireman_id = dashboard_wireman_input(db)
+
+            calls = [
+                (wireman_management_services.get_wiremen_with_points_or_bills_async,) + list_filter,
+                (wireman_management_services.get_leaderboard_async,) + leaderboard_filter,
+            ]
+            if dashboard_wireman_id is not None:
+                calls += [
+                    (wireman_management_services.get_wireman_by_id_async, dashboard_wireman_id),
+                    (wireman_management_services.get_wireman_dashboard_data_async, dashboard_wireman_id),
+                    (wireman_management_services.get_point_record_async, dashboard_wireman_id),
+                ]
+            filtered_wiremen, leaderboard, *dashboard = run_async(gather_in_sessions(*calls))
+
+            with list_tab:
+                display_wiremen_list(list_filter[0], filtered_wiremen)
+
+            with leaderboard_tab:
+                display_leaderboard(db, leaderboard_filter, leaderboard)
+
+            with dashboard_tab:
+                if dashboard:
+                    display_wireman_dashboard_tab(db, *dashboard)
 
     except SQLAlchemyError as e:
         st.error(f"An error occurred while accessing the database: {str(e)}")
@@ -63,11 +101,10 @@ def register_wireman(db: Session):
 
 def update_wireman(db: Session):
     """Update wireman details."""
-    wiremen = wireman_management_services.fetch_all_wiremen(db)
-    selected_wireman = st.selectbox("Select Wireman to Update", options=[w.name for w in wiremen])
+    wireman_id = wireman_picker(db, "update_wireman", label="Select Wireman to Update")
 
-    if selected_wireman:
-        wireman = next((w for w in wiremen if w.name == selected_wireman), None)
+    if wireman_id is not None:
+        wireman = wireman_management_services.get_wireman_by_id(db, wireman_id)
         if wireman:
             with st.form("update_wireman"):
                 name = st.text_input("Name", value=wireman.name)
@@ -86,11 +123,10 @@ def update_wireman(db: Session):
 
 def delete_wireman(db: Session):
     """Delete a wireman."""
-    wiremen = wireman_management_services.fetch_all_wiremen(db)
-    selected_wireman = st.selectbox("Select Wireman to Delete", options=[w.name for w in wiremen])
+    wireman_id = wireman_picker(db, "delete_wireman", label="Select Wireman to Delete")
 
-    if selected_wireman:
-        wireman = next((w for w in wiremen if w.name == selected_wireman), None)
+    if wireman_id is not None:
+        wireman = wireman_management_services.get_wireman_by_id(db, wireman_id)
         if wireman:
             if st.button(f"Delete {wireman.name}"):
                 confirm = st.checkbox(
@@ -107,88 +143,165 @@ def delete_wireman(db: Session):
             st.error("Selected wireman not found. Please refresh the page and try again.")
 
 
-def display_wiremen_list(db: Session):
-    """Display list of wiremen with filtering options."""
+def bulk_operations(db: Session):
+    """Redeem, reset or delete several wiremen at once, chosen by name or by the wiremen list filter."""
+    operations = {
+        "Redeem All Points": wireman_management_services.redeem_all_points_bulk,
+        "Reset All Points": wireman_management_services.reset_points_bulk,
+        "Delete Wiremen": wireman_management_services.delete_wiremen_bulk,
+    }
+    operation = st.selectbox("Bulk Operation", list(operations))
+    select_by = st.radio("Select Wiremen", ["By Name", "By Filter"], horizontal=True)
+
+    wireman_ids = None
+    wireman_filter = None
+    if select_by == "By Name":
+        wireman_ids = wireman_multi_picker(db, "bulk_wiremen")
+        selected_count = len(wireman_ids)
+    else:
+        col1, col2, col3 = st.columns(3)
+        filter_by = col1.selectbox("Filter by", ["Balance Points", "Total Bill Amount"], key="bulk_filter_by")
+        min_value = col2.number_input("Minimum Value", value=0.0, step=100.0, key="bulk_min_value")
+        max_value = col3.number_input("Maximum Value", value=10000.0, step=100.0, key="bulk_max_value")
+        filter_key = "balance_points" if filter_by == "Balance Points" else "total_bill_amount"
+        wireman_filter = (filter_key, min_value, max_value)
+        selected_count = len(wireman_management_services.get_wiremen_with_points_or_bills(db, *wireman_filter))
+
+    st.caption(f"{selected_count} wiremen selected.")
+    confirm = True
+    if operation == "Delete Wiremen":
+        confirm = st.checkbox("I understand that this action cannot be undone and will delete all associated records.",
+                              key="bulk_delete_confirm")
+
+    if st.button(f"{operation} ({selected_count})", disabled=not selected_count):
+        if not confirm:
+            st.warning("Please confirm the deletion by checking the box above.")
+            return
+        outcomes = operations[operation](db, wireman_ids, wireman_filter)
+        succeeded = sum(outcome.success for outcome in outcomes)
+        if succeeded == len(outcomes):
+            st.success(f"{operation}: done for {succeeded} wiremen.")
+        else:
+            st.warning(f"{operation}: done for {succeeded} of {len(outcomes)} wiremen.")
+        st.table({
+            "Wireman ID": [outcome.wireman_id for outcome in outcomes],
+            "Result": ["Done" if outcome.success else "Failed" for outcome in outcomes],
+            "Message": [outcome.message for outcome in outcomes],
+        })
+
+
+def wiremen_list_filter() -> Tuple[str, float, float]:
+    """Display the wiremen list filters and return (filter_key, min_value, max_value)."""
     st.subheader("Wiremen List")
     filter_by = st.selectbox("Filter by", ["Balance Points", "Total Bill Amount"])
     min_value = st.number_input("Minimum Value", value=0.0, step=100.0)
     max_value = st.number_input("Maximum Value", value=10000.0, step=100.0)
 
     filter_key = "balance_points" if filter_by == "Balance Points" else "total_bill_amount"
-    filtered_wiremen = wireman_management_services.get_wiremen_with_points_or_bills(db, filter_key, min_value, max_value)
+    return filter_key, min_value, max_value
+
 
+def display_wiremen_list(filter_key: str, filtered_wiremen: List[Row]):
+    """Display list of wiremen matching the filter."""
+    filter_by = "Balance Points" if filter_key == "balance_points" else "Total Bill Amount"
     if filtered_wiremen:
         st.table(
             {
-                "Wireman": [w.name for w, v in filtered_wiremen],
-                filter_by: [format_currency(v) for w, v in filtered_wiremen]
+                "Wireman": [row.name for row in filtered_wiremen],
+                filter_by: [format_currency(row.value) for row in filtered_wiremen]
             }
         )
     else:
         st.info("No wiremen found matching the criteria.")
 
 
-def display_leaderboard(db: Session):
-    """Display leaderboard based on selected category."""
+def get_leaderboard_window(window: str) -> Optional[Tuple[date, date]]:
+    """Get the inclusive date range of a leaderboard period, or None for all time."""
+    days = LEADERBOARD_WINDOWS[window]
+    if days is None:
+        return None
+    today = date.today()
+    start = today.replace(day=1) if days == 0 else today - timedelta(days=days - 1)
+    return start, today
+
+def leaderboard_filter_inputs() -> Tuple[str, Optional[Tuple[date, date]], Optional[str], int]:
+    """Display the leaderboard filters and return (category_key, date_range, payment_status, limit)."""
     st.subheader("Leaderboard")
-    leaderboard_category = st.selectbox(
-        "Select Leaderboard Category",
-        ["Total Bill Amount", "Number of Bills", "Balance Points", "Total Points Scored"]
-    )
+    leaderboard_category = st.selectbox("Select Leaderboard Category", list(LEADERBOARD_CATEGORIES))
 
-    category_key = leaderboard_category.lower().replace(" ", "_")
-    leaderboard = wireman_management_services.get_leaderboard(db, category_key)
+    category_key = LEADERBOARD_CATEGORIES[leaderboard_category]
+    date_range = None
+    payment_status = None
+    col1, col2, col3 = st.columns(3)
+    if category_key in wireman_management_services.BILL_CATEGORIES:
+        window = col1.selectbox("Period", list(LEADERBOARD_WINDOWS))
+        date_range = get_leaderboard_window(window)
+        status = col2.selectbox("Payment Status", ["All"] + PAYMENT_STATUSES)
+        payment_status = None if status == "All" else status
+    limit = col3.selectbox("Show Top", LEADERBOARD_SIZES)
+    return category_key, date_range, payment_status, limit
+
+
+def display_leaderboard(db: Session, leaderboard_filter: tuple, leaderboard: List[Row]):
+    """Display the top of the leaderboard for the selected category, period and payment status."""
+    category_key, date_range, payment_status, _ = leaderboard_filter
+    leaderboard_category = next(label for label, key in LEADERBOARD_CATEGORIES.items() if key == category_key)
 
     if leaderboard:
         st.table(
             {
-                "Rank": range(1, len(leaderboard) + 1),
-                "Wireman": [w.name for w, v in leaderboard],
-                leaderboard_category: [format_currency(v) if "amount" in category_key else v for w, v in leaderboard]
+                "Rank": [row.rank for row in leaderboard],
+                "Wireman": [row.name for row in leaderboard],
+                leaderboard_category: [format_currency(row.value) if "amount" in category_key else row.value
+                                       for row in leaderboard]
             }
         )
+
+        with st.expander("Export Leaderboard"):
+            export_controls(
+                "leaderboard_export", f"leaderboard_{category_key}",
+                lambda file, file_format: export_service.export_leaderboard(db, file, file_format, category_key,
+                                                                          date_range, payment_status)
+            )
     else:
         st.info("No data available for the leaderboard.")
 
-def display_wireman_dashboard_tab(db: Session):
-    """Display the wireman dashboard in a tab."""
-    wiremen = wireman_management_services.fetch_all_wiremen(db)
-    if not wiremen:
+def dashboard_wireman_input(db: Session) -> Optional[int]:
+    """Display the dashboard's wireman picker and return the selected wireman's ID."""
+    if not wireman_search_service.search_wiremen(db, "", limit=1):
         st.warning("No wiremen registered yet. Please register a wireman to view the dashboard.")
-        return
+        return None
 
-    selected_wireman = st.selectbox("Select Wireman", options=[w.name for w in wiremen])
+    return wireman_picker(db, "dashboard_wireman", label="Select Wireman")
 
-    if selected_wireman:
-        wireman = next((w for w in wiremen if w.name == selected_wireman), None)
-        if wireman:
-            display_wireman_dashboard(db, wireman)
-            manage_points(db, wireman)
-        else:
-            st.error("Selected wireman not found. Please refresh the page and try again.")
+def display_wireman_dashboard_tab(db: Session, wireman: Optional[Wireman],
+                                  dashboard_data: wireman_management_services.WiremanDashboard,
+                                  point_record: Optional[Point]):
+    """Display the wireman dashboard in a tab."""
+    if wireman:
+        display_wireman_dashboard(wireman, dashboard_data)
+        manage_points(db, wireman, point_record)
+    else:
+        st.error("Selected wireman not found. Please refresh the page and try again.")
 
-def display_wireman_dashboard(db: Session, wireman: Wireman):
+def display_wireman_dashboard(wireman: Wireman, dashboard_data: wireman_management_services.WiremanDashboard):
     """Display dashboard for the selected wireman."""
     st.subheader(f"Dashboard for {wireman.name}")
 
-    dashboard_data = wireman_management_services.get_wireman_dashboard_data(db, wireman.id)
-
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Bills", dashboard_data["total_bills"])
-    col2.metric("Total Business", format_currency(dashboard_data["total_business"]))
-    col3.metric("Latest Bill Date",
-                format_date(dashboard_data["latest_bill_date"]) if dashboard_data["latest_bill_date"] else "N/A")
+    col1.metric("Total Bills", dashboard_data.total_bills)
+    col2.metric("Total Business", format_currency(dashboard_data.total_business))
+    col3.metric("Latest Bill Date", format_date(dashboard_data.latest_bill_date))
 
     col4, col5 = st.columns(2)
-    col4.metric("Total Points", float(dashboard_data["total_points"]))
-    col5.metric("Balance Points", float(dashboard_data["balance_points"]))
+    col4.metric("Total Points", float(dashboard_data.total_points))
+    col5.metric("Balance Points", float(dashboard_data.balance_points))
 
 
-def manage_points(db: Session, wireman: Wireman):
+def manage_points(db: Session, wireman: Wireman, point_record: Optional[Point]):
     """Manage points for the selected wireman."""
     st.subheader("Manage Points")
 
-    point_record = wireman_management_services.get_point_record(db, wireman.id)
     if not point_record:
         st.warning("No points record found for this wireman.")
         return
@@ -0,0 +1,208 @@
+# File: services/analytics_service.py
+
+from datetime import date
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, String, case, cast, func, select
+from sqlalchemy.orm import Session
+from database.models import Bill, BillDailyRollup, Wireman
+from database.instrumentation import instrumented
+from services import query_cache
+from services.query_cache import cached
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Bucket frequencies: the pandas frequency of the period starts and the NumPy unit that truncates to them.
+FREQUENCIES = {
+    "daily": ("D", "D"),
+    "weekly": ("W-MON", "W"),
+    "monthly": ("MS", "M"),
+}
+
+
+class BillAnalytics(NamedTuple):
+    """Bill trends for one filter; the frames are shared through the query cache, so do not modify them."""
+    totals: pd.DataFrame
+    payment_status: pd.DataFrame
+    growth: pd.DataFrame
+
+
+def _stream_columns(db: Session, statement, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[tuple, ...]]:
+    """
+    Stream a Core select as column tuples of at most chunk_size rows.
+
+    The statement runs on the session's connection rather than through the ORM, so rows are
+    not converted twice; project and cast the columns in SQL (dates as text, numerics as
+    floats) to keep per-value conversion out of Python.
+    """
+    result = db.connection().execution_options(stream_results=True).execute(statement)
+    try:
+        for rows in result.partitions(chunk_size):
+            yield tuple(zip(*rows))
+    finally:
+        result.close()
+
+
+def _read_frame(db: Session, statement, columns: List[Tuple[str, str]]) -> pd.DataFrame:
+    """Stream a select into a DataFrame with the given (name, dtype) columns; 'datetime64[D]' parses ISO dates."""
+    arrays = [[] for _ in columns]
+    for chunk in _stream_columns(db, statement):
+        for index, (_, dtype) in enumerate(columns):
+            arrays[index].append(np.array(chunk[index], dtype=dtype))
+    return pd.DataFrame({
+        name: np.concatenate(parts) if parts else np.array([], dtype=dtype)
+        for (name, dtype), parts in zip(columns, arrays)
+    })
+
+
+def _period_starts(days: np.ndarray, frequency: str) -> np.ndarray:
+    """Truncate datetime64[D] days to the start of their day, Monday-based week or month."""
+    unit = FREQUENCIES[frequency][1]
+    if unit == "W":
+        # 1970-01-01 was a Thursday, so Monday-based weekdays are offset by 3.
+        return days - ((days.astype(np.int64) + 3) % 7).astype("timedelta64[D]")
+    return days.astype(f"datetime64[{unit}]").astype("datetime64[D]")
+
+
+def _period_index(starts: np.ndarray, frequency: str, date_range: Optional[tuple]) -> pd.DatetimeIndex:
+    """Every period start from the first to the last, so periods without bills show as zero."""
+    if date_range:
+        first, last = (np.datetime64(day, "D") for day in date_range)
+    elif len(starts):
+        first, last = starts.min(), starts.max()
+    else:
+        return pd.DatetimeIndex([])
+    first, last = _period_starts(np.array([first, last]), frequency)
+    return pd.date_range(first, last, freq=FREQUENCIES[frequency][0])
+
+
+def _daily_totals_frame(db: Session, date_range: Optional[tuple], wireman_id: Optional[int]) -> pd.DataFrame:
+    """Stream the (day, bill_count, amount, points) totals per day for the filter from the daily rollup."""
+    statement = select(
+        cast(BillDailyRollup.day, String),
+        func.sum(BillDailyRollup.bill_count),
+        cast(func.sum(BillDailyRollup.amount_sum), Float),
+        cast(func.sum(BillDailyRollup.points_sum), Float)
+    )
+    if wireman_id is not None:
+        statement = statement.where(BillDailyRollup.wireman_id == wireman_id)
+    if date_range:
+        statement = statement.where(BillDailyRollup.day.between(date_range[0], date_range[1]))
+    statement = statement.group_by(BillDailyRollup.day).having(func.sum(BillDailyRollup.bill_count) != 0)
+    return _read_frame(db, statement, [
+        ("day", "datetime64[D]"), ("bill_count", np.int64), ("amount", np.float64), ("points", np.float64)
+    ])
+
+
+def _payment_status_frame(db: Session, date_range: Optional[tuple], wireman_id: Optional[int]) -> pd.DataFrame:
+    """Stream bill amounts summed per day and payment status for the filter."""
+    statement = select(
+        cast(Bill.date, String),
+        func.coalesce(cast(Bill.payment_status, String), "Unknown"),
+        cast(func.sum(Bill.amount), Float)
+    ).where(Bill.date.isnot(None))
+    if wireman_id is not None:
+        statement = statement.where(Bill.wireman_id == wireman_id)
+    if date_range:
+        statement = statement.where(Bill.date.between(date_range[0], date_range[1]))
+    statement = statement.group_by(Bill.date, Bill.payment_status)
+    return _read_frame(db, statement, [("day", "datetime64[D]"), ("payment_status", object), ("amount", np.float64)])
+
+
+def _complete_periods(periods: pd.DatetimeIndex, frequency: str,
+                      date_range: Optional[tuple]) -> Tuple[pd.DatetimeIndex, pd.DatetimeIndex]:
+    """
+    The periods that lie wholly inside the date range and ended before today, with the
+    start of the period after each, so a partly elapsed period is never compared in full.
+    """
+    ends = periods + pd.tseries.frequencies.to_offset(FREQUENCIES[frequency][0])
+    bound = pd.Timestamp(date.today())
+    if date_range:
+        bound = min(bound, pd.Timestamp(date_range[1]) + pd.Timedelta(days=1))
+    complete = ends <= bound
+    if date_range:
+        complete &= periods >= pd.Timestamp(date_range[0])
+    return periods[complete], ends[complete]
+
+
+def _growth(db: Session, periods: pd.DatetimeIndex, frequency: str, date_range: Optional[tuple],
+            wireman_id: Optional[int], limit: int) -> pd.DataFrame:
+    """Compare each wireman's amount in the last complete period with the one before; fastest growing first."""
+    columns = ["wireman_id", "name", "previous_amount", "current_amount", "growth"]
+    starts, ends = _complete_periods(periods, frequency, date_range)
+    if len(starts) < 2:
+        return pd.DataFrame(columns=columns)
+    previous, current, end = starts[-2].date(), starts[-1].date(), ends[-1].date()
+    in_current = BillDailyRollup.day >= current
+    statement = select(
+        BillDailyRollup.wireman_id,
+        cast(func.sum(case((in_current, 0), else_=BillDailyRollup.amount_sum)), Float),
+        cast(func.sum(case((in_current, BillDailyRollup.amount_sum), else_=0)), Float)
+    ).where(BillDailyRollup.day >= previous, BillDailyRollup.day < end)
+    if wireman_id is not None:
+        statement = statement.where(BillDailyRollup.wireman_id == wireman_id)
+    statement = statement.group_by(BillDailyRollup.wireman_id)
+    amounts = _read_frame(db, statement, [
+        ("wireman_id", np.int64), ("previous_amount", np.float64), ("current_amount", np.float64)
+    ])
+    amounts["growth"] = (amounts["current_amount"] - amounts["previous_amount"]) / \
+        amounts["previous_amount"].replace(0.0, np.nan)
+    top = amounts.sort_values(["growth", "current_amount"], ascending=False, na_position="last").head(limit)
+
+    names = dict(db.query(Wireman.id, Wireman.name).filter(Wireman.id.in_(top["wireman_id"].tolist())))
+    top = top.reset_index(drop=True)
+    top.insert(1, "name", top["wireman_id"].map(names))
+    return top[columns]
+
+
+@instrumented
+@cached(query_cache.ANALYTICS)
+def get_bill_analytics(
+    db: Session,
+    date_range: Optional[Tuple[date, date]] = None,
+    wireman_id: Optional[int] = None,
+    frequency: str = "monthly",
+    moving_average_window: int = 3,
+    growth_limit: int = 10
+) -> BillAnalytics:
+    """
+    Get bill totals over time, payment status breakdown and per-wireman growth for a filter.
+
+    Per-day totals from the daily rollup and per-day payment status sums from bills are
+    streamed into NumPy columns, then bucketed, reindexed and averaged with vectorized pandas
+    operations; growth reads only the rollup rows of the last two complete periods.
+
+    Args:
+        db (Session): The database session.
+        date_range (Optional[Tuple[date, date]]): Inclusive (start, end) dates; all time if None.
+        wireman_id (Optional[int]): Restrict to one wireman; all wiremen if None.
+        frequency (str): 'daily', 'weekly' (Monday-based) or 'monthly' buckets.
+        moving_average_window (int): Number of buckets in the moving average of the amount.
+        growth_limit (int): Number of fastest growing wiremen to return.
+
+    Returns:
+        BillAnalytics: totals (bill_count, amount, points, amount_moving_average per period start),
+            payment_status (amount per period start and payment status) and growth
+            (wireman_id, name, previous_amount, current_amount, growth as a fraction of the
+            previous period, comparing the last two periods that have fully elapsed inside
+            the date range).
+    """
+    days = _daily_totals_frame(db, date_range, wireman_id)
+    starts = _period_starts(days["day"].to_numpy(dtype="datetime64[D]"), frequency)
+    periods = _period_index(starts, frequency, date_range)
+
+    totals = days[["bill_count", "amount", "points"]].groupby(starts).sum(). \
+        reindex(periods, fill_value=0)
+    totals["amount_moving_average"] = totals["amount"].rolling(moving_average_window, min_periods=1).mean()
+
+    statuses = _payment_status_frame(db, date_range, wireman_id)
+    status_starts = _period_starts(statuses["day"].to_numpy(dtype="datetime64[D]"), frequency)
+    payment_status = statuses.pivot_table(index=status_starts, columns="payment_status", values="amount",
+                                          aggfunc="sum", fill_value=0.0).reindex(periods, fill_value=0.0)
+
+    return BillAnalytics(
+        totals=totals,
+        payment_status=payment_status,
+        growth=_growth(db, periods, frequency, date_range, wireman_id, growth_limit)
+    )
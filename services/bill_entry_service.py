@@ -1,18 +1,27 @@
 # File: services/bill_entry_service.py
 
 from sqlalchemy.orm import Session
-from database.models import Wireman, Bill, Point
+from database.models import Wireman, Bill
+from database.instrumentation import instrumented
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import date
 from decimal import Decimal
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from sqlalchemy.engine import Row
+from services import client_name_service, points_rules_service, points_service, query_cache, receivables_service, \
+    rollup_service
+from services.query_cache import cached
 
 
-def fetch_all_wiremen(db: Session) -> List[Wireman]:
-    """Fetch all wiremen from the database."""
-    return db.query(Wireman).all()
+@instrumented
+@cached(query_cache.WIREMEN)
+def fetch_all_wiremen(db: Session) -> List[Row]:
+    """Fetch all wiremen from the database as (id, name, contact_info, date_registered) rows."""
+    return db.query(Wireman.id, Wireman.name, Wireman.contact_info, Wireman.date_registered). \
+        order_by(Wireman.name, Wireman.id).all()
 
 
+@instrumented
 def submit_bill(db: Session, wireman_id: int, client_name: str, bill_amount: Decimal, bill_date: date,
                 payment_status: str) -> Tuple[bool, str]:
     """
@@ -30,7 +39,7 @@ def submit_bill(db: Session, wireman_id: int, client_name: str, bill_amount: Dec
         Tuple[bool, str]: A tuple containing a boolean indicating success and a message.
     """
     try:
-        points_earned = calculate_points(bill_amount)
+        points_earned = calculate_points(bill_amount, payment_status, bill_date)
 
         new_bill = Bill(
             wireman_id=wireman_id,
@@ -41,35 +50,31 @@ def submit_bill(db: Session, wireman_id: int, client_name: str, bill_amount: Dec
             points_earned=points_earned
         )
         db.add(new_bill)
+        db.flush()
 
-        update_points(db, wireman_id, points_earned)
+        update_points(db, wireman_id, points_earned, new_bill.id)
+        rollup_service.add_bill(db, {"wireman_id": wireman_id, "date": bill_date, "amount": bill_amount,
+                                     "points_earned": points_earned})
+        receivables_service.add_bill(db, {"wireman_id": wireman_id, "client_name": client_name, "date": bill_date,
+                                          "amount": bill_amount, "payment_status": payment_status})
 
         db.commit()
+        query_cache.invalidate_bill_totals([(wireman_id, bill_date)])
+        client_name_service.record_client_name(client_name)
         return True, f"Bill submitted successfully! {points_earned} points earned."
     except SQLAlchemyError as e:
         db.rollback()
         return False, f"An error occurred while submitting the bill: {str(e)}"
 
 
-def calculate_points(amount: Decimal) -> Decimal:
-    """Calculate points based on bill amount."""
-    return amount // 1000
+def calculate_points(amount: Decimal, payment_status: Optional[str] = None, bill_date: Optional[date] = None) -> Decimal:
+    """Calculate points for a bill with the points rules (see services/points_rules_service.py)."""
+    return points_rules_service.calculate_points(amount, payment_status, bill_date)
 
 
-def update_points(db: Session, wireman_id: int, points_earned: Decimal):
-    """Update points for the wireman."""
-    point_record = db.query(Point).filter(Point.wireman_id == wireman_id).first()
-    if point_record:
-        point_record.total_points += points_earned
-        point_record.balance_points += points_earned
-    else:
-        new_point_record = Point(
-            wireman_id=wireman_id,
-            total_points=points_earned,
-            redeemed_points=Decimal('0'),
-            balance_points=points_earned
-        )
-        db.add(new_point_record)
+def update_points(db: Session, wireman_id: int, points_earned: Decimal, bill_id: Optional[int] = None):
+    """Update points for the wireman with a single SQL-side increment (upsert) and record them in the ledger."""
+    points_service.add_points(db, wireman_id, points_earned, bill_id)
 
 
 def validate_bill_data(client_name: str, bill_amount: Decimal) -> Tuple[bool, str]:
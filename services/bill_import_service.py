@@ -0,0 +1,285 @@
+# File: services/bill_import_service.py
+
+import argparse
+import csv
+import io
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from database.models import PAYMENT_STATUSES, Wireman, Bill
+from database.instrumentation import instrumented
+from services import (
+    bill_entry_service, client_name_service, points_rules_service, points_service, query_cache, receivables_service,
+    rollup_service
+)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Accepted spellings of each column header, after lower-casing and replacing spaces with underscores.
+COLUMN_ALIASES = {
+    "wireman_id": "wireman_id",
+    "wireman": "wireman_name",
+    "wireman_name": "wireman_name",
+    "client": "client_name",
+    "client_name": "client_name",
+    "amount": "amount",
+    "bill_amount": "amount",
+    "date": "date",
+    "bill_date": "date",
+    "payment_status": "payment_status",
+    "status": "payment_status",
+}
+
+DATE_FORMATS = ["%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y"]
+
+
+class RejectedRow(NamedTuple):
+    """A spreadsheet row that was not imported."""
+    line_number: int
+    reason: str
+    values: dict
+
+
+class ImportReport(NamedTuple):
+    """Outcome of a bulk bill import."""
+    rows_read: int
+    rows_imported: int
+    rejected: List[RejectedRow]
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+
+def _normalize_header(header) -> Optional[str]:
+    """Map a spreadsheet header to the import field it holds, or None if unknown."""
+    key = str(header or "").strip().lower().replace(" ", "_")
+    return COLUMN_ALIASES.get(key)
+
+
+def _iter_csv(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """Stream (line number, values) pairs from a CSV file."""
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    headers = [_normalize_header(header) for header in next(reader, [])]
+    for values in reader:
+        if any(value.strip() for value in values):
+            yield reader.line_num, {header: value for header, value in zip(headers, values) if header}
+
+
+def _iter_excel(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """Stream (line number, values) pairs from the first sheet of an Excel workbook."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [_normalize_header(header) for header in next(rows, ())]
+        for line_number, values in enumerate(rows, start=2):
+            if any(value not in (None, "") for value in values):
+                yield line_number, {header: value for header, value in zip(headers, values) if header}
+    finally:
+        workbook.close()
+
+
+def iter_bill_rows(file: BinaryIO, file_name: str) -> Iterator[Tuple[int, dict]]:
+    """
+    Stream the rows of a CSV or Excel file without loading the whole file.
+
+    Args:
+        file (BinaryIO): The uploaded or opened file, in binary mode.
+        file_name (str): The file name, whose extension selects the parser.
+
+    Returns:
+        Iterator[Tuple[int, dict]]: (line number, {field: value}) pairs.
+    """
+    if os.path.splitext(file_name)[1].lower() in (".xlsx", ".xlsm"):
+        return _iter_excel(file)
+    return _iter_csv(file)
+
+
+def _parse_date(value) -> date:
+    """Parse a bill date from a spreadsheet cell."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or "").strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date '{text}'.")
+
+
+def _build_wireman_lookup(db: Session) -> Tuple[set, Dict[str, Optional[int]]]:
+    """Load wireman IDs and a case-insensitive name lookup; duplicate names map to None."""
+    wireman_ids = set()
+    ids_by_name: Dict[str, Optional[int]] = {}
+    for wireman_id, name in db.query(Wireman.id, Wireman.name):
+        wireman_ids.add(wireman_id)
+        key = (name or "").strip().lower()
+        ids_by_name[key] = None if key in ids_by_name else wireman_id
+    return wireman_ids, ids_by_name
+
+
+def parse_bill_row(values: dict, wireman_ids: set, ids_by_name: Dict[str, Optional[int]]) -> dict:
+    """
+    Validate one spreadsheet row and convert it into bill column values.
+
+    Raises:
+        ValueError: If the row is invalid; the message explains why.
+    """
+    raw_wireman_id = str(values.get("wireman_id") or "").strip()
+    if raw_wireman_id:
+        # Spreadsheets may store IDs as numbers ("12.0"); anything but a whole number of at
+        # most 18 digits is rejected before int() could overflow or build a huge integer.
+        try:
+            parsed_id = Decimal(raw_wireman_id)
+        except InvalidOperation:
+            parsed_id = None
+        if parsed_id is None or not parsed_id.is_finite() or parsed_id.adjusted() >= 18 or \
+                parsed_id != parsed_id.to_integral_value():
+            raise ValueError(f"Invalid wireman ID '{raw_wireman_id}'.")
+        wireman_id = int(parsed_id)
+        if wireman_id not in wireman_ids:
+            raise ValueError(f"Wireman ID {wireman_id} not found.")
+    else:
+        wireman_name = str(values.get("wireman_name") or "").strip()
+        if not wireman_name:
+            raise ValueError("Wireman name is required.")
+        key = wireman_name.lower()
+        if key not in ids_by_name:
+            raise ValueError(f"Wireman '{wireman_name}' not found.")
+        wireman_id = ids_by_name[key]
+        if wireman_id is None:
+            raise ValueError(f"Wireman name '{wireman_name}' is ambiguous; use wireman_id.")
+
+    client_name = str(values.get("client_name") or "").strip()
+    try:
+        amount = Decimal(str(values.get("amount") or "").replace(",", "").strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid bill amount '{values.get('amount')}'.")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid bill amount '{values.get('amount')}'.")
+    is_valid, error_message = bill_entry_service.validate_bill_data(client_name, amount)
+    if not is_valid:
+        raise ValueError(error_message)
+
+    statuses = {status.lower(): status for status in PAYMENT_STATUSES}
+    payment_status = statuses.get(str(values.get("payment_status") or "").strip().lower())
+    if payment_status is None:
+        raise ValueError(f"Payment status must be one of {', '.join(PAYMENT_STATUSES)}.")
+
+    return {
+        "wireman_id": wireman_id,
+        "client_name": client_name,
+        "amount": amount,
+        "date": _parse_date(values.get("date")),
+        "payment_status": payment_status
+    }
+
+
+def _insert_batch(db: Session, bills: List[dict]):
+    """
+    Insert a batch of bills with executemany, then apply their points (one upsert and ledger
+    entry per wireman), their daily rollup totals (one upsert per wireman and day) and
+    their outstanding amounts (one receivables upsert).
+    """
+    points_rules_service.get_points_rules().score_bills(bills)
+    db.execute(insert(Bill), bills)
+
+    point_deltas = defaultdict(Decimal)
+    for bill in bills:
+        point_deltas[bill["wireman_id"]] += bill["points_earned"]
+    points_service.add_points_bulk(db, point_deltas)
+    rollup_service.apply_deltas(db, rollup_service.bill_deltas(bills))
+    receivables_service.apply_deltas(db, receivables_service.bill_deltas(bills))
+
+
+@instrumented
+def import_bills(db: Session, rows: Iterator[Tuple[int, dict]], batch_size: int = DEFAULT_BATCH_SIZE) -> ImportReport:
+    """
+    Validate and insert bills in batches, committing each batch in its own transaction.
+
+    Args:
+        db (Session): The database session.
+        rows (Iterator[Tuple[int, dict]]): (line number, values) pairs, e.g. from iter_bill_rows.
+        batch_size (int): Number of bills inserted per batch.
+
+    Returns:
+        ImportReport: Counts, rejected rows with reasons, and elapsed time.
+    """
+    start = time.perf_counter()
+    wireman_ids, ids_by_name = _build_wireman_lookup(db)
+    rows_read = 0
+    rows_imported = 0
+    rejected: List[RejectedRow] = []
+    batch: List[Tuple[int, dict, dict]] = []
+    # (wireman_id, date) of the imported bills, to invalidate only the cached reads they change.
+    imported_keys = set()
+
+    def flush():
+        nonlocal rows_imported
+        try:
+            _insert_batch(db, [bill for _, _, bill in batch])
+            db.commit()
+            rows_imported += len(batch)
+            for _, _, bill in batch:
+                client_name_service.record_client_name(bill["client_name"])
+                imported_keys.add((bill["wireman_id"], bill["date"]))
+        except SQLAlchemyError as e:
+            db.rollback()
+            rejected.extend(RejectedRow(line_number, f"Batch failed: {str(e)}", values)
+                            for line_number, values, _ in batch)
+        batch.clear()
+
+    for line_number, values in rows:
+        rows_read += 1
+        try:
+            batch.append((line_number, values, parse_bill_row(values, wireman_ids, ids_by_name)))
+        except ValueError as e:
+            rejected.append(RejectedRow(line_number, str(e), values))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    if rows_imported:
+        query_cache.invalidate_bill_totals(imported_keys)
+    return ImportReport(rows_read, rows_imported, rejected, time.perf_counter() - start)
+
+
+def main():
+    from database.connection import session_scope
+
+    parser = argparse.ArgumentParser(description="Bulk import bills from a CSV or Excel file.")
+    parser.add_argument("path", help="CSV or .xlsx file with wireman/wireman_id, client_name, amount, "
+                                     "date and payment_status columns.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--rejected", help="Write rejected rows to this CSV file.")
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as file, session_scope() as db:
+        report = import_bills(db, iter_bill_rows(file, args.path), args.batch_size)
+
+    print(f"Imported {report.rows_imported} of {report.rows_read} rows in {report.seconds:.2f}s "
+          f"({report.rows_per_second:,.0f} rows/sec); {len(report.rejected)} rejected.")
+    if args.rejected and report.rejected:
+        with open(args.rejected, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["line_number", "reason", "values"])
+            for row in report.rejected:
+                writer.writerow([row.line_number, row.reason, row.values])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,247 @@
 # File: services/bill_records_services.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from database.models import Bill, Wireman, Point
+from database.models import Bill, Wireman
+from database.instrumentation import instrumented
 from datetime import date
 from decimal import Decimal
-from typing import List, Optional, Tuple
-
-def get_total_bill_amount(db: Session) -> Decimal:
-    """Get the total bill amount from all wiremen combined."""
-    return db.query(func.sum(Bill.amount)).scalar() or Decimal('0')
+from typing import List, NamedTuple, Optional, Tuple
+import pandas as pd
+from collections import defaultdict
+from sqlalchemy import and_, case, cast, func, or_
+from sqlalchemy.engine import Row
+from services import client_name_service, points_rules_service, points_service, query_cache, receivables_service, \
+    rollup_service
 
 def get_all_bills(db: Session) -> List[Bill]:
     """Get all bills ordered by date descending."""
     return db.query(Bill).order_by(Bill.date.desc()).all()
 
+BILL_RECORD_COLUMNS = ["Bill ID", "Wireman", "Client Name", "Amount", "Date", "Points Earned", "Payment Status"]
+
+class BillsPage(NamedTuple):
+    """One keyset page of bill record rows, newest first."""
+    bills: List[Row]
+    total_count: int
+    first_key: Optional[Tuple[date, int]]
+    last_key: Optional[Tuple[date, int]]
+    has_previous: bool
+    has_next: bool
+
+def _apply_bill_filters(query, bill_id: int = 0, wireman_id: Optional[int] = None, date_range: Optional[tuple] = None):
+    """Apply the bill records filters to a query."""
+    if bill_id > 0:
+        query = query.filter(Bill.id == bill_id)
+    if wireman_id is not None:
+        query = query.filter(Bill.wireman_id == wireman_id)
+    if date_range and len(date_range) == 2:
+        start_date, end_date = date_range
+        query = query.filter(Bill.date.between(start_date, end_date))
+    return query
+
+def filtered_bills_query(
+    db: Session,
+    bill_id: int = 0,
+    wireman_id: Optional[int] = None,
+    date_range: Optional[tuple] = None
+):
+    """Build a query for bills filtered by ID, wireman and/or date range, newest first."""
+    query = _apply_bill_filters(db.query(Bill), bill_id, wireman_id, date_range)
+    return query.order_by(Bill.date.desc(), Bill.id.desc())
+
+def bill_rows_query(
+    db: Session,
+    bill_id: int = 0,
+    wireman_id: Optional[int] = None,
+    date_range: Optional[tuple] = None
+):
+    """Build a query for the bill records columns, joined to the wireman's name, newest first."""
+    query = db.query(
+        Bill.id,
+        func.coalesce(Wireman.name, "Unknown").label("wireman_name"),
+        Bill.client_name,
+        Bill.amount,
+        Bill.date,
+        Bill.points_earned,
+        Bill.payment_status
+    ).outerjoin(Wireman, Wireman.id == Bill.wireman_id)
+    return _apply_bill_filters(query, bill_id, wireman_id, date_range)
+
+@instrumented
+def get_bill_rows(
+    db: Session,
+    bill_id: int = 0,
+    wireman_id: Optional[int] = None,
+    date_range: Optional[tuple] = None
+) -> List[Row]:
+    """Get every filtered bill record as a lightweight row, newest first."""
+    return bill_rows_query(db, bill_id, wireman_id, date_range).order_by(Bill.date.desc(), Bill.id.desc()).all()
+
+def bill_rows_to_frame(rows: List[Row]) -> pd.DataFrame:
+    """Build the bill records DataFrame column by column from bill record rows."""
+    columns = list(zip(*rows)) if rows else [()] * len(BILL_RECORD_COLUMNS)
+    df = pd.DataFrame(dict(zip(BILL_RECORD_COLUMNS, columns)))
+    df["Amount"] = df["Amount"].astype(float)
+    df["Points Earned"] = df["Points Earned"].astype(float)
+    return df
+
+# Bill records columns that can be edited in the records grid.
+EDITABLE_BILL_COLUMNS = ["Client Name", "Amount", "Date", "Payment Status"]
+
+class BillEdit(NamedTuple):
+    """
+    New values for an edited bill; a cell cleared in the grid is None.
+
+    original holds the (client_name, amount, date, payment_status) the user edited from;
+    the edit is refused if the bill no longer has them. None skips that check.
+    """
+    bill_id: int
+    client_name: Optional[str]
+    amount: Optional[Decimal]
+    date: Optional[date]
+    payment_status: Optional[str]
+    original: Optional[tuple] = None
+
+def _cell(value):
+    """A grid cell's value, or None for an empty cell (None, NaN or NaT)."""
+    return None if pd.isna(value) else value
+
+def _editable_values(row) -> tuple:
+    """(client_name, amount, date, payment_status) of a bill records frame row, empty cells as None."""
+    amount = _cell(row["Amount"])
+    return (
+        _cell(row["Client Name"]),
+        None if amount is None else Decimal(str(amount)).quantize(Decimal("0.01")),
+        _cell(row["Date"]),
+        _cell(row["Payment Status"])
+    )
+
+def bill_frame_changes(original: pd.DataFrame, edited: pd.DataFrame) -> Tuple[List[BillEdit], List[int]]:
+    """
+    Diff an edited bill records DataFrame against the original one.
+
+    Both frames have the bill records columns on the same index; a boolean "Delete"
+    column in the edited frame marks bills to delete. Only the editable columns are compared.
+
+    Returns:
+        Tuple[List[BillEdit], List[int]]: The changed bills and the IDs of the bills to delete.
+    """
+    original = original.copy()
+    original["Date"] = pd.to_datetime(original["Date"]).dt.date
+    edited = edited.copy()
+    edited["Date"] = pd.to_datetime(edited["Date"]).dt.date
+    delete_mask = edited["Delete"].fillna(False).astype(bool) if "Delete" in edited else \
+        pd.Series(False, index=edited.index)
+
+    before = original[EDITABLE_BILL_COLUMNS]
+    after = edited[EDITABLE_BILL_COLUMNS]
+    changed_mask = ~((before == after) | (before.isna() & after.isna())).all(axis=1) & ~delete_mask
+
+    edits = [
+        BillEdit(int(row["Bill ID"]), *_editable_values(row), original=_editable_values(original.loc[index]))
+        for index, row in edited[changed_mask].iterrows()
+    ]
+    deleted_ids = [int(bill_id) for bill_id in edited.loc[delete_mask, "Bill ID"]]
+    return edits, deleted_ids
+
+def count_filtered_bills(
+    db: Session,
+    bill_id: int = 0,
+    wireman_id: Optional[int] = None,
+    date_range: Optional[tuple] = None
+) -> int:
+    """Count the bills matching the bill records filters."""
+    return _apply_bill_filters(db.query(func.count(Bill.id)), bill_id, wireman_id, date_range).scalar()
+
+def _older_than(key: Tuple[date, int]):
+    """Filter for bills after the given (date, id) key in the page order, newest first."""
+    key_date, key_id = key
+    return or_(Bill.date < key_date, and_(Bill.date == key_date, Bill.id < key_id))
+
+@instrumented
+def get_bills_page(
+    db: Session,
+    bill_id: int = 0,
+    wireman_id: Optional[int] = None,
+    date_range: Optional[tuple] = None,
+    page_size: int = 50,
+    after: Optional[Tuple[date, int]] = None,
+    before: Optional[Tuple[date, int]] = None
+) -> BillsPage:
+    """
+    Get one page of filtered bills using keyset pagination on (date, id).
+
+    Args:
+        db (Session): The database session.
+        bill_id (int): Only this bill if greater than zero.
+        wireman_id (Optional[int]): Only bills of this wireman.
+        date_range (Optional[tuple]): Only bills between (start_date, end_date), inclusive.
+        page_size (int): Maximum number of bills on the page.
+        after (Optional[Tuple[date, int]]): Key of the last bill on the current page, to fetch the next page.
+        before (Optional[Tuple[date, int]]): Key of the first bill on the current page, to fetch the previous page.
+
+    Returns:
+        BillsPage: The page of bill record rows, the total matching count and the keys to navigate from it.
+    """
+    query = bill_rows_query(db, bill_id, wireman_id, date_range)
+
+    if before is not None:
+        before_date, before_id = before
+        query = query.filter(or_(Bill.date > before_date, and_(Bill.date == before_date, Bill.id > before_id)))
+        bills = query.order_by(Bill.date.asc(), Bill.id.asc()).limit(page_size + 1).all()
+        has_previous = len(bills) > page_size
+        bills = list(reversed(bills[:page_size]))
+        last_key = (bills[-1].date, bills[-1].id) if bills else before
+        has_next = db.query(
+            _apply_bill_filters(db.query(Bill.id), bill_id, wireman_id, date_range).filter(_older_than(last_key)).exists()
+        ).scalar()
+    else:
+        if after is not None:
+            query = query.filter(_older_than(after))
+        bills = query.order_by(Bill.date.desc(), Bill.id.desc()).limit(page_size + 1).all()
+        has_next = len(bills) > page_size
+        bills = bills[:page_size]
+        has_previous = after is not None
+
+    return BillsPage(
+        bills=bills,
+        total_count=count_filtered_bills(db, bill_id, wireman_id, date_range),
+        first_key=(bills[0].date, bills[0].id) if bills else None,
+        last_key=(bills[-1].date, bills[-1].id) if bills else None,
+        has_previous=has_previous,
+        has_next=has_next
+    )
+
 def get_all_wiremen(db: Session) -> List[Wireman]:
     """Get all wiremen."""
     return db.query(Wireman).all()
 
+BILL_CHANGED_MESSAGE = "The bill was changed by another user. Please reload and try again."
+
+def _lock_bill(db: Session, bill_id: int) -> Optional[Row]:
+    """
+    Lock a bill row for the rest of the transaction; return its
+    (wireman_id, client_name, amount, date, payment_status, points_earned).
+    """
+    return db.query(Bill.wireman_id, Bill.client_name, Bill.amount, Bill.date, Bill.payment_status,
+                    Bill.points_earned).filter(Bill.id == bill_id).with_for_update().first()
+
+def _unchanged_bill(bill_id: int, locked: Row):
+    """
+    Filter for a bill whose client, amount, date, payment status and points are still the
+    ones read under the lock.
+
+    Databases without SELECT ... FOR UPDATE (SQLite) can let another writer in between
+    the read and the write; the compare-and-set makes that write affect no rows instead
+    of applying points, rollup and receivable deltas computed from stale values.
+    """
+    conditions = [Bill.id == bill_id]
+    for column in (Bill.client_name, Bill.amount, Bill.date, Bill.payment_status, Bill.points_earned):
+        value = getattr(locked, column.key)
+        conditions.append(column.is_(None) if value is None else column == value)
+    return and_(*conditions)
+
+@instrumented
 def update_bill(
     db: Session,
     bill_id: int,
@@ -27,50 +250,187 @@ def update_bill(
     date: date,
     payment_status: str
 ) -> Tuple[bool, str]:
-    """Update a bill and recalculate points."""
+    """Update a bill and apply the change in points as a single SQL-side increment."""
     try:
-        bill = db.query(Bill).filter(Bill.id == bill_id).first()
+        bill = _lock_bill(db, bill_id)
         if not bill:
+            db.rollback()
             return False, "Bill not found."
 
-        old_points = bill.points_earned
-        new_points = amount // 1000
+        new_points = points_rules_service.calculate_points(amount, payment_status, date)
 
         # Update bill
-        bill.client_name = client_name
-        bill.amount = amount
-        bill.date = date
-        bill.payment_status = payment_status
-        bill.points_earned = new_points
-
-        # Update points for wireman
-        point_record = db.query(Point).filter(Point.wireman_id == bill.wireman_id).first()
-        if point_record:
-            point_record.total_points += (new_points - old_points)
-            point_record.balance_points += (new_points - old_points)
+        updated = db.query(Bill).filter(_unchanged_bill(bill_id, bill)).update({
+            Bill.client_name: client_name,
+            Bill.amount: amount,
+            Bill.date: date,
+            Bill.payment_status: payment_status,
+            Bill.points_earned: new_points
+        }, synchronize_session=False)
+        if not updated:
+            db.rollback()
+            return False, BILL_CHANGED_MESSAGE
+
+        # Update points for wireman and move the bill's totals in the daily rollup and receivables
+        points_service.add_points(db, bill.wireman_id, new_points - (bill.points_earned or Decimal('0')), bill_id,
+                                  skip_new_negative=True)
+        rollup_service.add_bill(db, bill._asdict(), sign=-1)
+        rollup_service.add_bill(db, {"wireman_id": bill.wireman_id, "date": date, "amount": amount,
+                                     "points_earned": new_points})
+        receivables_service.apply_deltas(db, receivables_service.merge_deltas(
+            receivables_service.bill_deltas([bill._asdict()], sign=-1),
+            receivables_service.bill_deltas([{"wireman_id": bill.wireman_id, "client_name": client_name, "date": date,
+                                              "amount": amount, "payment_status": payment_status}])
+        ))
 
         db.commit()
+        query_cache.invalidate_bill_totals([(bill.wireman_id, bill.date), (bill.wireman_id, date)])
+        client_name_service.record_client_rename(bill.client_name, client_name)
         return True, "Bill updated successfully."
     except Exception as e:
         db.rollback()
         return False, f"An error occurred: {str(e)}"
 
+@instrumented
 def delete_bill(db: Session, bill_id: int) -> Tuple[bool, str]:
-    """Delete a bill and update points."""
+    """Delete a bill and take its points back as a single SQL-side decrement."""
     try:
-        bill = db.query(Bill).filter(Bill.id == bill_id).first()
+        bill = _lock_bill(db, bill_id)
         if not bill:
+            db.rollback()
             return False, "Bill not found."
 
-        # Update points for wireman
-        point_record = db.query(Point).filter(Point.wireman_id == bill.wireman_id).first()
-        if point_record:
-            point_record.total_points -= bill.points_earned
-            point_record.balance_points -= bill.points_earned
+        deleted = db.query(Bill).filter(_unchanged_bill(bill_id, bill)). \
+            delete(synchronize_session=False)
+        if not deleted:
+            db.rollback()
+            return False, BILL_CHANGED_MESSAGE
+
+        # Update points for wireman and remove the bill from the daily rollup and receivables
+        points_service.add_points(db, bill.wireman_id, -(bill.points_earned or Decimal('0')), bill_id,
+                                  skip_new_negative=True)
+        rollup_service.add_bill(db, bill._asdict(), sign=-1)
+        receivables_service.add_bill(db, bill._asdict(), sign=-1)
 
-        db.delete(bill)
         db.commit()
+        query_cache.invalidate_bill_totals([(bill.wireman_id, bill.date)])
+        client_name_service.record_client_name(bill.client_name, -1)
         return True, "Bill deleted successfully."
     except Exception as e:
         db.rollback()
-        return False, f"An error occurred: {str(e)}"
\ No newline at end of file
+        return False, f"An error occurred: {str(e)}"
+
+@instrumented
+def apply_bill_changes(db: Session, edits: List[BillEdit], deleted_ids: List[int]) -> Tuple[bool, str]:
+    """
+    Update and delete a batch of bills in one transaction, all or nothing.
+
+    Edits carrying the original grid values are refused if the bill has changed since.
+    The bills are locked in one read, changed with one UPDATE (CASE per column) and one
+    DELETE, and each affected wireman's points, daily rollups and receivables are
+    adjusted once by the summed change.
+
+    Args:
+        db (Session): The database session.
+        edits (List[BillEdit]): New values for the bills to update.
+        deleted_ids (List[int]): IDs of the bills to delete; a bill both edited and deleted is deleted.
+
+    Returns:
+        Tuple[bool, str]: Whether the batch was applied, and a message.
+    """
+    deleted_ids = sorted(set(deleted_ids))
+    edits = {edit.bill_id: edit for edit in edits if edit.bill_id not in deleted_ids}
+    bill_ids = sorted(set(edits) | set(deleted_ids))
+    if not bill_ids:
+        return False, "No changes to save."
+    incomplete = [bill_id for bill_id, edit in edits.items() if None in (edit.amount, edit.date, edit.payment_status)]
+    if incomplete:
+        return False, f"Bills {', '.join(map(str, incomplete))}: amount, date and payment status are required."
+
+    try:
+        locked = {
+            row.id: row for row in db.query(
+                Bill.id, Bill.wireman_id, Bill.client_name, Bill.amount, Bill.date, Bill.payment_status,
+                Bill.points_earned
+            ).filter(Bill.id.in_(bill_ids)).order_by(Bill.id).with_for_update()
+        }
+        missing = [bill_id for bill_id in bill_ids if bill_id not in locked]
+        if missing:
+            db.rollback()
+            return False, f"Bills not found: {', '.join(map(str, missing))}. Please reload and try again."
+        # Refuse edits made from values another user has since changed, rather than overwrite them.
+        stale = [
+            bill_id for bill_id, edit in edits.items() if edit.original is not None and edit.original != (
+                locked[bill_id].client_name, locked[bill_id].amount, locked[bill_id].date, locked[bill_id].payment_status
+            )
+        ]
+        if stale:
+            db.rollback()
+            return False, f"Bills changed by another user: {', '.join(map(str, stale))}. Please reload and try again."
+
+        rules = points_rules_service.get_points_rules()
+        new_points = {bill_id: rules.score(edit.amount, edit.payment_status, edit.date) for bill_id, edit in edits.items()}
+        if edits:
+            values = {
+                Bill.client_name: {bill_id: edit.client_name for bill_id, edit in edits.items()},
+                Bill.amount: {bill_id: edit.amount for bill_id, edit in edits.items()},
+                Bill.date: {bill_id: edit.date for bill_id, edit in edits.items()},
+                Bill.payment_status: {bill_id: edit.payment_status for bill_id, edit in edits.items()},
+                Bill.points_earned: new_points,
+            }
+            columns = {column: case(by_id, value=Bill.id) for column, by_id in values.items()}
+            # PostgreSQL types a CASE of string literals as text, which does not assign to the enum column.
+            columns[Bill.payment_status] = cast(columns[Bill.payment_status], Bill.payment_status.type)
+            updated = db.query(Bill).filter(or_(*(_unchanged_bill(bill_id, locked[bill_id]) for bill_id in edits))). \
+                update(columns, synchronize_session=False)
+            if updated != len(edits):
+                db.rollback()
+                return False, BILL_CHANGED_MESSAGE
+        if deleted_ids:
+            deleted = db.query(Bill).filter(or_(*(_unchanged_bill(bill_id, locked[bill_id]) for bill_id in deleted_ids))). \
+                delete(synchronize_session=False)
+            if deleted != len(deleted_ids):
+                db.rollback()
+                return False, BILL_CHANGED_MESSAGE
+
+        # Sum the points change per wireman, then adjust points, rollups and receivables once per key
+        point_deltas = defaultdict(Decimal)
+        for bill_id in bill_ids:
+            bill = locked[bill_id]
+            if bill.wireman_id is None:
+                continue
+            point_deltas[bill.wireman_id] += new_points.get(bill_id, Decimal('0')) - (bill.points_earned or Decimal('0'))
+        points_service.add_points_bulk(db, point_deltas, skip_new_negative=True)
+        rollup_service.apply_deltas(db, rollup_service.merge_deltas(
+            rollup_service.bill_deltas((locked[bill_id]._asdict() for bill_id in bill_ids), sign=-1),
+            rollup_service.bill_deltas({
+                "wireman_id": locked[bill_id].wireman_id,
+                "date": edit.date,
+                "amount": edit.amount,
+                "points_earned": new_points[bill_id]
+            } for bill_id, edit in edits.items())
+        ))
+        receivables_service.apply_deltas(db, receivables_service.merge_deltas(
+            receivables_service.bill_deltas((locked[bill_id]._asdict() for bill_id in bill_ids), sign=-1),
+            receivables_service.bill_deltas({
+                "wireman_id": locked[bill_id].wireman_id,
+                "client_name": edit.client_name,
+                "date": edit.date,
+                "amount": edit.amount,
+                "payment_status": edit.payment_status
+            } for bill_id, edit in edits.items())
+        ))
+
+        db.commit()
+        query_cache.invalidate_bill_totals(
+            [(locked[bill_id].wireman_id, locked[bill_id].date) for bill_id in bill_ids] +
+            [(locked[bill_id].wireman_id, edit.date) for bill_id, edit in edits.items()]
+        )
+        for bill_id, edit in edits.items():
+            client_name_service.record_client_rename(locked[bill_id].client_name, edit.client_name)
+        for bill_id in deleted_ids:
+            client_name_service.record_client_name(locked[bill_id].client_name, -1)
+        return True, f"{len(edits)} bills updated and {len(deleted_ids)} bills deleted."
+    except Exception as e:
+        db.rollback()
+        return False, f"An error occurred: {str(e)}"
@@ -0,0 +1,198 @@
+# File: services/client_name_service.py
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from database.models import Bill
+from database.instrumentation import instrumented
+
+DEFAULT_SUGGESTIONS = 10
+
+# Prefixes matching more names than this keep their top suggestions up to date, so no
+# lookup ranks more than this many names.
+CACHE_MIN_MATCHES = 256
+
+# Sorts after every character, so [prefix, prefix + _MAX_CHAR) spans all keys starting with prefix.
+_MAX_CHAR = "\U0010ffff"
+
+
+def _normalize(name: str) -> str:
+    """Get the case-insensitive lookup key of a client name."""
+    return " ".join((name or "").split()).casefold()
+
+
+class ClientNameIndex:
+    """
+    Prefix index over distinct client names, ranked by how many bills use each name.
+
+    Keys are kept in a sorted list, so the names starting with a prefix are one contiguous
+    slice found with two binary searches. Prefixes matching more than CACHE_MIN_MATCHES
+    names keep their top DEFAULT_SUGGESTIONS keys, computed when the index is built by
+    merging the tops of one character longer prefixes. Updates adjust the kept tops of the
+    changed name's prefixes in place; only a name losing bills while in a top makes that
+    prefix merge its longer prefixes' tops again.
+    """
+
+    def __init__(self, names: Iterable[Tuple[str, int]] = ()):
+        self._names: Dict[str, str] = {}
+        self._counts: Dict[str, int] = {}
+        self._top: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        for name, count in names:
+            key = _normalize(name)
+            if key:
+                self._names.setdefault(key, " ".join(name.split()))
+                self._counts[key] = self._counts.get(key, 0) + count
+        self._keys: List[str] = sorted(self._counts)
+        if self._keys:
+            self._top_keys("", 0, len(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _rank_key(self, key: str) -> Tuple[int, str]:
+        return -self._counts[key], key
+
+    def _slice(self, prefix: str) -> Tuple[int, int]:
+        """The [start, end) range of the sorted keys starting with prefix."""
+        start = bisect_left(self._keys, prefix)
+        return start, bisect_left(self._keys, prefix + _MAX_CHAR, start)
+
+    def _top_keys(self, prefix: str, start: int, end: int) -> List[str]:
+        """
+        Get the top DEFAULT_SUGGESTIONS keys of [start, end), the keys starting with prefix.
+
+        Slices of at most CACHE_MIN_MATCHES keys are ranked directly. Larger ones use their
+        kept top, or merge the tops of their one character longer prefixes and keep the result.
+        """
+        if end - start <= CACHE_MIN_MATCHES:
+            return self._rank(start, end, DEFAULT_SUGGESTIONS)
+        top = self._top.get(prefix)
+        if top is not None:
+            return top
+        candidates = []
+        position = start
+        if self._keys[start] == prefix:
+            candidates.append(prefix)
+            position += 1
+        while position < end:
+            child = self._keys[position][:len(prefix) + 1]
+            child_end = bisect_left(self._keys, child + _MAX_CHAR, position, end)
+            candidates.extend(self._top_keys(child, position, child_end))
+            position = child_end
+        top = self._top[prefix] = heapq.nsmallest(DEFAULT_SUGGESTIONS, candidates, key=self._rank_key)
+        return top
+
+    def _update_tops(self, key: str, count: int):
+        """Bring the kept tops of key's prefixes up to date after its count changed by count."""
+        for length in range(len(key), -1, -1):
+            prefix = key[:length]
+            top = self._top.get(prefix)
+            if top is None:
+                continue
+            if count < 0 and key in top:
+                # The name may drop out of the top; merge it again (longer prefixes are already current).
+                del self._top[prefix]
+                self._top_keys(prefix, *self._slice(prefix))
+            elif count > 0 and key in top:
+                top.sort(key=self._rank_key)
+            elif count > 0 and (len(top) < DEFAULT_SUGGESTIONS or self._rank_key(key) < self._rank_key(top[-1])):
+                top.append(key)
+                top.sort(key=self._rank_key)
+                del top[DEFAULT_SUGGESTIONS:]
+
+    def add(self, name: str, count: int = 1):
+        """Count a client name used by count more bills (fewer, if negative), adding or dropping it as needed."""
+        key = _normalize(name)
+        if not key or not count:
+            return
+        with self._lock:
+            total = self._counts.get(key, 0) + count
+            if total > 0:
+                if key not in self._counts:
+                    insort(self._keys, key)
+                    self._names[key] = " ".join(name.split())
+                self._counts[key] = total
+            elif key in self._counts:
+                del self._keys[bisect_left(self._keys, key)]
+                del self._names[key]
+                del self._counts[key]
+            else:
+                return
+            self._update_tops(key, count)
+
+    def rename(self, old_name: str, new_name: str):
+        """Move one bill's use from old_name to new_name."""
+        if _normalize(old_name) != _normalize(new_name):
+            self.add(old_name, -1)
+            self.add(new_name, 1)
+
+    def _rank(self, start: int, end: int, limit: int) -> List[str]:
+        """Rank the keys in a slice of the sorted keys by bill count."""
+        if end - start <= limit:
+            return sorted(self._keys[start:end], key=self._rank_key)
+        return heapq.nsmallest(limit, self._keys[start:end], key=self._rank_key)
+
+    def suggest(self, prefix: str, limit: int = DEFAULT_SUGGESTIONS) -> List[str]:
+        """
+        Get the most used client names starting with a prefix, case-insensitively.
+
+        Args:
+            prefix (str): The typed text.
+            limit (int): Maximum number of suggestions.
+
+        Returns:
+            List[str]: Client names, most used first, then alphabetically.
+        """
+        prefix = _normalize(prefix)
+        with self._lock:
+            start, end = self._slice(prefix)
+            if limit > DEFAULT_SUGGESTIONS:
+                keys = self._rank(start, end, limit)
+            else:
+                keys = self._top_keys(prefix, start, end)[:limit]
+            return [self._names[key] for key in keys]
+
+
+_index: Optional[ClientNameIndex] = None
+_index_lock = threading.Lock()
+
+
+def load_client_names(db: Session) -> ClientNameIndex:
+    """Build an index from the distinct client names in bills and their bill counts."""
+    return ClientNameIndex(
+        db.query(Bill.client_name, func.count(Bill.id)).
+        filter(Bill.client_name.isnot(None)).
+        group_by(Bill.client_name)
+    )
+
+
+def get_client_name_index(db: Session) -> ClientNameIndex:
+    """Get the process-wide client name index, loading it from the database on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = load_client_names(db)
+    return _index
+
+
+@instrumented
+def suggest_client_names(db: Session, prefix: str, limit: int = DEFAULT_SUGGESTIONS) -> List[str]:
+    """Get the most used client names starting with prefix."""
+    return get_client_name_index(db).suggest(prefix, limit)
+
+
+def record_client_name(name: str, count: int = 1):
+    """Count a committed bill's client name; a no-op until the index has been loaded."""
+    if _index is not None:
+        _index.add(name, count)
+
+
+def record_client_rename(old_name: str, new_name: str):
+    """Move a committed bill from one client name to another; a no-op until the index has been loaded."""
+    if _index is not None:
+        _index.rename(old_name, new_name)
@@ -0,0 +1,176 @@
+# File: services/export_service.py
+
+import argparse
+from datetime import date
+from decimal import Decimal
+from typing import BinaryIO, Iterator, List, Optional
+import pandas as pd
+from sqlalchemy.orm import Session
+from database.models import Bill
+from database.instrumentation import instrumented
+from services import bill_records_service, wireman_management_services
+
+DEFAULT_CHUNK_SIZE = 5000
+
+EXPORT_FORMATS = {
+    "csv": ("CSV", "text/csv"),
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+}
+
+# Excel's row limit per worksheet, including the header row.
+EXCEL_MAX_ROWS = 1048576
+
+
+def stream_query_chunks(db: Session, query, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a query's rows as DataFrames of at most chunk_size rows.
+
+    The query runs with yield_per, which streams ORM results through a server-side
+    cursor (stream_results) so only one chunk of rows is held in memory at a time,
+    whatever the size of the result.
+
+    Args:
+        db (Session): The database session.
+        query: An ORM query selecting the columns to export.
+        chunk_size (int): Maximum rows per chunk.
+        columns (Optional[List[str]]): Column names for the chunks; defaults to the query's labels.
+
+    Returns:
+        Iterator[pd.DataFrame]: The chunks, in query order.
+    """
+    result = db.execute(query.statement.execution_options(yield_per=chunk_size))
+    try:
+        columns = columns or list(result.keys())
+        for rows in result.partitions(chunk_size):
+            chunk = pd.DataFrame.from_records(rows, columns=columns)
+            for column in chunk.columns:
+                if chunk[column].map(lambda value: isinstance(value, Decimal)).any():
+                    chunk[column] = pd.to_numeric(chunk[column], errors="coerce").astype(float)
+            yield chunk
+    finally:
+        result.close()
+
+
+def _write_csv(chunks: Iterator[pd.DataFrame], file: BinaryIO) -> int:
+    """Write chunks to a CSV file, header first."""
+    rows_written = 0
+    for chunk in chunks:
+        file.write(chunk.to_csv(index=False, header=rows_written == 0).encode("utf-8"))
+        rows_written += len(chunk)
+    return rows_written
+
+
+def _write_excel(chunks: Iterator[pd.DataFrame], file: BinaryIO) -> int:
+    """Write chunks to an Excel workbook in write-only mode, starting a new sheet at Excel's row limit."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = None
+    sheet_rows = 0
+    rows_written = 0
+    for chunk in chunks:
+        for values in chunk.itertuples(index=False, name=None):
+            if worksheet is None or sheet_rows >= EXCEL_MAX_ROWS:
+                worksheet = workbook.create_sheet(f"Sheet{len(workbook.worksheets) + 1}")
+                worksheet.append(list(chunk.columns))
+                sheet_rows = 1
+            worksheet.append([None if pd.isna(value) else value for value in values])
+            sheet_rows += 1
+        rows_written += len(chunk)
+    if worksheet is None:
+        workbook.create_sheet("Sheet1")
+    workbook.save(file)
+    return rows_written
+
+
+def _write_parquet(chunks: Iterator[pd.DataFrame], file: BinaryIO) -> int:
+    """Write chunks to a Parquet file, one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows_written = 0
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(file, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows_written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows_written
+
+
+def export_query(db: Session, query, file: BinaryIO, file_format: str,
+                 columns: Optional[List[str]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Export a query's rows to a binary file as CSV, Excel or Parquet.
+
+    Args:
+        db (Session): The database session.
+        query: An ORM query selecting the columns to export.
+        file (BinaryIO): The destination file, opened in binary mode.
+        file_format (str): 'csv', 'xlsx' or 'parquet'.
+        columns (Optional[List[str]]): Column headers; defaults to the query's labels.
+        chunk_size (int): Rows fetched and written per chunk.
+
+    Returns:
+        int: The number of rows written.
+    """
+    writers = {"csv": _write_csv, "xlsx": _write_excel, "parquet": _write_parquet}
+    if file_format not in writers:
+        raise ValueError(f"Unsupported export format '{file_format}'.")
+    return writers[file_format](stream_query_chunks(db, query, chunk_size, columns), file)
+
+
+@instrumented
+def export_bill_records(db: Session, file: BinaryIO, file_format: str, bill_id: int = 0,
+                        wireman_id: Optional[int] = None, date_range: Optional[tuple] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Export the bill records matching the bill records filters, newest first."""
+    query = bill_records_service.bill_rows_query(db, bill_id, wireman_id, date_range). \
+        order_by(Bill.date.desc(), Bill.id.desc())
+    return export_query(db, query, file, file_format, bill_records_service.BILL_RECORD_COLUMNS, chunk_size)
+
+
+@instrumented
+def export_leaderboard(db: Session, file: BinaryIO, file_format: str, category: str,
+                       date_range: Optional[tuple] = None, payment_status: Optional[str] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Export the full ranked leaderboard for a category, period and payment status, highest value first."""
+    query = wireman_management_services._leaderboard_query(db, category, date_range, payment_status)
+    return export_query(db, query, file, file_format, ["Rank", "Wireman ID", "Wireman", "Value"], chunk_size)
+
+
+def main():
+    from database.connection import session_scope
+
+    parser = argparse.ArgumentParser(
+        description="Export bill records to a file, holding one chunk of rows in memory at a time."
+    )
+    parser.add_argument("output", help="Destination file; the format is taken from its extension.")
+    parser.add_argument("--wireman-id", type=int, help="Only this wireman's bills.")
+    parser.add_argument("--start", type=date.fromisoformat, help="First bill date (YYYY-MM-DD).")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last bill date (YYYY-MM-DD).")
+    args = parser.parse_args()
+
+    file_format = args.output.rsplit(".", 1)[-1].lower()
+    if file_format not in EXPORT_FORMATS:
+        parser.error(f"The output file must end in one of: {', '.join('.' + fmt for fmt in EXPORT_FORMATS)}.")
+    if (args.start is None) != (args.end is None):
+        parser.error("Pass both --start and --end, or neither.")
+    date_range = (args.start, args.end) if args.start else None
+
+    with session_scope() as db, open(args.output, "wb") as file:
+        rows_written = export_bill_records(db, file, file_format, wireman_id=args.wireman_id, date_range=date_range)
+    print(f"Exported {rows_written} bill records to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
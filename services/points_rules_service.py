@@ -0,0 +1,287 @@
+# File: services/points_rules_service.py
+
+import argparse
+import os
+import threading
+from datetime import date
+from decimal import Decimal, ROUND_FLOOR
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+import numpy as np
+import toml
+from sqlalchemy import and_, case, func, literal, or_
+from sqlalchemy.orm import Session
+from database.models import Bill, PAYMENT_STATUSES
+from database.instrumentation import instrumented
+from services import points_service, query_cache, rollup_service
+
+POINTS_RULES_FILE = os.getenv("POINTS_RULES_FILE", "points_rules.toml")
+
+CENT = Decimal("0.01")
+
+
+class Tier(NamedTuple):
+    """Points per unit amount for bills of at least min_amount."""
+    min_amount: Decimal
+    rate: Decimal
+
+
+class Promotion(NamedTuple):
+    """A points multiplier for bills dated between start and end, inclusive."""
+    name: str
+    start: date
+    end: date
+    multiplier: Decimal
+
+
+class PointsRules:
+    """
+    Reward rules that turn a bill into points.
+
+    points = floor(amount / unit_amount) * tier rate * payment status multiplier
+             * the multiplier of every promotion covering the bill date,
+    rounded down to the cent. The tier is the one with the highest min_amount not above
+    the amount; bills below every tier earn nothing. The default rules are one point per 1000.
+
+    The same rules are evaluated three ways: per bill (score), over NumPy arrays
+    (score_arrays) and as a SQL expression (score_sql), so a batch or the whole bills
+    table can be re-scored in one pass.
+    """
+
+    def __init__(self, unit_amount: Decimal = Decimal("1000"), tiers: Iterable[Tier] = (Tier(Decimal("0"), Decimal("1")),),
+                 status_multipliers: Optional[Dict[str, Decimal]] = None, promotions: Iterable[Promotion] = ()):
+        self.unit_amount = Decimal(unit_amount)
+        self.tiers = sorted(tiers)
+        self.status_multipliers = dict(status_multipliers or {})
+        self.promotions = list(promotions)
+        if self.unit_amount <= 0:
+            raise ValueError("unit_amount must be positive.")
+        if not self.tiers:
+            raise ValueError("At least one tier is required.")
+        for value in [tier.rate for tier in self.tiers] + list(self.status_multipliers.values()) + \
+                [promotion.multiplier for promotion in self.promotions]:
+            if value < 0:
+                raise ValueError("Rates and multipliers must not be negative.")
+        for status in self.status_multipliers:
+            if status not in PAYMENT_STATUSES:
+                raise ValueError(f"Unknown payment status '{status}'; expected one of {', '.join(PAYMENT_STATUSES)}.")
+        for promotion in self.promotions:
+            if promotion.start > promotion.end:
+                raise ValueError(f"Promotion '{promotion.name}' ends before it starts.")
+
+    def score(self, amount: Decimal, payment_status: Optional[str] = None, bill_date: Optional[date] = None) -> Decimal:
+        """Get the points of one bill."""
+        amount = Decimal(str(amount))
+        rate = Decimal("0")
+        for tier in self.tiers:
+            if amount >= tier.min_amount:
+                rate = tier.rate
+        points = (amount // self.unit_amount) * rate * self.status_multipliers.get(payment_status, Decimal("1"))
+        for promotion in self.promotions:
+            if bill_date is not None and promotion.start <= bill_date <= promotion.end:
+                points *= promotion.multiplier
+        return points.quantize(CENT, rounding=ROUND_FLOOR)
+
+    def score_arrays(self, amounts: Sequence, payment_statuses: Sequence, bill_dates: Sequence) -> np.ndarray:
+        """
+        Get the points of many bills at once.
+
+        Args:
+            amounts (Sequence): Bill amounts.
+            payment_statuses (Sequence): Payment statuses, aligned with amounts.
+            bill_dates (Sequence): Bill dates, aligned with amounts.
+
+        Returns:
+            np.ndarray: Points as float64, rounded down to the cent.
+        """
+        # Whole cents as integers, so the floor division by the unit is exact.
+        cents = np.rint(np.asarray(amounts, dtype=np.float64) * 100).astype(np.int64)
+        units = cents // int(self.unit_amount * 100)
+        tier_index = np.searchsorted([int(tier.min_amount * 100) for tier in self.tiers], cents, side="right") - 1
+        rates = np.append([float(tier.rate) for tier in self.tiers], 0.0)  # index -1: below every tier
+        points = units * rates[tier_index]
+
+        if self.status_multipliers:
+            statuses = np.asarray(payment_statuses, dtype=object)
+            for status, multiplier in self.status_multipliers.items():
+                points = np.where(statuses == status, points * float(multiplier), points)
+        if self.promotions:
+            days = np.asarray(bill_dates, dtype="datetime64[D]")
+            for promotion in self.promotions:
+                active = (days >= np.datetime64(promotion.start)) & (days <= np.datetime64(promotion.end))
+                points = np.where(active, points * float(promotion.multiplier), points)
+        # The epsilon keeps products such as 3 * 1.1 from flooring to one cent less.
+        return np.floor(points * 100 + 1e-6) / 100
+
+    def score_sql(self, amount=Bill.amount, payment_status=Bill.payment_status, bill_date=Bill.date):
+        """Build a SQL expression for the points of the bills in the given columns."""
+        units = func.floor(amount / literal(self.unit_amount))
+        rate = case(*(
+            (amount >= literal(tier.min_amount), literal(tier.rate)) for tier in reversed(self.tiers)
+        ), else_=literal(Decimal("0")))
+        points = units * rate
+        if self.status_multipliers:
+            points = points * case(
+                {status: literal(multiplier) for status, multiplier in self.status_multipliers.items()},
+                value=payment_status, else_=literal(Decimal("1"))
+            )
+        for promotion in self.promotions:
+            points = points * case(
+                (bill_date.between(promotion.start, promotion.end), literal(promotion.multiplier)),
+                else_=literal(Decimal("1"))
+            )
+        # The same epsilon as score_arrays, for databases that compute this in floating point (SQLite).
+        return func.floor(points * 100 + literal(Decimal("0.000001"))) / 100
+
+    def score_bills(self, bills: List[dict]):
+        """Set points_earned on a batch of bill dicts (amount, payment_status, date) in one vectorized pass."""
+        if not bills:
+            return
+        points = self.score_arrays(
+            [bill["amount"] for bill in bills],
+            [bill["payment_status"] for bill in bills],
+            [bill["date"] for bill in bills]
+        )
+        for bill, value in zip(bills, points.tolist()):
+            bill["points_earned"] = Decimal(f"{value:.2f}")
+
+
+def load_points_rules(path: str = POINTS_RULES_FILE) -> PointsRules:
+    """
+    Load points rules from a TOML file; the default rules if the file does not exist.
+
+    Raises:
+        ValueError: If the rules are invalid.
+    """
+    if not os.path.exists(path):
+        return PointsRules()
+    config = toml.load(path)
+
+    def decimal(value) -> Decimal:
+        return Decimal(str(value))
+
+    return PointsRules(
+        unit_amount=decimal(config.get("unit_amount", 1000)),
+        tiers=[Tier(decimal(tier["min_amount"]), decimal(tier["rate"]))
+               for tier in config.get("tiers", [{"min_amount": 0, "rate": 1}])],
+        status_multipliers={status: decimal(multiplier)
+                            for status, multiplier in config.get("payment_status_multipliers", {}).items()},
+        promotions=[Promotion(promotion["name"], promotion["start"], promotion["end"], decimal(promotion["multiplier"]))
+                    for promotion in config.get("promotions", [])]
+    )
+
+
+_rules: Optional[PointsRules] = None
+# Modification time of POINTS_RULES_FILE when _rules was loaded (None if it did not exist);
+# rules passed to set_points_rules are pinned and never reloaded.
+_rules_mtime: Optional[float] = None
+_rules_pinned = False
+_rules_lock = threading.Lock()
+
+
+def _rules_file_mtime() -> Optional[float]:
+    try:
+        return os.path.getmtime(POINTS_RULES_FILE)
+    except OSError:
+        return None
+
+
+def get_points_rules() -> PointsRules:
+    """
+    Get the process-wide points rules, loading them from POINTS_RULES_FILE on first use
+    and again whenever the file's modification time changes, so edits apply without a restart.
+    """
+    global _rules, _rules_mtime
+    if _rules_pinned:
+        return _rules
+    mtime = _rules_file_mtime()
+    if _rules is None or mtime != _rules_mtime:
+        with _rules_lock:
+            if not _rules_pinned and (_rules is None or mtime != _rules_mtime):
+                _rules = load_points_rules()
+                _rules_mtime = mtime
+    return _rules
+
+
+def set_points_rules(rules: Optional[PointsRules]):
+    """Replace the process-wide points rules; None reloads them from POINTS_RULES_FILE on next use."""
+    global _rules, _rules_mtime, _rules_pinned
+    with _rules_lock:
+        _rules = rules
+        _rules_mtime = None
+        _rules_pinned = rules is not None
+
+
+def calculate_points(amount: Decimal, payment_status: Optional[str] = None, bill_date: Optional[date] = None) -> Decimal:
+    """Calculate a bill's points with the current points rules."""
+    return get_points_rules().score(amount, payment_status, bill_date)
+
+
+class RescoreReport(NamedTuple):
+    """The outcome of re-scoring the bills."""
+    bills_changed: int
+    wiremen_changed: int
+    points_delta: Decimal
+
+
+@instrumented
+def rescore_bills(db: Session, rules: Optional[PointsRules] = None, dry_run: bool = False) -> RescoreReport:
+    """
+    Recompute every bill's points with the rules in a few set-based statements and commit.
+
+    The per-wireman change is summed in SQL and applied to the points snapshot and ledger
+    with one upsert, the bills are updated with one UPDATE, and the daily rollups are rebuilt.
+
+    Args:
+        db (Session): The database session.
+        rules (Optional[PointsRules]): The rules to apply; the current points rules if None.
+        dry_run (bool): Only report what would change.
+
+    Returns:
+        RescoreReport: How many bills and wiremen changed and the total change in points.
+    """
+    rules = rules or get_points_rules()
+    new_points = rules.score_sql()
+    old_points = func.coalesce(Bill.points_earned, 0)
+    changed = or_(Bill.points_earned.is_(None), Bill.points_earned != new_points)
+
+    point_deltas = {
+        wireman_id: Decimal(str(round(delta, 2)))
+        for wireman_id, delta in db.query(Bill.wireman_id, func.sum(new_points - old_points)).
+        filter(and_(Bill.wireman_id.isnot(None), changed)).group_by(Bill.wireman_id)
+    }
+    point_deltas = {wireman_id: delta for wireman_id, delta in point_deltas.items() if delta}
+    if dry_run:
+        bills_changed = db.query(func.count(Bill.id)).filter(changed).scalar()
+        return RescoreReport(bills_changed, len(point_deltas), sum(point_deltas.values(), Decimal("0")))
+
+    try:
+        bills_changed = db.query(Bill).filter(changed). \
+            update({Bill.points_earned: new_points}, synchronize_session=False)
+        points_service.add_points_bulk(db, point_deltas)
+        rollup_service.rebuild_rollups(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    query_cache.invalidate_bill_totals()
+    return RescoreReport(bills_changed, len(point_deltas), sum(point_deltas.values(), Decimal("0")))
+
+
+def main():
+    from database.connection import session_scope
+
+    parser = argparse.ArgumentParser(description="Re-score every bill with the points rules in POINTS_RULES_FILE.")
+    parser.add_argument("--rules", default=POINTS_RULES_FILE, help="TOML file with the points rules.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change.")
+    args = parser.parse_args()
+
+    rules = load_points_rules(args.rules)
+    with session_scope() as db:
+        report = rescore_bills(db, rules, dry_run=args.dry_run)
+    action = "Would change" if args.dry_run else "Changed"
+    print(f"{action} {report.bills_changed} bills of {report.wiremen_changed} wiremen "
+          f"({report.points_delta:+} points in total).")
+
+
+if __name__ == "__main__":
+    main()
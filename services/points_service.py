@@ -0,0 +1,350 @@
+# File: services/points_service.py
+
+import argparse
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from database.models import Wireman, Bill, Point, PointTransaction
+
+# Ledger entry kinds. 'earn' and 'reverse' follow bills, 'adjust' corrects the total,
+# and 'redeem' moves points between the balance and redeemed.
+EARN = "earn"
+REVERSE = "reverse"
+ADJUST = "adjust"
+REDEEM = "redeem"
+
+
+class PointsDrift(NamedTuple):
+    """A wireman whose bills, points ledger and points snapshot disagree."""
+    wireman_id: int
+    bill_points: Decimal
+    ledger_bill_points: Decimal
+    ledger_total: Decimal
+    snapshot_total: Decimal
+    ledger_redeemed: Decimal
+    snapshot_redeemed: Decimal
+    ledger_balance: Decimal
+    snapshot_balance: Decimal
+
+
+def _record_transactions(db: Session, transactions: List[dict]):
+    """Append rows to the points ledger with one executemany insert."""
+    if transactions:
+        db.execute(insert(PointTransaction), transactions)
+
+
+def _upsert_points(db: Session, values: list):
+    """
+    Insert points rows, or add to the existing row of the same wireman.
+
+    Uses INSERT ... ON CONFLICT (wireman_id) DO UPDATE so the first bill of a wireman
+    cannot create a duplicate points row and concurrent increments are not lost.
+    """
+    dialect_insert = sqlite.insert if db.bind.dialect.name == "sqlite" else postgresql.insert
+    statement = dialect_insert(Point).values(values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Point.wireman_id],
+        set_={
+            "total_points": Point.total_points + statement.excluded.total_points,
+            "balance_points": Point.balance_points + statement.excluded.balance_points,
+        }
+    )
+    db.execute(statement)
+
+
+def add_points(db: Session, wireman_id: int, points: Decimal, bill_id: Optional[int] = None,
+               kind: Optional[str] = None, skip_new_negative: bool = False):
+    """
+    Add earned points (or remove them, if negative) for a wireman and record them in the ledger.
+
+    Args:
+        db (Session): The database session.
+        wireman_id (int): The ID of the wireman.
+        points (Decimal): Points to add to the total and balance.
+        bill_id (Optional[int]): The bill the points come from, if any.
+        kind (Optional[str]): Ledger entry kind; defaults to 'earn', or 'reverse' for negative points.
+        skip_new_negative (bool): Skip negative points for a wireman without a points row,
+            rather than create a row with negative totals.
+    """
+    add_points_bulk(db, {wireman_id: points}, bill_id, kind, skip_new_negative)
+
+
+def add_points_bulk(db: Session, point_deltas: Dict[int, Decimal], bill_id: Optional[int] = None,
+                    kind: Optional[str] = None, skip_new_negative: bool = False):
+    """
+    Add earned points for several wiremen with one multi-row upsert and one ledger insert.
+
+    Args:
+        db (Session): The database session.
+        point_deltas (Dict[int, Decimal]): Points to add keyed by wireman ID.
+        bill_id (Optional[int]): The bill the points come from, if any.
+        kind (Optional[str]): Ledger entry kind; defaults to 'earn', or 'reverse' for negative points.
+        skip_new_negative (bool): Skip negative points for wiremen without a points row, rather than
+            create a row with negative totals. Bill updates and deletes use it; positive points still
+            create the row, since a wireman whose bills so far earned nothing has none yet.
+    """
+    point_deltas = {wireman_id: points for wireman_id, points in sorted(point_deltas.items()) if points}
+    debited_ids = [wireman_id for wireman_id, points in point_deltas.items() if points < 0]
+    if debited_ids and skip_new_negative:
+        existing = {wireman_id for (wireman_id,) in
+                    db.query(Point.wireman_id).filter(Point.wireman_id.in_(debited_ids))}
+        point_deltas = {wireman_id: points for wireman_id, points in point_deltas.items()
+                        if points > 0 or wireman_id in existing}
+    if not point_deltas:
+        return
+    _upsert_points(db, [
+        {
+            "wireman_id": wireman_id,
+            "total_points": points,
+            "redeemed_points": Decimal('0'),
+            "balance_points": points
+        } for wireman_id, points in point_deltas.items()
+    ])
+    _record_transactions(db, [
+        {
+            "wireman_id": wireman_id,
+            "bill_id": bill_id,
+            "kind": kind or (EARN if points > 0 else REVERSE),
+            "points": points
+        } for wireman_id, points in point_deltas.items()
+    ])
+
+
+def redeem_points(db: Session, wireman_id: int, points: Decimal) -> Tuple[bool, str]:
+    """
+    Redeem points only if the balance covers them, as one conditional UPDATE.
+
+    Args:
+        db (Session): The database session.
+        wireman_id (int): The ID of the wireman.
+        points (Decimal): Points to redeem.
+
+    Returns:
+        Tuple[bool, str]: Whether the points were redeemed, and an error message if not.
+    """
+    updated = db.query(Point). \
+        filter(Point.wireman_id == wireman_id, Point.balance_points >= points). \
+        update({
+            Point.redeemed_points: Point.redeemed_points + points,
+            Point.balance_points: Point.balance_points - points
+        }, synchronize_session=False)
+    if updated:
+        _record_transactions(db, [{"wireman_id": wireman_id, "kind": REDEEM, "points": -points}])
+        return True, ""
+    if db.query(Point.id).filter(Point.wireman_id == wireman_id).first() is None:
+        return False, "No points record found for this wireman."
+    return False, "Not enough points to redeem."
+
+
+def lock_point_records(db: Session, wireman_ids: List[int]) -> Dict[int, Tuple[Decimal, Decimal]]:
+    """Lock the wiremen's points rows in ID order; return (balance, redeemed) keyed by wireman ID."""
+    rows = db.query(Point.wireman_id, Point.balance_points, Point.redeemed_points). \
+        filter(Point.wireman_id.in_(wireman_ids)).order_by(Point.wireman_id).with_for_update().all()
+    return {row.wireman_id: (row.balance_points, row.redeemed_points) for row in rows}
+
+
+def redeem_all_points(db: Session, wireman_id: int) -> Optional[Decimal]:
+    """
+    Redeem a wireman's whole balance under a row lock.
+
+    Returns:
+        Optional[Decimal]: The points redeemed, or None if the wireman has no points record.
+    """
+    return redeem_all_points_bulk(db, [wireman_id]).get(wireman_id)
+
+
+def redeem_all_points_bulk(db: Session, wireman_ids: List[int]) -> Dict[int, Decimal]:
+    """
+    Redeem the whole balance of several wiremen with one locking read, one UPDATE and one ledger insert.
+
+    Args:
+        db (Session): The database session.
+        wireman_ids (List[int]): The IDs of the wiremen.
+
+    Returns:
+        Dict[int, Decimal]: The points redeemed keyed by wireman ID; wiremen without a points record are omitted.
+    """
+    locked = lock_point_records(db, wireman_ids)
+    if not locked:
+        return {}
+    db.query(Point).filter(Point.wireman_id.in_(list(locked))).update({
+        Point.redeemed_points: Point.redeemed_points + Point.balance_points,
+        Point.balance_points: Decimal('0')
+    }, synchronize_session=False)
+    _record_transactions(db, [
+        {"wireman_id": wireman_id, "kind": REDEEM, "points": -balance_points}
+        for wireman_id, (balance_points, _) in locked.items() if balance_points
+    ])
+    return {wireman_id: balance_points for wireman_id, (balance_points, _) in locked.items()}
+
+
+def reset_points(db: Session, wireman_id: int) -> Optional[Decimal]:
+    """
+    Move a wireman's redeemed points back into the balance under a row lock.
+
+    The ledger keeps the original redemptions and records the reset as a positive 'redeem' entry.
+
+    Returns:
+        Optional[Decimal]: The redeemed points restored, or None if the wireman has no points record.
+    """
+    return reset_points_bulk(db, [wireman_id]).get(wireman_id)
+
+
+def reset_points_bulk(db: Session, wireman_ids: List[int]) -> Dict[int, Decimal]:
+    """
+    Move the redeemed points of several wiremen back into their balances, set-based like redeem_all_points_bulk.
+
+    Args:
+        db (Session): The database session.
+        wireman_ids (List[int]): The IDs of the wiremen.
+
+    Returns:
+        Dict[int, Decimal]: The redeemed points restored keyed by wireman ID; wiremen without a points record are omitted.
+    """
+    locked = lock_point_records(db, wireman_ids)
+    if not locked:
+        return {}
+    db.query(Point).filter(Point.wireman_id.in_(list(locked))).update({
+        Point.balance_points: Point.balance_points + Point.redeemed_points,
+        Point.redeemed_points: Decimal('0')
+    }, synchronize_session=False)
+    _record_transactions(db, [
+        {"wireman_id": wireman_id, "kind": REDEEM, "points": redeemed_points}
+        for wireman_id, (_, redeemed_points) in locked.items() if redeemed_points
+    ])
+    return {wireman_id: redeemed_points for wireman_id, (_, redeemed_points) in locked.items()}
+
+
+def close_accounts_bulk(db: Session, wireman_ids: List[int]) -> Dict[int, Decimal]:
+    """
+    Bring the ledger of wiremen about to be deleted to zero with reversing entries.
+
+    Per wireman, a 'reverse' entry cancels the bill points, an 'adjust' entry the rest of
+    the total and a 'redeem' entry the redeemed points; earlier entries are kept.
+    Does not touch the points snapshot; delete its rows in the same transaction.
+
+    Returns:
+        Dict[int, Decimal]: The balance each wireman had in the ledger, keyed by wireman ID.
+    """
+    ledger = _ledger_totals_query().where(PointTransaction.wireman_id.in_(wireman_ids))
+    transactions = []
+    balances = {}
+    for row in db.execute(ledger):
+        wireman_id, bill_points, total_points, redeemed_points, balance_points = \
+            row[0], *(Decimal(str(value)) for value in row[1:])
+        balances[wireman_id] = balance_points
+        for kind, points in ((REVERSE, -bill_points), (ADJUST, bill_points - total_points), (REDEEM, redeemed_points)):
+            if points:
+                transactions.append({"wireman_id": wireman_id, "kind": kind, "points": points})
+    _record_transactions(db, transactions)
+    return balances
+
+
+def _ledger_totals_query():
+    """Per-wireman ledger sums as (wireman_id, bill_points, total_points, redeemed_points, balance_points)."""
+    points = PointTransaction.points
+    return select(
+        PointTransaction.wireman_id.label("wireman_id"),
+        func.sum(case((PointTransaction.kind.in_([EARN, REVERSE]), points), else_=0)).label("bill_points"),
+        func.sum(case((PointTransaction.kind != REDEEM, points), else_=0)).label("total_points"),
+        func.sum(case((PointTransaction.kind == REDEEM, -points), else_=0)).label("redeemed_points"),
+        func.sum(points).label("balance_points")
+    ).group_by(PointTransaction.wireman_id)
+
+
+def rebuild_points_snapshot(db: Session) -> int:
+    """
+    Replace every points row with totals recomputed from the ledger in one set-based pass.
+
+    Does not commit; run it in its own transaction.
+
+    Returns:
+        int: The number of points rows written.
+    """
+    ledger = _ledger_totals_query().subquery()
+    db.execute(delete(Point))
+    # The ledger also holds the history of deleted wiremen, who get no points row.
+    result = db.execute(insert(Point).from_select(
+        ["wireman_id", "total_points", "redeemed_points", "balance_points"],
+        select(ledger.c.wireman_id, ledger.c.total_points, ledger.c.redeemed_points, ledger.c.balance_points).
+        join(Wireman, Wireman.id == ledger.c.wireman_id)
+    ))
+    return result.rowcount
+
+
+def reconcile_points(db: Session, wireman_ids: Optional[List[int]] = None) -> List[PointsDrift]:
+    """
+    Compare bill points, the ledger and the points snapshot for every wireman.
+
+    The ledger's 'earn' and 'reverse' entries must add up to the wireman's bills.points_earned,
+    and the snapshot's total, redeemed and balance must equal the ledger's.
+
+    Args:
+        db (Session): The database session.
+        wireman_ids (Optional[List[int]]): Only check these wiremen; every wireman if None.
+
+    Returns:
+        List[PointsDrift]: The wiremen whose figures disagree, by wireman ID.
+    """
+    bills = db.query(Bill.wireman_id, func.sum(Bill.points_earned).label("bill_points")). \
+        group_by(Bill.wireman_id).subquery()
+    ledger = _ledger_totals_query().subquery()
+    zero = Decimal('0')
+    rows = db.query(
+        Wireman.id,
+        func.coalesce(bills.c.bill_points, zero),
+        func.coalesce(ledger.c.bill_points, zero),
+        func.coalesce(ledger.c.total_points, zero),
+        func.coalesce(Point.total_points, zero),
+        func.coalesce(ledger.c.redeemed_points, zero),
+        func.coalesce(Point.redeemed_points, zero),
+        func.coalesce(ledger.c.balance_points, zero),
+        func.coalesce(Point.balance_points, zero)
+    ).outerjoin(bills, bills.c.wireman_id == Wireman.id). \
+        outerjoin(ledger, ledger.c.wireman_id == Wireman.id). \
+        outerjoin(Point, Point.wireman_id == Wireman.id). \
+        order_by(Wireman.id)
+    if wireman_ids is not None:
+        rows = rows.filter(Wireman.id.in_(wireman_ids))
+
+    drift = []
+    for row in rows:
+        report = PointsDrift(row[0], *(Decimal(str(value)) for value in row[1:]))
+        if (report.bill_points != report.ledger_bill_points
+                or report.ledger_total != report.snapshot_total
+                or report.ledger_redeemed != report.snapshot_redeemed
+                or report.ledger_balance != report.snapshot_balance):
+            drift.append(report)
+    return drift
+
+
+def main():
+    from database.connection import session_scope
+
+    parser = argparse.ArgumentParser(description="Reconcile or rebuild the points snapshot from the points ledger.")
+    parser.add_argument("command", choices=["reconcile", "rebuild"])
+    args = parser.parse_args()
+
+    with session_scope() as db:
+        if args.command == "rebuild":
+            rows_written = rebuild_points_snapshot(db)
+            db.commit()
+            print(f"Rebuilt {rows_written} points rows from the ledger.")
+            return
+
+        drift = reconcile_points(db)
+        if not drift:
+            print("Bills, ledger and points snapshot agree.")
+            return
+        print(f"{len(drift)} wiremen drifted:")
+        for report in drift:
+            print(f"  wireman {report.wireman_id}: bills {report.bill_points} / ledger {report.ledger_bill_points}; "
+                  f"total {report.ledger_total} / {report.snapshot_total}; "
+                  f"redeemed {report.ledger_redeemed} / {report.snapshot_redeemed}; "
+                  f"balance {report.ledger_balance} / {report.snapshot_balance} (ledger / snapshot)")
+
+
+if __name__ == "__main__":
+    main()
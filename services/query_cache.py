@@ -0,0 +1,205 @@
+# File: services/query_cache.py
+
+import inspect
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+# Cache namespaces shared by the cached reads and the writes that invalidate them.
+WIREMEN = "wiremen"
+LEADERBOARD = "leaderboard"
+WIREMEN_FILTER = "wiremen_filter"
+ANALYTICS = "analytics"
+RECEIVABLES = "receivables"
+
+# Leaderboard categories read from the points snapshot rather than from bills.
+POINTS_CATEGORIES = ("balance_points", "total_points")
+
+# Argument names of each namespace's cached function, recorded by @cached, so
+# invalidations can test entries by argument.
+_argument_names: Dict[str, Tuple[str, ...]] = {}
+
+
+class QueryCache:
+    """
+    Thread-safe read-through cache with a TTL and least-recently-used eviction.
+
+    Keys are (namespace, args) pairs, so writes can invalidate a whole namespace,
+    the entries whose leading arguments match, or the entries an argument test selects.
+
+    The cache belongs to one process. Writes made by another process, such as the API or
+    another Streamlit server, do not invalidate it; its entries then show the change
+    once they expire after ttl_seconds.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, tuple], Tuple[float, Any]]" = OrderedDict()
+        self._counters = Counter()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, tuple]) -> Tuple[bool, Any]:
+        """Return (found, value) for a key, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return True, value
+                del self._entries[key]
+                self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return False, None
+
+    def set(self, key: Tuple[str, tuple], value: Any):
+        """Store a value, evicting the least recently used entries beyond max_entries."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, namespace: str, *leading_args: Hashable) -> int:
+        """Drop the namespace's entries whose arguments start with leading_args; return how many."""
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if key[0] == namespace and key[1][:len(leading_args)] == leading_args
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._counters["invalidations"] += len(stale)
+            return len(stale)
+
+    def invalidate_where(self, namespace: str, predicate: Callable[[tuple], bool]) -> int:
+        """Drop the namespace's entries whose arguments satisfy predicate; return how many."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == namespace and predicate(key[1])]
+            for key in stale:
+                del self._entries[key]
+            self._counters["invalidations"] += len(stale)
+            return len(stale)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get hit/miss/eviction counters and the current number of entries."""
+        with self._lock:
+            total = self._counters["hits"] + self._counters["misses"]
+            return {
+                "hits": self._counters["hits"],
+                "misses": self._counters["misses"],
+                "hit_rate": self._counters["hits"] / total if total else 0.0,
+                "evictions": self._counters["evictions"],
+                "expirations": self._counters["expirations"],
+                "invalidations": self._counters["invalidations"],
+                "entries": len(self._entries),
+            }
+
+
+query_cache = QueryCache(
+    max_entries=int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "256")),
+    ttl_seconds=float(os.getenv("QUERY_CACHE_TTL_SECONDS", "60")),
+)
+
+
+def cached(namespace: str) -> Callable:
+    """
+    Memoize a read function whose first parameter is the database session.
+
+    The session is left out of the key; the remaining arguments, with defaults
+    applied, form the key in the given namespace. Cached values must not be ORM
+    instances bound to a session, so cached functions return plain rows.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        _argument_names[namespace] = tuple(signature.parameters)[1:]
+
+        @wraps(func)
+        def wrapper(db, *args, **kwargs):
+            bound = signature.bind(db, *args, **kwargs)
+            bound.apply_defaults()
+            key = (namespace, tuple(bound.arguments.values())[1:])
+            found, value = query_cache.get(key)
+            if not found:
+                value = func(db, *args, **kwargs)
+                query_cache.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(namespace: str, *leading_args: Hashable) -> int:
+    """Invalidate cached entries in a namespace, optionally only those matching leading arguments."""
+    return query_cache.invalidate(namespace, *leading_args)
+
+
+def _invalidate_matching(namespace: str, predicate: Callable[[dict], bool]) -> int:
+    """Invalidate the namespace's entries whose arguments, keyed by parameter name, satisfy predicate."""
+    names = _argument_names.get(namespace, ())
+    return query_cache.invalidate_where(namespace, lambda args: predicate(dict(zip(names, args))))
+
+
+def invalidate_bill_totals(bills: Optional[Iterable[Tuple[Optional[int], Optional[date]]]] = None) -> int:
+    """
+    Invalidate reads derived from bill totals and points, after bills are added, changed or removed.
+
+    Leaderboard and analytics entries are dropped only if their date range includes a
+    written bill's date, and analytics and receivables entries for one wireman only if
+    that wireman's bills were written. Points leaderboards and the filtered wiremen lists
+    are always dropped: any wireman's value can cross into or out of their ranges.
+
+    Args:
+        bills (Optional[Iterable[Tuple[Optional[int], Optional[date]]]]): The (wireman_id, date)
+            of every bill written, before and after the change; None invalidates every entry.
+
+    Returns:
+        int: The number of entries dropped.
+    """
+    if bills is None:
+        return invalidate(LEADERBOARD) + invalidate(WIREMEN_FILTER) + invalidate(ANALYTICS) + \
+            invalidate(RECEIVABLES)
+    bills = set(bills)
+    wireman_ids = {wireman_id for wireman_id, _ in bills}
+    days = {day for _, day in bills if day is not None}
+
+    def in_range(date_range) -> bool:
+        return date_range is None or any(date_range[0] <= day <= date_range[1] for day in days)
+
+    def for_wireman(wireman_id) -> bool:
+        return wireman_id is None or wireman_id in wireman_ids
+
+    return _invalidate_matching(LEADERBOARD, lambda args: args["category"] in POINTS_CATEGORIES or
+                                in_range(args["date_range"])) + \
+        invalidate(WIREMEN_FILTER) + \
+        _invalidate_matching(ANALYTICS, lambda args: for_wireman(args["wireman_id"]) and in_range(args["date_range"])) + \
+        _invalidate_matching(RECEIVABLES, lambda args: for_wireman(args["wireman_id"]))
+
+
+def invalidate_balance_points() -> int:
+    """Invalidate reads derived from balance points, after a redemption or reset."""
+    return invalidate(LEADERBOARD, "balance_points") + invalidate(WIREMEN_FILTER, "balance_points")
+
+
+def invalidate_wiremen() -> int:
+    """Invalidate every read that includes wireman details, after a wireman is renamed or deleted."""
+    return invalidate(WIREMEN) + invalidate(LEADERBOARD) + invalidate(WIREMEN_FILTER) + invalidate(ANALYTICS) + \
+        invalidate(RECEIVABLES)
+
+
+def get_cache_stats() -> dict:
+    """Get the query cache's hit/miss counters."""
+    return query_cache.stats()
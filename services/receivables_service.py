@@ -0,0 +1,230 @@
+# File: services/receivables_service.py
+
+import argparse
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, case, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from database.models import Bill, OUTSTANDING_STATUSES, PaymentStatus, Receivable, Wireman
+from database.instrumentation import instrumented
+from services import query_cache
+from services.query_cache import cached
+
+# (bill_count, not_paid_amount, partially_paid_amount) changes keyed by (wireman_id, client_name, day).
+ReceivableDeltas = Dict[Tuple[int, str, date], Tuple[int, Decimal, Decimal]]
+
+# (column label, minimum age in days) of each aging bucket, youngest first; a bucket ends where the next starts.
+AGING_BUCKETS = [("days_0_30", 0), ("days_31_60", 31), ("days_61_90", 61), ("days_over_90", 91)]
+
+GROUP_BY = {"wireman", "client"}
+
+
+def bill_deltas(bills: Iterable[dict], sign: int = 1) -> ReceivableDeltas:
+    """
+    Aggregate outstanding bills into receivable changes, skipping paid bills and bills without a wireman or date.
+
+    Args:
+        bills (Iterable[dict]): Bills with wireman_id, client_name, date, amount and payment_status.
+        sign (int): 1 to add the bills, -1 to remove them.
+
+    Returns:
+        ReceivableDeltas: The summed changes per (wireman_id, client_name, day).
+    """
+    totals = defaultdict(lambda: [0, Decimal('0'), Decimal('0')])
+    for bill in bills:
+        if bill["wireman_id"] is None or bill["date"] is None or bill["payment_status"] not in OUTSTANDING_STATUSES:
+            continue
+        entry = totals[(bill["wireman_id"], bill["client_name"] or "", bill["date"])]
+        entry[0] += sign
+        column = 1 if bill["payment_status"] == PaymentStatus.NOT_PAID.value else 2
+        entry[column] += sign * (bill["amount"] or Decimal('0'))
+    return {key: tuple(entry) for key, entry in totals.items()}
+
+
+def merge_deltas(*deltas: ReceivableDeltas) -> ReceivableDeltas:
+    """Sum several sets of receivable changes, so each (wireman_id, client_name, day) is written once."""
+    totals = defaultdict(lambda: [0, Decimal('0'), Decimal('0')])
+    for changes in deltas:
+        for key, (bill_count, not_paid_amount, partially_paid_amount) in changes.items():
+            entry = totals[key]
+            entry[0] += bill_count
+            entry[1] += not_paid_amount
+            entry[2] += partially_paid_amount
+    return {key: tuple(entry) for key, entry in totals.items()}
+
+
+def apply_deltas(db: Session, deltas: ReceivableDeltas):
+    """
+    Add receivable changes with one multi-row INSERT ... ON CONFLICT DO UPDATE, then drop
+    the rows left without bills, so the table only holds what is still to be collected.
+
+    Does not commit; call it in the same transaction as the bill write it mirrors.
+    """
+    values = [
+        {
+            "wireman_id": wireman_id,
+            "client_name": client_name,
+            "day": day,
+            "bill_count": bill_count,
+            "not_paid_amount": not_paid_amount,
+            "partially_paid_amount": partially_paid_amount
+        } for (wireman_id, client_name, day), (bill_count, not_paid_amount, partially_paid_amount)
+        in sorted(deltas.items())
+        if bill_count or not_paid_amount or partially_paid_amount
+    ]
+    if not values:
+        return
+    dialect_insert = sqlite.insert if db.bind.dialect.name == "sqlite" else postgresql.insert
+    statement = dialect_insert(Receivable).values(values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Receivable.wireman_id, Receivable.client_name, Receivable.day],
+        set_={
+            "bill_count": Receivable.bill_count + statement.excluded.bill_count,
+            "not_paid_amount": Receivable.not_paid_amount + statement.excluded.not_paid_amount,
+            "partially_paid_amount": Receivable.partially_paid_amount + statement.excluded.partially_paid_amount,
+        }
+    )
+    db.execute(statement)
+
+    if any(value["bill_count"] < 0 for value in values):
+        db.execute(delete(Receivable).where(
+            Receivable.wireman_id.in_({value["wireman_id"] for value in values}),
+            Receivable.bill_count <= 0
+        ))
+
+
+def add_bill(db: Session, bill: dict, sign: int = 1):
+    """Add (or, with sign=-1, remove) a single bill's outstanding amount in the receivables."""
+    apply_deltas(db, bill_deltas([bill], sign))
+
+
+def rebuild_receivables(db: Session) -> int:
+    """
+    Rebuild the whole receivables table from the outstanding bills in one set-based pass.
+
+    Does not commit; run it in its own transaction.
+
+    Returns:
+        int: The number of receivable rows written.
+    """
+    db.execute(delete(Receivable))
+    client_name = func.coalesce(Bill.client_name, "")
+    result = db.execute(insert(Receivable).from_select(
+        ["wireman_id", "client_name", "day", "bill_count", "not_paid_amount", "partially_paid_amount"],
+        select(
+            Bill.wireman_id,
+            client_name,
+            Bill.date,
+            func.count(Bill.id),
+            func.coalesce(func.sum(case((Bill.payment_status == PaymentStatus.NOT_PAID.value, Bill.amount))), 0),
+            func.coalesce(func.sum(case((Bill.payment_status == PaymentStatus.PARTIALLY_PAID.value, Bill.amount))), 0)
+        ).where(
+            Bill.wireman_id.isnot(None), Bill.date.isnot(None), Bill.payment_status != PaymentStatus.PAID.value
+        ).group_by(Bill.wireman_id, client_name, Bill.date)
+    ))
+    return result.rowcount
+
+
+@instrumented
+@cached(query_cache.RECEIVABLES)
+def get_receivables(db: Session, as_of: date, group_by: str = "wireman", wireman_id: Optional[int] = None,
+                    limit: Optional[int] = None) -> List[Row]:
+    """
+    Get outstanding bill amounts per wireman or client, split into aging buckets.
+
+    Reads only the receivables table. Partially paid bills count at their full amount,
+    since the amount already received is not recorded.
+
+    Args:
+        db (Session): The database session.
+        as_of (date): The day bill ages are counted to; bills dated later count as 0 days old.
+        group_by (str): 'wireman' or 'client'.
+        wireman_id (Optional[int]): Restrict to one wireman's bills; all wiremen if None.
+        limit (Optional[int]): Maximum number of rows, largest outstanding amount first.
+
+    Returns:
+        List[Row]: (wireman_id, name) or (client_name,), then bill_count, not_paid_amount,
+            partially_paid_amount, outstanding_amount and one column per AGING_BUCKETS label.
+
+    Raises:
+        ValueError: If group_by is not 'wireman' or 'client'.
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {', '.join(sorted(GROUP_BY))}.")
+    outstanding = Receivable.not_paid_amount + Receivable.partially_paid_amount
+
+    # Bucket by the bill day against cut-off dates: the youngest bucket has no upper bound
+    # on the day (future bills) and the oldest no lower bound.
+    buckets = []
+    for index, (label, min_age) in enumerate(AGING_BUCKETS):
+        conditions = []
+        if min_age:
+            conditions.append(Receivable.day <= as_of - timedelta(days=min_age))
+        if index + 1 < len(AGING_BUCKETS):
+            conditions.append(Receivable.day > as_of - timedelta(days=AGING_BUCKETS[index + 1][1]))
+        buckets.append(func.coalesce(func.sum(case((and_(*conditions), outstanding), else_=0)), 0).label(label))
+
+    totals = [
+        func.sum(Receivable.bill_count).label("bill_count"),
+        func.sum(Receivable.not_paid_amount).label("not_paid_amount"),
+        func.sum(Receivable.partially_paid_amount).label("partially_paid_amount"),
+        func.sum(outstanding).label("outstanding_amount"),
+    ]
+    key = Receivable.wireman_id if group_by == "wireman" else Receivable.client_name
+    query = db.query(key, *totals, *buckets).group_by(key)
+    if wireman_id is not None:
+        query = query.filter(Receivable.wireman_id == wireman_id)
+    query = query.order_by(func.sum(outstanding).desc())
+    if limit:
+        query = query.limit(limit)
+    if group_by == "client":
+        return query.all()
+
+    # Join the names after aggregating, so the join runs once per wireman rather than per row.
+    aging = query.subquery()
+    return db.query(aging.c.wireman_id, Wireman.name, *[column for column in aging.c if column.key != "wireman_id"]). \
+        join(Wireman, Wireman.id == aging.c.wireman_id). \
+        order_by(aging.c.outstanding_amount.desc()).all()
+
+
+@instrumented
+def get_outstanding_bills(db: Session, wireman_id: int, client_name: Optional[str] = None,
+                          limit: int = 200) -> List[Row]:
+    """
+    Get a wireman's outstanding bills, oldest first, through the partial index on unpaid bills.
+
+    Args:
+        db (Session): The database session.
+        wireman_id (int): The wireman's ID.
+        client_name (Optional[str]): Only this client's bills ('' for bills without a client name).
+        limit (int): Maximum number of bills.
+
+    Returns:
+        List[Row]: (id, client_name, amount, date, payment_status) rows.
+    """
+    query = db.query(Bill.id, Bill.client_name, Bill.amount, Bill.date, Bill.payment_status). \
+        filter(Bill.wireman_id == wireman_id, Bill.payment_status != PaymentStatus.PAID.value)
+    if client_name is not None:
+        query = query.filter(func.coalesce(Bill.client_name, "") == client_name)
+    return query.order_by(Bill.date, Bill.id).limit(limit).all()
+
+
+def main():
+    from database.connection import session_scope
+
+    parser = argparse.ArgumentParser(description="Rebuild the receivables table from the outstanding bills.")
+    parser.parse_args()
+
+    with session_scope() as db:
+        rows_written = rebuild_receivables(db)
+        db.commit()
+    query_cache.invalidate(query_cache.RECEIVABLES)
+    print(f"Rebuilt {rows_written} receivable rows.")
+
+
+if __name__ == "__main__":
+    main()
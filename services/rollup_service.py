@@ -0,0 +1,199 @@
+# File: services/rollup_service.py
+
+import argparse
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from database.models import Bill, BillDailyRollup
+
+# (bill_count, amount_sum, points_sum) changes keyed by (wireman_id, day).
+RollupDeltas = Dict[Tuple[int, date], Tuple[int, Decimal, Decimal]]
+
+
+def bill_deltas(bills: Iterable[dict], sign: int = 1) -> RollupDeltas:
+    """
+    Aggregate bills into rollup changes, skipping bills without a wireman or date.
+
+    Args:
+        bills (Iterable[dict]): Bills with wireman_id, date, amount and points_earned.
+        sign (int): 1 to add the bills, -1 to remove them.
+
+    Returns:
+        RollupDeltas: The summed changes per (wireman_id, day).
+    """
+    totals = defaultdict(lambda: [0, Decimal('0'), Decimal('0')])
+    for bill in bills:
+        if bill["wireman_id"] is None or bill["date"] is None:
+            continue
+        entry = totals[(bill["wireman_id"], bill["date"])]
+        entry[0] += sign
+        entry[1] += sign * (bill["amount"] or Decimal('0'))
+        entry[2] += sign * (bill["points_earned"] or Decimal('0'))
+    return {key: tuple(entry) for key, entry in totals.items()}
+
+
+def merge_deltas(*deltas: RollupDeltas) -> RollupDeltas:
+    """Sum several sets of rollup changes, so each (wireman_id, day) is written once."""
+    totals = defaultdict(lambda: [0, Decimal('0'), Decimal('0')])
+    for changes in deltas:
+        for key, (bill_count, amount_sum, points_sum) in changes.items():
+            entry = totals[key]
+            entry[0] += bill_count
+            entry[1] += amount_sum
+            entry[2] += points_sum
+    return {key: tuple(entry) for key, entry in totals.items()}
+
+
+def apply_deltas(db: Session, deltas: RollupDeltas):
+    """
+    Add rollup changes with one multi-row INSERT ... ON CONFLICT (wireman_id, day) DO UPDATE.
+
+    Does not commit; call it in the same transaction as the bill write it mirrors.
+    """
+    values = [
+        {
+            "wireman_id": wireman_id,
+            "day": day,
+            "bill_count": bill_count,
+            "amount_sum": amount_sum,
+            "points_sum": points_sum
+        } for (wireman_id, day), (bill_count, amount_sum, points_sum) in sorted(deltas.items())
+        if bill_count or amount_sum or points_sum
+    ]
+    if not values:
+        return
+    dialect_insert = sqlite.insert if db.bind.dialect.name == "sqlite" else postgresql.insert
+    statement = dialect_insert(BillDailyRollup).values(values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[BillDailyRollup.wireman_id, BillDailyRollup.day],
+        set_={
+            "bill_count": BillDailyRollup.bill_count + statement.excluded.bill_count,
+            "amount_sum": BillDailyRollup.amount_sum + statement.excluded.amount_sum,
+            "points_sum": BillDailyRollup.points_sum + statement.excluded.points_sum,
+        }
+    )
+    db.execute(statement)
+
+
+def add_bill(db: Session, bill: dict, sign: int = 1):
+    """Add (or, with sign=-1, remove) a single bill's totals in the rollup."""
+    apply_deltas(db, bill_deltas([bill], sign))
+
+
+def rebuild_rollups(db: Session) -> int:
+    """
+    Rebuild the whole rollup table from bills in one set-based pass.
+
+    Does not commit; run it in its own transaction.
+
+    Returns:
+        int: The number of rollup rows written.
+    """
+    db.execute(delete(BillDailyRollup))
+    result = db.execute(insert(BillDailyRollup).from_select(
+        ["wireman_id", "day", "bill_count", "amount_sum", "points_sum"],
+        select(
+            Bill.wireman_id,
+            Bill.date,
+            func.count(Bill.id),
+            func.coalesce(func.sum(Bill.amount), 0),
+            func.coalesce(func.sum(Bill.points_earned), 0)
+        ).where(Bill.wireman_id.isnot(None), Bill.date.isnot(None)).
+        group_by(Bill.wireman_id, Bill.date)
+    ))
+    return result.rowcount
+
+
+def _window_filter(query, date_range: Optional[tuple]):
+    """Restrict a rollup query to an inclusive (start, end) day range."""
+    if date_range:
+        query = query.filter(BillDailyRollup.day.between(date_range[0], date_range[1]))
+    return query
+
+
+def wireman_totals_query(db: Session, date_range: Optional[tuple] = None, wireman_ids: Optional[List[int]] = None):
+    """
+    Build a per-wireman totals query over the rollup.
+
+    Returns a query of (wireman_id, bill_count, amount_sum, points_sum, latest_day) for the
+    wiremen with at least one bill in the window; use .subquery() to join it.
+    """
+    query = db.query(
+        BillDailyRollup.wireman_id.label("wireman_id"),
+        func.sum(BillDailyRollup.bill_count).label("bill_count"),
+        func.sum(BillDailyRollup.amount_sum).label("amount_sum"),
+        func.sum(BillDailyRollup.points_sum).label("points_sum"),
+        func.max(case((BillDailyRollup.bill_count > 0, BillDailyRollup.day))).label("latest_day")
+    )
+    if wireman_ids is not None:
+        query = query.filter(BillDailyRollup.wireman_id.in_(wireman_ids))
+    return _window_filter(query, date_range). \
+        group_by(BillDailyRollup.wireman_id). \
+        having(func.sum(BillDailyRollup.bill_count) > 0)
+
+
+def get_daily_totals(db: Session, wireman_id: Optional[int] = None, date_range: Optional[tuple] = None) -> List[Row]:
+    """
+    Get bill totals per day, for trend charts.
+
+    Args:
+        db (Session): The database session.
+        wireman_id (Optional[int]): Restrict to one wireman; all wiremen if None.
+        date_range (Optional[tuple]): Inclusive (start, end) dates.
+
+    Returns:
+        List[Row]: (day, bill_count, amount_sum, points_sum) rows in day order.
+    """
+    query = db.query(
+        BillDailyRollup.day,
+        func.sum(BillDailyRollup.bill_count).label("bill_count"),
+        func.sum(BillDailyRollup.amount_sum).label("amount_sum"),
+        func.sum(BillDailyRollup.points_sum).label("points_sum")
+    )
+    if wireman_id is not None:
+        query = query.filter(BillDailyRollup.wireman_id == wireman_id)
+    return _window_filter(query, date_range). \
+        group_by(BillDailyRollup.day). \
+        having(func.sum(BillDailyRollup.bill_count) > 0). \
+        order_by(BillDailyRollup.day).all()
+
+
+def get_monthly_totals(db: Session, wireman_id: Optional[int] = None,
+                       date_range: Optional[tuple] = None) -> List[Tuple[date, int, Decimal, Decimal]]:
+    """
+    Get bill totals per calendar month, folded from the daily totals.
+
+    Returns:
+        List[Tuple[date, int, Decimal, Decimal]]: (first day of month, bill_count, amount_sum, points_sum).
+    """
+    months = {}
+    for row in get_daily_totals(db, wireman_id, date_range):
+        month = row.day.replace(day=1)
+        bill_count, amount_sum, points_sum = months.get(month, (0, Decimal('0'), Decimal('0')))
+        months[month] = (
+            bill_count + row.bill_count,
+            amount_sum + Decimal(str(row.amount_sum)),
+            points_sum + Decimal(str(row.points_sum))
+        )
+    return [(month, *totals) for month, totals in months.items()]
+
+
+def main():
+    from database.connection import session_scope
+
+    parser = argparse.ArgumentParser(description="Rebuild the daily bill rollup table from bills.")
+    parser.parse_args()
+
+    with session_scope() as db:
+        rows_written = rebuild_rollups(db)
+        db.commit()
+    print(f"Rebuilt {rows_written} daily rollup rows.")
+
+
+if __name__ == "__main__":
+    main()
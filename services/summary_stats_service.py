@@ -0,0 +1,45 @@
+# File: services/summary_stats_service.py
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from database.models import Wireman, Bill
+from database.instrumentation import instrumented
+from decimal import Decimal
+from typing import NamedTuple
+
+
+class SummaryStats(NamedTuple):
+    """Application-wide totals shown on the home and bill records pages."""
+    total_wiremen: int
+    total_bills: int
+    total_business: Decimal
+
+
+@instrumented
+def get_summary_stats(db: Session) -> SummaryStats:
+    """
+    Get the wiremen count, bill count and total business in a single round trip.
+
+    Args:
+        db (Session): The database session.
+
+    Returns:
+        SummaryStats: The aggregated totals.
+    """
+    total_wiremen = select(func.count(Wireman.id)).scalar_subquery()
+    row = db.query(
+        total_wiremen.label("total_wiremen"),
+        func.count(Bill.id).label("total_bills"),
+        func.coalesce(func.sum(Bill.amount), 0).label("total_business")
+    ).select_from(Bill).one()
+
+    return SummaryStats(
+        total_wiremen=row.total_wiremen or 0,
+        total_bills=row.total_bills,
+        total_business=Decimal(str(row.total_business))
+    )
+
+
+def get_total_bill_amount(db: Session) -> Decimal:
+    """Get the total bill amount from all wiremen combined."""
+    return get_summary_stats(db).total_business
@@ -1,13 +1,23 @@
 # File: services/wireman_management_services.py
 
 from sqlalchemy.orm import Session
-from database.models import Wireman, Bill, Point
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import Wireman, Bill, BillDailyRollup, Point, Receivable
+from database.instrumentation import instrumented
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import date
 from decimal import Decimal
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, NamedTuple
 from sqlalchemy import func
+from sqlalchemy.engine import Row
+from services import points_service, query_cache, rollup_service
+from services.query_cache import cached
 
+# Leaderboard categories aggregated from bills; the others read the points snapshot.
+BILL_CATEGORIES = ('total_bill_amount', 'number_of_bills')
+
+
+@instrumented
 def register_new_wireman(db: Session, name: str, contact_info: str) -> tuple[bool, str]:
     """Register a new wireman."""
     if not name:
@@ -17,111 +27,155 @@ def register_new_wireman(db: Session, name: str, contact_info: str) -> tuple[boo
         new_wireman = Wireman(name=name, contact_info=contact_info, date_registered=date.today())
         db.add(new_wireman)
         db.commit()
+        query_cache.invalidate(query_cache.WIREMEN)
         return True, f"Wireman {name} registered successfully!"
     except SQLAlchemyError as e:
         db.rollback()
         return False, f"An error occurred while registering the wireman: {str(e)}"
 
 
-def fetch_all_wiremen(db: Session) -> list[Wireman]:
-    """Fetch all wiremen from the database."""
-    return db.query(Wireman).all()
-
-
-def get_wireman_dashboard_data(db: Session, wireman_id: int) -> dict:
-    """Get dashboard data for a wireman."""
-    total_bills = db.query(Bill).filter(Bill.wireman_id == wireman_id).count()
-    total_business = calculate_total_business(db, wireman_id)
-    latest_bill = get_latest_bill(db, wireman_id)
-    total_points = calculate_total_points(db, wireman_id)
-    point_record = get_point_record(db, wireman_id)
-    balance_points = point_record.balance_points if point_record else Decimal('0')
-
-    return {
-        "total_bills": total_bills,
-        "total_business": total_business,
-        "latest_bill_date": latest_bill.date if latest_bill else None,
-        "total_points": total_points,
-        "balance_points": balance_points
-    }
-
-
-def calculate_total_business(db: Session, wireman_id: int) -> Decimal:
-    """Calculate total business generated by a wireman."""
-    total_business = db.query(Bill.amount).filter(Bill.wireman_id == wireman_id).all()
-    return sum((amount for (amount,) in total_business), Decimal('0'))
+@instrumented
+@cached(query_cache.WIREMEN)
+def fetch_all_wiremen(db: Session) -> List[Row]:
+    """Fetch all wiremen from the database as (id, name, contact_info, date_registered) rows."""
+    return db.query(Wireman.id, Wireman.name, Wireman.contact_info, Wireman.date_registered). \
+        order_by(Wireman.name, Wireman.id).all()
+
+
+class WiremanDashboard(NamedTuple):
+    """Aggregated dashboard figures for a single wireman."""
+    wireman_id: int
+    total_bills: int
+    total_business: Decimal
+    latest_bill_date: Optional[date]
+    total_points: Decimal
+    balance_points: Decimal
+
+
+def _dashboard_query(db: Session, wireman_ids: List[int]):
+    """Build the dashboard query for the given wiremen over the daily bill rollup."""
+    bill_totals = rollup_service.wireman_totals_query(db, wireman_ids=wireman_ids).subquery()
+
+    return db.query(
+        Wireman.id.label("wireman_id"),
+        func.coalesce(bill_totals.c.bill_count, 0).label("total_bills"),
+        func.coalesce(bill_totals.c.amount_sum, 0).label("total_business"),
+        bill_totals.c.latest_day.label("latest_bill_date"),
+        func.coalesce(Point.total_points, 0).label("total_points"),
+        func.coalesce(Point.balance_points, 0).label("balance_points")
+    ).outerjoin(bill_totals, bill_totals.c.wireman_id == Wireman.id). \
+        outerjoin(Point, Point.wireman_id == Wireman.id). \
+        filter(Wireman.id.in_(wireman_ids))
+
+
+def _to_dashboard(row) -> WiremanDashboard:
+    """Convert a dashboard query row into a WiremanDashboard."""
+    return WiremanDashboard(
+        wireman_id=row.wireman_id,
+        total_bills=row.total_bills,
+        total_business=Decimal(str(row.total_business)),
+        latest_bill_date=row.latest_bill_date,
+        total_points=Decimal(str(row.total_points)),
+        balance_points=Decimal(str(row.balance_points))
+    )
+
+
+def get_wireman_dashboard_data(db: Session, wireman_id: int) -> WiremanDashboard:
+    """
+    Get dashboard data for a wireman in a single query.
 
+    Args:
+        db (Session): The database session.
+        wireman_id (int): The ID of the wireman.
 
-def get_latest_bill(db: Session, wireman_id: int) -> Optional[Bill]:
-    """Get the latest bill for a wireman."""
-    return db.query(Bill).filter(Bill.wireman_id == wireman_id).order_by(Bill.date.desc()).first()
+    Returns:
+        WiremanDashboard: Bill count, total business, latest bill date and points.
+    """
+    dashboards = get_wiremen_dashboard_data(db, [wireman_id])
+    return dashboards.get(wireman_id, WiremanDashboard(
+        wireman_id=wireman_id,
+        total_bills=0,
+        total_business=Decimal('0'),
+        latest_bill_date=None,
+        total_points=Decimal('0'),
+        balance_points=Decimal('0')
+    ))
+
+
+@instrumented
+def get_wiremen_dashboard_data(db: Session, wireman_ids: List[int]) -> Dict[int, WiremanDashboard]:
+    """
+    Get dashboard data for several wiremen in one statement.
 
+    Args:
+        db (Session): The database session.
+        wireman_ids (List[int]): The IDs of the wiremen.
 
-def calculate_total_points(db: Session, wireman_id: int) -> Decimal:
-    """Calculate total points earned by a wireman."""
-    point_record = get_point_record(db, wireman_id)
-    return point_record.total_points if point_record else Decimal('0')
+    Returns:
+        Dict[int, WiremanDashboard]: Dashboard data keyed by wireman ID. Unknown IDs are omitted.
+    """
+    if not wireman_ids:
+        return {}
+    return {row.wireman_id: _to_dashboard(row) for row in _dashboard_query(db, list(wireman_ids))}
 
 
+@instrumented
 def get_point_record(db: Session, wireman_id: int) -> Optional[Point]:
     """Get the point record for a wireman."""
     return db.query(Point).filter(Point.wireman_id == wireman_id).first()
 
 
+@instrumented
 def redeem_all_points(db: Session, wireman_id: int) -> tuple[bool, str]:
     """Redeem all points for a wireman."""
-    point_record = get_point_record(db, wireman_id)
-    if not point_record:
-        return False, "No points record found for this wireman."
-
     try:
-        point_record.redeemed_points += point_record.balance_points
-        point_record.balance_points = Decimal('0')
+        redeemed = points_service.redeem_all_points(db, wireman_id)
+        if redeemed is None:
+            db.rollback()
+            return False, "No points record found for this wireman."
         db.commit()
+        query_cache.invalidate_balance_points()
         return True, "All points redeemed successfully!"
     except SQLAlchemyError as e:
         db.rollback()
         return False, f"An error occurred while redeeming points: {str(e)}"
 
 
+@instrumented
 def redeem_specific_points(db: Session, wireman_id: int, points_to_redeem: Decimal) -> tuple[bool, str]:
     """Redeem a specific amount of points for a wireman."""
-    point_record = get_point_record(db, wireman_id)
-    if not point_record:
-        return False, "No points record found for this wireman."
-
-    if points_to_redeem > point_record.balance_points:
-        return False, "Not enough points to redeem."
-
     try:
-        point_record.redeemed_points += points_to_redeem
-        point_record.balance_points -= points_to_redeem
+        success, error_message = points_service.redeem_points(db, wireman_id, points_to_redeem)
+        if not success:
+            db.rollback()
+            return False, error_message
         db.commit()
+        query_cache.invalidate_balance_points()
         return True, f"{points_to_redeem} points redeemed successfully!"
     except SQLAlchemyError as e:
         db.rollback()
         return False, f"An error occurred while redeeming points: {str(e)}"
 
 
+@instrumented
 def reset_points(db: Session, wireman_id: int) -> tuple[bool, str]:
     """Reset all points for a wireman."""
-    point_record = get_point_record(db, wireman_id)
-    if not point_record:
-        return False, "No points record found for this wireman."
-
     try:
-        total_points = point_record.redeemed_points + point_record.balance_points
-        point_record.redeemed_points = Decimal('0')
-        point_record.balance_points = total_points
+        restored = points_service.reset_points(db, wireman_id)
+        if restored is None:
+            db.rollback()
+            return False, "No points record found for this wireman."
         db.commit()
+        query_cache.invalidate_balance_points()
         return True, "Points reset successfully!"
     except SQLAlchemyError as e:
         db.rollback()
         return False, f"An error occurred while resetting points: {str(e)}"
 
 
-def get_wiremen_with_points_or_bills(db: Session, filter_by: str, min_value: float, max_value: float) -> List[
-    Tuple[Wireman, float]]:
+@instrumented
+@cached(query_cache.WIREMEN_FILTER)
+def get_wiremen_with_points_or_bills(db: Session, filter_by: str, min_value: float, max_value: float) -> List[Row]:
     """
     Get wiremen that have balance points or total bill amount within a specified range.
 
@@ -132,54 +186,101 @@ def get_wiremen_with_points_or_bills(db: Session, filter_by: str, min_value: flo
         max_value (float): Maximum value for the filter.
 
     Returns:
-        List[Tuple[Wireman, float]]: List of tuples containing Wireman and the filtered value.
+        List[Row]: (id, name, value) rows for the matching wiremen.
     """
+    return _wiremen_filter_query(db, filter_by, min_value, max_value).all()
+
+
+def _wiremen_filter_query(db: Session, filter_by: str, min_value: float, max_value: float):
+    """Build the uncached query of get_wiremen_with_points_or_bills."""
     if filter_by == 'balance_points':
-        query = db.query(Wireman, Point.balance_points.label('value')). \
+        query = db.query(Wireman.id, Wireman.name, Point.balance_points.label('value')). \
             join(Point, Wireman.id == Point.wireman_id). \
             filter(Point.balance_points.between(min_value, max_value))
     else:  # total_bill_amount
-        query = db.query(Wireman, func.sum(Bill.amount).label('value')). \
-            join(Bill, Wireman.id == Bill.wireman_id). \
-            group_by(Wireman.id). \
-            having(func.sum(Bill.amount).between(min_value, max_value))
+        bill_totals = rollup_service.wireman_totals_query(db).subquery()
+        query = db.query(Wireman.id, Wireman.name, bill_totals.c.amount_sum.label('value')). \
+            join(bill_totals, Wireman.id == bill_totals.c.wireman_id). \
+            filter(bill_totals.c.amount_sum.between(min_value, max_value))
+    return query
+
+
+def _leaderboard_values(db: Session, category: str, date_range: Optional[tuple], payment_status: Optional[str]):
+    """Get the (wireman_id column, value column, selectable) a leaderboard category ranks."""
+    if category in BILL_CATEGORIES and payment_status:
+        # The rollup has no payment status, so a status filter aggregates the bills themselves.
+        query = db.query(
+            Bill.wireman_id.label("wireman_id"),
+            func.sum(Bill.amount).label("amount_sum"),
+            func.count(Bill.id).label("bill_count")
+        ).filter(Bill.payment_status == payment_status)
+        if date_range:
+            query = query.filter(Bill.date.between(date_range[0], date_range[1]))
+        bill_totals = query.group_by(Bill.wireman_id).subquery()
+    elif category in BILL_CATEGORIES:
+        bill_totals = rollup_service.wireman_totals_query(db, date_range).subquery()
+    elif category == 'balance_points':
+        return Point.wireman_id, Point.balance_points, Point
+    else:  # total_points
+        return Point.wireman_id, Point.total_points, Point
 
-    return query.all()
+    value = bill_totals.c.amount_sum if category == 'total_bill_amount' else bill_totals.c.bill_count
+    return bill_totals.c.wireman_id, value, bill_totals
 
 
-def get_leaderboard(db: Session, category: str) -> List[Tuple[Wireman, float]]:
+def _leaderboard_query(db: Session, category: str, date_range: Optional[tuple] = None,
+                       payment_status: Optional[str] = None, dense: bool = False):
     """
-    Get leaderboard based on the selected category.
+    Build the ranked leaderboard query for the selected category.
+
+    Bill categories read the daily rollup, so a date window only narrows the days summed;
+    with a payment status they fall back to grouping the matching bills. Points categories
+    read the points snapshot and ignore the window and payment status.
+
+    Ranks are computed by RANK() (or DENSE_RANK()) over the value, so ties share a rank
+    and LIMIT/OFFSET can be applied in SQL without changing anyone's rank.
+    """
+    wireman_id, value, source = _leaderboard_values(db, category, date_range, payment_status)
+    rank_function = func.dense_rank() if dense else func.rank()
+    return db.query(
+        rank_function.over(order_by=value.desc()).label('rank'),
+        Wireman.id.label('wireman_id'),
+        Wireman.name,
+        value.label('value')
+    ).select_from(source). \
+        join(Wireman, Wireman.id == wireman_id). \
+        order_by(value.desc(), Wireman.id)
+
+
+@instrumented
+@cached(query_cache.LEADERBOARD)
+def get_leaderboard(db: Session, category: str, date_range: Optional[tuple] = None,
+                    payment_status: Optional[str] = None, limit: Optional[int] = None,
+                    offset: int = 0, dense: bool = False) -> List[Row]:
+    """
+    Get a page of the leaderboard for the selected category.
 
     Args:
         db (Session): The database session.
         category (str): 'total_bill_amount', 'number_of_bills', 'balance_points', or 'total_points'
+        date_range (Optional[tuple]): Inclusive (start, end) dates for the bill categories; all time if None.
+        payment_status (Optional[str]): Only count bills with this payment status (bill categories only).
+        limit (Optional[int]): Maximum number of rows; all rows if None.
+        offset (int): Number of top rows to skip.
+        dense (bool): Use DENSE_RANK() instead of RANK(), so ranks after a tie have no gaps.
 
     Returns:
-        List[Tuple[Wireman, float]]: List of tuples containing Wireman and the category value, sorted in descending order.
-    """
-    if category == 'total_bill_amount':
-        query = db.query(Wireman, func.sum(Bill.amount).label('value')). \
-            join(Bill, Wireman.id == Bill.wireman_id). \
-            group_by(Wireman.id). \
-            order_by(func.sum(Bill.amount).desc())
-    elif category == 'number_of_bills':
-        query = db.query(Wireman, func.count(Bill.id).label('value')). \
-            join(Bill, Wireman.id == Bill.wireman_id). \
-            group_by(Wireman.id). \
-            order_by(func.count(Bill.id).desc())
-    elif category == 'balance_points':
-        query = db.query(Wireman, Point.balance_points.label('value')). \
-            join(Point, Wireman.id == Point.wireman_id). \
-            order_by(Point.balance_points.desc())
-    else:  # total_points
-        query = db.query(Wireman, Point.total_points.label('value')). \
-            join(Point, Wireman.id == Point.wireman_id). \
-            order_by(Point.total_points.desc())
-
+        List[Row]: (rank, wireman_id, name, value) rows, sorted by value in descending order.
+    """
+    query = _leaderboard_query(db, category, date_range, payment_status, dense)
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
     return query.all()
 
 
+@instrumented
 def update_wireman(db: Session, wireman_id: int, name: str, contact_info: str) -> Tuple[bool, str]:
     """Update a wireman's details."""
     try:
@@ -190,31 +291,197 @@ def update_wireman(db: Session, wireman_id: int, name: str, contact_info: str) -
         wireman.name = name
         wireman.contact_info = contact_info
         db.commit()
+        query_cache.invalidate_wiremen()
         return True, f"Wireman {name} updated successfully!"
     except SQLAlchemyError as e:
         db.rollback()
         return False, f"An error occurred while updating the wireman: {str(e)}"
 
 
+@instrumented
 def delete_wireman(db: Session, wireman_id: int) -> Tuple[bool, str]:
     """Delete a wireman and associated records."""
-    try:
-        wireman = db.query(Wireman).filter(Wireman.id == wireman_id).first()
-        if not wireman:
-            return False, "Wireman not found."
+    outcome = delete_wiremen_bulk(db, [wireman_id])[0]
+    return outcome.success, outcome.message
 
-        # Delete associated bills and points
-        db.query(Bill).filter(Bill.wireman_id == wireman_id).delete()
-        db.query(Point).filter(Point.wireman_id == wireman_id).delete()
 
-        db.delete(wireman)
+class BulkOutcome(NamedTuple):
+    """The result of a bulk operation for one wireman."""
+    wireman_id: int
+    success: bool
+    message: str
+
+
+def _bulk_wireman_ids(db: Session, wireman_ids: Optional[List[int]],
+                      wireman_filter: Optional[Tuple[str, float, float]]) -> List[int]:
+    """
+    Get the distinct target IDs of a bulk operation from an ID list or a wiremen list filter.
+
+    A filter bypasses the query cache and runs in the caller's transaction: the candidates'
+    points rows are locked, then the filter is evaluated again over them, so the bulk
+    operation acts on the wiremen matching it now, and bill writes and redemptions for
+    them wait until it commits.
+    """
+    if wireman_filter is None:
+        return sorted(set(wireman_ids or []))
+    candidate_ids = [row.id for row in _wiremen_filter_query(db, *wireman_filter)]
+    if not candidate_ids:
+        return []
+    points_service.lock_point_records(db, candidate_ids)
+    return [row.id for row in _wiremen_filter_query(db, *wireman_filter).
+            filter(Wireman.id.in_(candidate_ids)).order_by(Wireman.id)]
+
+
+def _bulk_points_operation(db: Session, operation, wireman_ids: Optional[List[int]],
+                           wireman_filter: Optional[Tuple[str, float, float]], done_message: str,
+                           error_message: str) -> List[BulkOutcome]:
+    """Run a bulk points_service operation in one transaction and report an outcome per wireman."""
+    target_ids = sorted(set(wireman_ids or []))
+    try:
+        target_ids = _bulk_wireman_ids(db, wireman_ids, wireman_filter)
+        if not target_ids:
+            db.rollback()
+            return []
+        points_by_id = operation(db, target_ids)
         db.commit()
-        return True, f"Wireman {wireman.name} and associated records deleted successfully!"
+        query_cache.invalidate_balance_points()
     except SQLAlchemyError as e:
         db.rollback()
-        return False, f"An error occurred while deleting the wireman: {str(e)}"
+        return [BulkOutcome(wireman_id, False, f"{error_message}: {str(e)}") for wireman_id in target_ids]
+    return [
+        BulkOutcome(wireman_id, True, done_message.format(points=points_by_id[wireman_id]))
+        if wireman_id in points_by_id else
+        BulkOutcome(wireman_id, False, "No points record found for this wireman.")
+        for wireman_id in target_ids
+    ]
+
+
+@instrumented
+def redeem_all_points_bulk(db: Session, wireman_ids: Optional[List[int]] = None,
+                           wireman_filter: Optional[Tuple[str, float, float]] = None) -> List[BulkOutcome]:
+    """
+    Redeem all points for several wiremen in one transaction.
+
+    Args:
+        db (Session): The database session.
+        wireman_ids (Optional[List[int]]): The IDs of the wiremen.
+        wireman_filter (Optional[Tuple[str, float, float]]): Instead of IDs, the (filter_by, min_value, max_value)
+            arguments of get_wiremen_with_points_or_bills selecting the wiremen.
+
+    Returns:
+        List[BulkOutcome]: One outcome per wireman, by wireman ID.
+    """
+    return _bulk_points_operation(db, points_service.redeem_all_points_bulk, wireman_ids, wireman_filter,
+                                  "{points} points redeemed.", "An error occurred while redeeming points")
+
 
+@instrumented
+def reset_points_bulk(db: Session, wireman_ids: Optional[List[int]] = None,
+                      wireman_filter: Optional[Tuple[str, float, float]] = None) -> List[BulkOutcome]:
+    """
+    Reset all points for several wiremen in one transaction.
+
+    Args:
+        db (Session): The database session.
+        wireman_ids (Optional[List[int]]): The IDs of the wiremen.
+        wireman_filter (Optional[Tuple[str, float, float]]): Instead of IDs, the (filter_by, min_value, max_value)
+            arguments of get_wiremen_with_points_or_bills selecting the wiremen.
+
+    Returns:
+        List[BulkOutcome]: One outcome per wireman, by wireman ID.
+    """
+    return _bulk_points_operation(db, points_service.reset_points_bulk, wireman_ids, wireman_filter,
+                                  "{points} redeemed points restored.", "An error occurred while resetting points")
+
+
+@instrumented
+def delete_wiremen_bulk(db: Session, wireman_ids: Optional[List[int]] = None,
+                        wireman_filter: Optional[Tuple[str, float, float]] = None) -> List[BulkOutcome]:
+    """
+    Delete several wiremen and their bills, rollups, receivables and points in one transaction.
+
+    Each table is cleared with one DELETE ... WHERE wireman_id IN (...) statement. The
+    append-only points ledger keeps their entries and gets reversing ones bringing it to zero.
+
+    Args:
+        db (Session): The database session.
+        wireman_ids (Optional[List[int]]): The IDs of the wiremen.
+        wireman_filter (Optional[Tuple[str, float, float]]): Instead of IDs, the (filter_by, min_value, max_value)
+            arguments of get_wiremen_with_points_or_bills selecting the wiremen.
 
+    Returns:
+        List[BulkOutcome]: One outcome per wireman, by wireman ID.
+    """
+    target_ids = sorted(set(wireman_ids or []))
+    try:
+        target_ids = _bulk_wireman_ids(db, wireman_ids, wireman_filter)
+        if not target_ids:
+            db.rollback()
+            return []
+        names = dict(db.query(Wireman.id, Wireman.name).filter(Wireman.id.in_(target_ids)).all())
+        if names:
+            found_ids = list(names)
+            points_service.close_accounts_bulk(db, found_ids)
+            for model in (Bill, BillDailyRollup, Receivable, Point):
+                db.query(model).filter(model.wireman_id.in_(found_ids)).delete(synchronize_session=False)
+            db.query(Wireman).filter(Wireman.id.in_(found_ids)).delete(synchronize_session=False)
+            db.commit()
+            query_cache.invalidate_wiremen()
+    except SQLAlchemyError as e:
+        db.rollback()
+        return [BulkOutcome(wireman_id, False, f"An error occurred while deleting the wireman: {str(e)}")
+                for wireman_id in target_ids]
+    return [
+        BulkOutcome(wireman_id, True, f"Wireman {names[wireman_id]} and associated records deleted successfully!")
+        if wireman_id in names else
+        BulkOutcome(wireman_id, False, "Wireman not found.")
+        for wireman_id in target_ids
+    ]
+
+
+@instrumented
 def get_wireman_by_id(db: Session, wireman_id: int) -> Optional[Wireman]:
     """Fetch a wireman by ID."""
     return db.query(Wireman).filter(Wireman.id == wireman_id).first()
+
+
+# Async counterparts of the reads, for pages and API handlers that load several of them at once
+# (see database.async_connection.gather_in_sessions). They run the sync functions above on the
+# AsyncSession, so queries, caching and instrumentation are shared.
+
+async def fetch_all_wiremen_async(db: AsyncSession) -> List[Row]:
+    """Async counterpart of fetch_all_wiremen."""
+    return await db.run_sync(fetch_all_wiremen)
+
+
+async def get_wireman_dashboard_data_async(db: AsyncSession, wireman_id: int) -> WiremanDashboard:
+    """Async counterpart of get_wireman_dashboard_data."""
+    return await db.run_sync(get_wireman_dashboard_data, wireman_id)
+
+
+async def get_wiremen_dashboard_data_async(db: AsyncSession, wireman_ids: List[int]) -> Dict[int, WiremanDashboard]:
+    """Async counterpart of get_wiremen_dashboard_data."""
+    return await db.run_sync(get_wiremen_dashboard_data, wireman_ids)
+
+
+async def get_point_record_async(db: AsyncSession, wireman_id: int) -> Optional[Point]:
+    """Async counterpart of get_point_record."""
+    return await db.run_sync(get_point_record, wireman_id)
+
+
+async def get_wiremen_with_points_or_bills_async(db: AsyncSession, filter_by: str, min_value: float,
+                                                 max_value: float) -> List[Row]:
+    """Async counterpart of get_wiremen_with_points_or_bills."""
+    return await db.run_sync(get_wiremen_with_points_or_bills, filter_by, min_value, max_value)
+
+
+async def get_leaderboard_async(db: AsyncSession, category: str, date_range: Optional[tuple] = None,
+                                payment_status: Optional[str] = None, limit: Optional[int] = None,
+                                offset: int = 0, dense: bool = False) -> List[Row]:
+    """Async counterpart of get_leaderboard."""
+    return await db.run_sync(get_leaderboard, category, date_range, payment_status, limit, offset, dense)
+
+
+async def get_wireman_by_id_async(db: AsyncSession, wireman_id: int) -> Optional[Wireman]:
+    """Async counterpart of get_wireman_by_id."""
+    return await db.run_sync(get_wireman_by_id, wireman_id)
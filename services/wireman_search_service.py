@@ -0,0 +1,56 @@
+# File: services/wireman_search_service.py
+
+from typing import List
+from sqlalchemy import case, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from database.models import Wireman
+from database.instrumentation import instrumented
+
+DEFAULT_LIMIT = 20
+
+# Shorter search terms only match prefixes; a trigram index cannot narrow a substring match on them.
+MIN_SUBSTRING_LENGTH = 3
+
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term matches literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@instrumented
+def search_wiremen(db: Session, term: str, limit: int = DEFAULT_LIMIT) -> List[Row]:
+    """
+    Search wiremen by name or contact info, prefix matches first.
+
+    Terms of MIN_SUBSTRING_LENGTH characters or more also match anywhere in the name or
+    contact info. Matching is case-insensitive (ILIKE), which PostgreSQL serves from the
+    pg_trgm indexes on both columns.
+
+    Args:
+        db (Session): The database session.
+        term (str): The search text; an empty term lists wiremen alphabetically.
+        limit (int): Maximum number of results.
+
+    Returns:
+        List[Row]: (id, name, contact_info) rows, at most limit of them.
+    """
+    term = (term or "").strip()
+    query = db.query(Wireman.id, Wireman.name, Wireman.contact_info)
+    if not term:
+        return query.order_by(Wireman.name, Wireman.id).limit(limit).all()
+
+    escaped = _escape_like(term)
+    prefix_match = or_(
+        Wireman.name.ilike(f"{escaped}%", escape="\\"),
+        Wireman.contact_info.ilike(f"{escaped}%", escape="\\")
+    )
+    if len(term) >= MIN_SUBSTRING_LENGTH:
+        query = query.filter(or_(
+            Wireman.name.ilike(f"%{escaped}%", escape="\\"),
+            Wireman.contact_info.ilike(f"%{escaped}%", escape="\\")
+        ))
+    else:
+        query = query.filter(prefix_match)
+
+    return query.order_by(case((prefix_match, 0), else_=1), Wireman.name, Wireman.id).limit(limit).all()
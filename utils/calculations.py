@@ -1,20 +1,25 @@
 # File: utils/calculations.py
 
+from datetime import date
+from typing import Optional
 from sqlalchemy.orm import Session
 from database.models import Bill, Point
+from services import points_rules_service
 
 
-def calculate_points(amount: float) -> float:
+def calculate_points(amount: float, payment_status: Optional[str] = None, bill_date: Optional[date] = None) -> float:
     """
-    Calculate points based on bill amount.
+    Calculate points based on bill amount, payment status and date, with the points rules.
 
     Args:
         amount (float): The bill amount.
+        payment_status (Optional[str]): The payment status of the bill.
+        bill_date (Optional[date]): The date of the bill.
 
     Returns:
         float: The calculated points.
     """
-    return amount // 1000
+    return float(points_rules_service.calculate_points(amount, payment_status, bill_date))
 
 
 def calculate_total_business(db: Session, wireman_id: int) -> float:
@@ -0,0 +1,190 @@
+# File: utils/widgets.py
+
+import tempfile
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterator, List, Optional
+import streamlit as st
+from sqlalchemy.orm import Session
+from database.instrumentation import SQL_DEBUG_PANEL, QueryStats, query_scope
+from services import client_name_service, wireman_search_service
+from services.export_service import EXPORT_FORMATS
+
+
+def export_controls(key: str, file_name: str, write_export: Callable[[BinaryIO, str], int]):
+    """
+    Display export format selection and a download button for a streamed export.
+
+    The export is written to a temporary file on disk chunk by chunk, so building it
+    holds at most one chunk of rows in memory. Serving it does not: st.download_button
+    reads the whole file into Streamlit's in-memory media store, so memory grows with the
+    export size. Export large bill records with python -m services.export_service instead.
+
+    Args:
+        key (str): Unique widget key prefix.
+        file_name (str): Download file name without extension.
+        write_export (Callable[[BinaryIO, str], int]): Writes the export to a binary file in the
+            given format and returns the number of rows written.
+    """
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        file_format = st.selectbox("Export format", list(EXPORT_FORMATS),
+                                   format_func=lambda fmt: EXPORT_FORMATS[fmt][0], key=f"{key}_format")
+    with col2:
+        st.write("")
+        prepare = st.button("Prepare Export", key=f"{key}_prepare")
+
+    if prepare:
+        with st.spinner("Exporting..."), tempfile.TemporaryFile() as file:
+            rows_written = write_export(file, file_format)
+            file.flush()
+            file.seek(0)
+            # st.download_button takes readers, not the read-write file TemporaryFile returns;
+            # it still copies the contents into memory.
+            with open(file.fileno(), "rb", closefd=False) as reader:
+                st.download_button(
+                    f"Download {rows_written} rows",
+                    data=reader,
+                    file_name=f"{file_name}.{file_format}",
+                    mime=EXPORT_FORMATS[file_format][1],
+                    key=f"{key}_download"
+                )
+
+
+def wireman_picker(db: Session, key: str, label: str = "Wireman", include_all: bool = False,
+                   limit: int = wireman_search_service.DEFAULT_LIMIT) -> Optional[int]:
+    """
+    Display a wireman search box and a selectbox of the matching wiremen.
+
+    The search runs in the database and returns at most limit wiremen, so the page never
+    loads the whole wiremen table. Place it outside st.form, so typing reruns the search.
+
+    Args:
+        db (Session): The database session.
+        key (str): Unique widget key prefix.
+        label (str): Label of the selectbox.
+        include_all (bool): Offer an "All" option, returned as None.
+        limit (int): Maximum number of wiremen offered.
+
+    Returns:
+        Optional[int]: The selected wireman ID, or None for "All" or when nothing matches.
+    """
+    term = st.text_input(f"Search {label}", key=f"{key}_search", placeholder="Name or contact info")
+    matches = wireman_search_service.search_wiremen(db, term, limit)
+    labels = {row.id: _wireman_label(row) for row in matches}
+    options = ([None] if include_all else []) + list(labels)
+    if not options:
+        st.info("No wiremen match the search.")
+        return None
+    return st.selectbox(label, options, format_func=lambda wireman_id: "All" if wireman_id is None else labels[wireman_id],
+                        key=f"{key}_select")
+
+
+def wireman_multi_picker(db: Session, key: str, label: str = "Wiremen",
+                         limit: int = wireman_search_service.DEFAULT_LIMIT) -> List[int]:
+    """
+    Display a wireman search box and a multiselect of the matching wiremen.
+
+    Like wireman_picker, each search returns at most limit wiremen. Wiremen already picked
+    stay selected when the search changes, so several searches build up one selection.
+
+    Args:
+        db (Session): The database session.
+        key (str): Unique widget key prefix.
+        label (str): Label of the multiselect.
+        limit (int): Maximum number of wiremen offered per search.
+
+    Returns:
+        List[int]: The selected wireman IDs.
+    """
+    term = st.text_input(f"Search {label}", key=f"{key}_search", placeholder="Name or contact info")
+    labels = st.session_state.setdefault(f"{key}_labels", {})
+    selected = st.session_state.get(f"{key}_select", [])
+    matches = wireman_search_service.search_wiremen(db, term, limit)
+    labels.update((row.id, _wireman_label(row)) for row in matches)
+    options = list(dict.fromkeys([*selected, *(row.id for row in matches)]))
+    if not matches:
+        st.info("No wiremen match the search.")
+    return st.multiselect(label, options, format_func=labels.get, key=f"{key}_select")
+
+
+def _wireman_label(row) -> str:
+    """A wireman's name, with the contact info when there is one."""
+    return f"{row.name} ({row.contact_info})" if row.contact_info else row.name
+
+
+def client_name_input(db: Session, key: str, label: str = "Client Name") -> str:
+    """
+    Display a client name text input with suggestions of existing client names.
+
+    Suggestions come from the in-memory client name index, most used first. Place it
+    outside st.form, so entering text reruns the lookup.
+
+    Args:
+        db (Session): The database session, used to load the index on first use.
+        key (str): Unique widget key prefix.
+        label (str): Label of the text input.
+
+    Returns:
+        str: The typed name, or the suggestion chosen instead.
+    """
+    typed = st.text_input(label, key=f"{key}_text").strip()
+    if not typed:
+        return typed
+    suggestions = [name for name in client_name_service.suggest_client_names(db, typed) if name != typed]
+    if not suggestions:
+        return typed
+    return st.selectbox("Existing clients", [typed] + suggestions, key=f"{key}_suggestion",
+                        format_func=lambda name: f"{name} (as typed)" if name == typed else name)
+
+
+def display_query_panel(stats: QueryStats):
+    """Display a page render's SQL statistics in a sidebar expander."""
+    with st.sidebar.expander("SQL Debug", expanded=False):
+        col1, col2 = st.columns(2)
+        col1.metric("Statements", stats.statement_count)
+        col2.metric("DB Time", f"{stats.total_ms:,.1f} ms")
+
+        calls = defaultdict(lambda: [0, 0, 0.0])
+        for child in stats.children:
+            entry = calls[child.name]
+            entry[0] += 1
+            entry[1] += child.statement_count
+            entry[2] += child.total_ms
+        if calls:
+            st.caption("By service function")
+            st.table({
+                "Function": list(calls),
+                "Calls": [entry[0] for entry in calls.values()],
+                "Statements": [entry[1] for entry in calls.values()],
+                "ms": [round(entry[2], 1) for entry in calls.values()],
+            })
+
+        for statement, count in stats.repeated_statements():
+            st.warning(f"Possible N+1: executed {count} times")
+            st.code(statement, language="sql")
+
+        if stats.slowest:
+            st.caption("Slowest statements")
+            for elapsed_ms, statement in stats.slowest:
+                st.text(f"{elapsed_ms:,.1f} ms")
+                st.code(statement, language="sql")
+
+
+@contextmanager
+def instrumented_page(name: str) -> Iterator[QueryStats]:
+    """
+    Record the SQL executed while rendering a page.
+
+    When SQL_DEBUG_PANEL is set, the statistics are shown in the sidebar after the page renders.
+
+    Args:
+        name (str): The page name used in logs and the panel.
+
+    Yields:
+        QueryStats: The page's statistics.
+    """
+    with query_scope(f"page.{name}") as stats:
+        yield stats
+    if SQL_DEBUG_PANEL:
+        display_query_panel(stats)